@@ -4,6 +4,7 @@ Django settings for projecthack project.
 
 from pathlib import Path
 import os
+import tempfile
 from decouple import config
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -37,6 +38,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'projects.middleware.MetricsMiddleware',
+    'projects.middleware.RequestTimingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -45,6 +48,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'projects.middleware.ProfilingMiddleware',
 ]
 
 ROOT_URLCONF = 'projecthack.urls'
@@ -66,19 +70,121 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'projecthack.wsgi.application'
+ASGI_APPLICATION = 'projecthack.asgi.application'
+
+# Push timer updates over Server-Sent Events. Only enable when serving with an
+# ASGI server (e.g. uvicorn/daphne) - under WSGI each stream holds a whole worker.
+TIMER_EVENTS_ENABLED = config('TIMER_EVENTS_ENABLED', default=False, cast=bool)
 
 
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
 
+# SQLite by default; set DB_ENGINE=django.db.backends.postgresql (and the DB_*
+# settings below) to use PostgreSQL
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'ENGINE': config('DB_ENGINE', default='django.db.backends.sqlite3'),
+        'NAME': config('DB_NAME', default=str(BASE_DIR / 'db.sqlite3')),
+        'USER': config('DB_USER', default=''),
+        'PASSWORD': config('DB_PASSWORD', default=''),
+        'HOST': config('DB_HOST', default=''),
+        'PORT': config('DB_PORT', default=''),
+    }
+}
+
+
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+# Point this at a shared backend (e.g. Redis/Memcached) in production so all
+# workers see the same catalog version
+
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default='projecthack'),
     }
 }
 
 
+# Seconds a session's cached onboarding state is trusted before it is re-checked
+# against the UserProfile (picks up admin edits, resets and purges)
+ONBOARDING_STATE_MAX_AGE = config('ONBOARDING_STATE_MAX_AGE', default=300, cast=int)
+
+
+# Resource downloads (see projects/delivery.py). Set RESOURCE_SENDFILE_BACKEND to
+# 'x-accel-redirect' (nginx) or 'x-sendfile' (Apache mod_xsendfile) when a front
+# proxy serves RESOURCE_FILES_DIR; the nginx location for the prefix must be `internal`.
+RESOURCE_FILES_DIR = config('RESOURCE_FILES_DIR', default=str(BASE_DIR / 'static' / 'files'))
+RESOURCE_SENDFILE_BACKEND = config('RESOURCE_SENDFILE_BACKEND', default='')
+RESOURCE_ACCEL_REDIRECT_PREFIX = config('RESOURCE_ACCEL_REDIRECT_PREFIX', default='/protected/files/')
+
+# Rows shown by the CSV preview on the step page (?rows= can ask for up to the maximum)
+RESOURCE_PREVIEW_ROWS = config('RESOURCE_PREVIEW_ROWS', default=10, cast=int)
+RESOURCE_PREVIEW_MAX_ROWS = config('RESOURCE_PREVIEW_MAX_ROWS', default=100, cast=int)
+
+# Per-project ZIP bundles of all resources (projects/bundles.py), cached on disk by content hash
+RESOURCE_BUNDLE_DIR = config('RESOURCE_BUNDLE_DIR', default=os.path.join(tempfile.gettempdir(), 'projecthack-bundles'))
+RESOURCE_BUNDLE_MAX_FILES = config('RESOURCE_BUNDLE_MAX_FILES', default=500, cast=int)
+RESOURCE_BUNDLE_ACCEL_REDIRECT_PREFIX = config('RESOURCE_BUNDLE_ACCEL_REDIRECT_PREFIX', default='/protected/bundles/')
+
+
+# "Projects like this one" on the overview page - neighbours kept per project by
+# `python manage.py rebuild_similar_projects`, and how similarity is measured
+SIMILAR_PROJECTS = config('SIMILAR_PROJECTS', default=4, cast=int)
+SIMILAR_PROJECTS_METRIC = config('SIMILAR_PROJECTS_METRIC', default='jaccard')  # or 'cosine'
+
+# Data retention (days) - see `python manage.py purge_stale_data`
+RETENTION_GENERATED_PROJECT_DAYS = config('RETENTION_GENERATED_PROJECT_DAYS', default=30, cast=int)
+RETENTION_ABANDONED_SESSION_DAYS = config('RETENTION_ABANDONED_SESSION_DAYS', default=30, cast=int)
+RETENTION_USER_PROFILE_DAYS = config('RETENTION_USER_PROFILE_DAYS', default=90, cast=int)
+
+# Run the purge from a background thread of each web server process every N seconds
+# (0 = disabled, use cron instead). Only gunicorn, uvicorn, daphne, hypercorn and
+# runserver start it - never management commands, tests, workers or scripts.
+RETENTION_RUNNER_INTERVAL = config('RETENTION_RUNNER_INTERVAL', default=0, cast=int)
+
+
+# Request timing - fraction of requests (0.0-1.0) that get a Server-Timing header
+# and a JSON line on the 'projects.timing' logger (e.g. 0.01 in production; off by default)
+REQUEST_TIMING_SAMPLE_RATE = config('REQUEST_TIMING_SAMPLE_RATE', default=0.0, cast=float)
+
+# Request profiling (removed from the middleware stack unless enabled). A request
+# is profiled when it sends `X-Profile: <PROFILING_SECRET>` or is every Nth one.
+PROFILING_ENABLED = config('PROFILING_ENABLED', default=False, cast=bool)
+PROFILING_SECRET = config('PROFILING_SECRET', default='')
+PROFILING_SAMPLE_EVERY = config('PROFILING_SAMPLE_EVERY', default=0, cast=int)
+PROFILING_MODE = config('PROFILING_MODE', default='cprofile')  # or 'tracemalloc'
+PROFILING_DIR = config('PROFILING_DIR', default=os.path.join(tempfile.gettempdir(), 'projecthack-profiles'))
+PROFILING_MAX_FILES = config('PROFILING_MAX_FILES', default=200, cast=int)
+
+# Directory for per-worker metrics files scraped at /metrics. Set it (and empty it
+# before the server starts) when running several worker processes; unset keeps
+# metrics in process memory.
+METRICS_DIR = config('METRICS_DIR', default='')
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'message': {'format': '%(message)s'},
+    },
+    'handlers': {
+        'timing': {
+            'class': 'logging.StreamHandler',
+            'formatter': 'message',
+        },
+    },
+    'loggers': {
+        'projects.timing': {
+            'handlers': ['timing'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+    },
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
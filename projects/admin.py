@@ -1,13 +1,20 @@
 from django.contrib import admin
-from .models import Project, ProjectStep, ProjectResource, UserSession, UserProfile
+from .models import Project, ProjectNeighbour, ProjectStep, ProjectResource, UserSession, UserProfile
+from .signals import deferred_step_stats
 
 
 @admin.register(Project)
 class ProjectAdmin(admin.ModelAdmin):
     list_display = ['title', 'difficulty', 'track', 'created_at']
+    ordering = ['difficulty', 'title']
     list_filter = ['difficulty', 'track']
     search_fields = ['title', 'description']
 
+    def save_related(self, request, form, formsets, change):
+        # Inline step edits rebuild step_stats once, not per step
+        with deferred_step_stats():
+            super().save_related(request, form, formsets, change)
+
 
 @admin.register(ProjectStep)
 class ProjectStepAdmin(admin.ModelAdmin):
@@ -15,12 +22,26 @@ class ProjectStepAdmin(admin.ModelAdmin):
     list_filter = ['timeframe', 'project']
     search_fields = ['title', 'description']
 
+    def delete_queryset(self, request, queryset):
+        # "Delete selected" rebuilds step_stats once per project, not per step
+        with deferred_step_stats():
+            super().delete_queryset(request, queryset)
+
 
 @admin.register(ProjectResource)
 class ProjectResourceAdmin(admin.ModelAdmin):
-    list_display = ['project', 'name', 'resource_type', 'order']
+    list_display = ['project', 'name', 'resource_type', 'file_size', 'order']
     list_filter = ['resource_type', 'project']
     search_fields = ['name', 'description']
+    readonly_fields = ['file_size', 'stats']
+
+
+@admin.register(ProjectNeighbour)
+class ProjectNeighbourAdmin(admin.ModelAdmin):
+    list_display = ['project', 'rank', 'neighbour', 'score']
+    list_select_related = ['project', 'neighbour']
+    raw_id_fields = ['project', 'neighbour']
+    ordering = ['project', 'rank']
 
 
 @admin.register(UserSession)
@@ -28,6 +49,7 @@ class UserSessionAdmin(admin.ModelAdmin):
     list_display = ['session_id', 'project', 'selected_timeframe', 'current_step', 'completed', 'start_time']
     list_filter = ['completed', 'selected_timeframe', 'project']
     readonly_fields = ['start_time', 'completed_at']
+    ordering = ['-start_time']
 
 
 @admin.register(UserProfile)
@@ -0,0 +1,16 @@
+from django.apps import AppConfig
+
+
+class ProjectsConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'projects'
+
+    def ready(self):
+        # Register signal handlers and system checks
+        from . import checks, signals  # noqa: F401
+        
+        from django.conf import settings
+        if settings.RETENTION_RUNNER_INTERVAL > 0:
+            from .retention import is_server_process, start_retention_runner
+            if is_server_process():
+                start_retention_runner(settings.RETENTION_RUNNER_INTERVAL)
@@ -0,0 +1,189 @@
+"""
+Resource bundles - every resource of a project in one ZIP, built once and then served from disk
+
+A bundle's file name is a hash over its entries' names and content hashes, so
+it only changes when a file does. The first request streams the archive while
+teeing it into a temporary file that is renamed into RESOURCE_BUNDLE_DIR once
+complete; later requests are plain files for delivery.serve_file (validators,
+ranges, sendfile or proxy offload). Memory use is constant either way: files
+are read, compressed and sent in chunks.
+"""
+import hashlib
+import os
+import tempfile
+import time
+import zipfile
+
+from django.conf import settings
+from django.http import Http404, StreamingHttpResponse
+from django.utils.http import content_disposition_header
+
+from . import metrics
+from .delivery import resource_path, serve_file, stat_file
+
+
+CHUNK_SIZE = 64 * 1024
+
+# Already compressed - stored as-is instead of being deflated a second time
+STORED_SUFFIXES = {
+    '.zip', '.gz', '.tgz', '.bz2', '.xz', '.br', '.zst', '.7z',
+    '.png', '.jpg', '.jpeg', '.gif', '.webp', '.mp3', '.mp4', '.parquet',
+}
+
+# path -> (size, mtime_ns, sha256) so unchanged files are only stat()ed
+_digests = {}
+
+
+def file_digest(path, file_stat):
+    """SHA-256 of a file's content, recomputed only when its size or mtime changes"""
+    cached = _digests.get(path)
+    if cached and cached[:2] == (file_stat.st_size, file_stat.st_mtime_ns):
+        return cached[2]
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        while chunk := f.read(CHUNK_SIZE):
+            digest.update(chunk)
+    _digests[path] = (file_stat.st_size, file_stat.st_mtime_ns, digest.hexdigest())
+    return digest.hexdigest()
+
+
+def bundle_entries(resources):
+    """
+    Archive entries for a project's resources; files that do not exist are left out
+
+    Returns:
+        List of dicts with 'arcname', 'path', 'stat', 'digest' and 'compress_type'
+    """
+    entries = []
+    names = set()
+    for resource in resources:
+        path = resource_path(resource)
+        file_stat = stat_file(path)
+        if file_stat is None:
+            continue
+        arcname = os.path.basename(path)
+        stem, suffix = os.path.splitext(arcname)
+        copy = 1
+        while arcname in names:
+            copy += 1
+            arcname = f'{stem}-{copy}{suffix}'
+        names.add(arcname)
+        stored = resource.resource_type == 'zip' or suffix.lower() in STORED_SUFFIXES
+        entries.append({
+            'arcname': arcname,
+            'path': path,
+            'stat': file_stat,
+            'digest': file_digest(path, file_stat),
+            'compress_type': zipfile.ZIP_STORED if stored else zipfile.ZIP_DEFLATED,
+        })
+    return entries
+
+
+def bundle_path(entries):
+    """Cache file for a set of entries - named after their names and content hashes"""
+    key = hashlib.sha256()
+    for entry in entries:
+        key.update(f'{entry["arcname"]}\0{entry["digest"]}\0{entry["compress_type"]}\n'.encode())
+    return os.path.join(settings.RESOURCE_BUNDLE_DIR, f'{key.hexdigest()}.zip')
+
+
+class _Tee:
+    """Write-only stream for ZipFile: writes go to the cache file and are kept until drained"""
+
+    def __init__(self, file):
+        self.file = file
+        self.pending = []
+
+    def write(self, data):
+        self.file.write(data)
+        self.pending.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self.pending)
+        self.pending.clear()
+        return data
+
+
+def stream_bundle(entries, path):
+    """
+    Yield a ZIP of the entries while writing it to path
+
+    The file only appears at path once the archive is complete, so an aborted
+    download never leaves a truncated bundle behind.
+    """
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, partial = tempfile.mkstemp(dir=directory, suffix='.part')
+    complete = False
+    try:
+        with os.fdopen(fd, 'wb') as out:
+            tee = _Tee(out)
+            # The tee is not seekable, so ZipFile writes sizes and CRCs after each entry
+            with zipfile.ZipFile(tee, 'w') as archive:
+                for entry in entries:
+                    info = zipfile.ZipInfo(entry['arcname'], date_time=time.localtime(entry['stat'].st_mtime)[:6])
+                    info.compress_type = entry['compress_type']
+                    info.file_size = entry['stat'].st_size  # Lets ZipFile pick zip64 up front
+                    with open(entry['path'], 'rb') as source, archive.open(info, 'w') as target:
+                        while chunk := source.read(CHUNK_SIZE):
+                            target.write(chunk)
+                            if data := tee.drain():
+                                yield data
+            yield tee.drain()
+        os.replace(partial, path)
+        complete = True
+        prune_bundles()
+    finally:
+        if not complete:
+            os.remove(partial)
+
+
+def prune_bundles():
+    """Drop the oldest bundles beyond RESOURCE_BUNDLE_MAX_FILES"""
+    directory = settings.RESOURCE_BUNDLE_DIR
+    bundles = []
+    for entry in os.scandir(directory):
+        if entry.name.endswith('.zip'):
+            try:
+                bundles.append((entry.stat().st_mtime, entry.path))
+            except FileNotFoundError:
+                pass
+    bundles.sort()
+    for _, path in bundles[:max(0, len(bundles) - settings.RESOURCE_BUNDLE_MAX_FILES)]:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass  # Another worker pruned it first
+
+
+def serve_bundle(request, resources, filename):
+    """
+    ZIP download of resources - from the bundle cache, or streamed while it is cached
+
+    Raises:
+        Http404: if none of the resources' files exist
+    """
+    entries = bundle_entries(resources)
+    if not entries:
+        raise Http404('No resource files')
+
+    path = bundle_path(entries)
+    if os.path.isfile(path):
+        metrics.inc('projecthack_cache_requests_total', {'cache': 'resource_bundle', 'result': 'hit'})
+        return serve_file(
+            request,
+            path,
+            'application/zip',
+            filename,
+            root=settings.RESOURCE_BUNDLE_DIR,
+            accel_prefix=settings.RESOURCE_BUNDLE_ACCEL_REDIRECT_PREFIX,
+        )
+
+    metrics.inc('projecthack_cache_requests_total', {'cache': 'resource_bundle', 'result': 'miss'})
+    response = StreamingHttpResponse(stream_bundle(entries, path), content_type='application/zip')
+    response['Content-Disposition'] = content_disposition_header(True, filename)
+    return response
@@ -0,0 +1,149 @@
+"""
+Catalog snapshot - cached view of the pre-made project catalog for the homepage
+"""
+import time
+
+from django.core.cache import cache
+from django.db.models import Exists, OuterRef
+
+from . import metrics
+from .models import Project, ProjectStep
+
+
+CATALOG_VERSION_KEY = 'projects:catalog:version'
+CATALOG_SNAPSHOT_KEY = 'projects:catalog:snapshot:{version}'
+CATALOG_CHANGES_KEY = 'projects:catalog:changes:{version}'
+CATALOG_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Versions a reader may be behind and still catch up from the change log
+MAX_CATALOG_CHANGES = 100
+
+# (version, snapshot) kept in process memory so warm hits skip unpickling
+_local_snapshot = (None, None)
+
+
+def _new_version():
+    """Return a version number that cannot collide with a previous cache lifetime"""
+    return time.time_ns()
+
+
+def get_catalog_version():
+    """Get the current catalog version from the shared cache"""
+    version = cache.get(CATALOG_VERSION_KEY)
+    if version is None:
+        cache.add(CATALOG_VERSION_KEY, _new_version(), timeout=None)
+        version = cache.get(CATALOG_VERSION_KEY)
+    return version
+
+
+def bump_catalog_version(project_ids=None):
+    """
+    Invalidate every cached snapshot by moving to a new version
+
+    Args:
+        project_ids: Projects the change touched. They are logged against the
+            new version so in-process indexes can update just those projects;
+            None means unknown, and readers rebuild from scratch.
+    """
+    try:
+        version = cache.incr(CATALOG_VERSION_KEY)
+    except ValueError:
+        # Key is missing (cache restarted or never initialised)
+        cache.set(CATALOG_VERSION_KEY, _new_version(), timeout=None)
+        return
+    if project_ids is not None:
+        cache.set(CATALOG_CHANGES_KEY.format(version=version), sorted(set(project_ids)), timeout=CATALOG_CACHE_TIMEOUT)
+
+
+def get_catalog_changes(since, version):
+    """
+    Projects touched between two catalog versions, from the change log
+
+    Returns:
+        Set of project ids, or None when the log cannot tell (a bump without
+        project ids, expired entries, or too many versions apart)
+    """
+    if not since < version <= since + MAX_CATALOG_CHANGES:
+        return None
+    keys = [CATALOG_CHANGES_KEY.format(version=v) for v in range(since + 1, version + 1)]
+    logged = cache.get_many(keys)
+    if len(logged) != len(keys):
+        return None
+    return set().union(*logged.values())
+
+
+def build_catalog_snapshot():
+    """
+    Build the homepage catalog with a single query
+
+    Returns:
+        dict with 'projects_by_track', 'total_projects' and 'projects_with_steps'
+    """
+    tracks = Project.TRACK_CHOICES
+    difficulties = Project.DIFFICULTY_CHOICES
+
+    rows = Project.objects.filter(is_generated=False).annotate(
+        has_steps=Exists(ProjectStep.objects.filter(project=OuterRef('pk')))
+    ).order_by('track', 'difficulty', 'title', 'id').values('id', 'title', 'description', 'track', 'difficulty', 'has_steps')
+
+    # Group rows by (track, difficulty) - the ordering follows project_catalog_idx
+    cells = {}
+    projects_with_steps = 0
+    for row in rows:
+        if row['has_steps']:
+            projects_with_steps += 1
+        cells.setdefault((row['track'], row['difficulty']), []).append({
+            'id': row['id'],
+            'title': row['title'],
+            'description': row['description'],
+        })
+
+    # Lay out in choice order, skipping empty cells (same shape the template expects)
+    projects_by_track = {}
+    total_projects = 0
+    for track_code, track_name in tracks:
+        projects_by_track[track_code] = {
+            'name': track_name,
+            'projects': {}
+        }
+        for diff_code, diff_name in difficulties:
+            projects = cells.get((track_code, diff_code))
+            if projects:
+                projects_by_track[track_code]['projects'][diff_code] = {
+                    'name': diff_name,
+                    'projects': projects
+                }
+                total_projects += len(projects)
+
+    return {
+        'projects_by_track': projects_by_track,
+        'total_projects': total_projects,
+        'projects_with_steps': projects_with_steps,
+    }
+
+
+def get_catalog_snapshot():
+    """
+    Get the catalog snapshot, building it only when the version has moved
+
+    Lookup order: process memory, then the shared cache, then the database.
+    """
+    global _local_snapshot
+
+    version = get_catalog_version()
+    local_version, snapshot = _local_snapshot
+    if local_version == version:
+        metrics.inc('projecthack_cache_requests_total', {'cache': 'catalog', 'result': 'hit'})
+        return snapshot
+
+    key = CATALOG_SNAPSHOT_KEY.format(version=version)
+    snapshot = cache.get(key)
+    if snapshot is None:
+        metrics.inc('projecthack_cache_requests_total', {'cache': 'catalog', 'result': 'miss'})
+        snapshot = build_catalog_snapshot()
+        cache.set(key, snapshot, timeout=CATALOG_CACHE_TIMEOUT)
+    else:
+        metrics.inc('projecthack_cache_requests_total', {'cache': 'catalog', 'result': 'hit'})
+
+    _local_snapshot = (version, snapshot)
+    return snapshot
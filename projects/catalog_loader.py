@@ -0,0 +1,234 @@
+"""
+Catalog loader - sync pre-made projects, steps and resources from a JSON catalog file
+
+The file is the source of truth: loading computes a diff against the database
+and applies it in one transaction with bulk operations, so reloading an
+unchanged catalog writes nothing.
+"""
+import json
+import os
+from dataclasses import dataclass, field
+
+from django.conf import settings
+from django.db import transaction
+
+from .catalog import bump_catalog_version
+from .models import Project, ProjectStep, ProjectResource
+from .resource_stats import describe_resource, resource_is_stale
+
+
+DEFAULT_CATALOG_PATH = os.path.join(settings.BASE_DIR, 'projects', 'data', 'catalog.json')
+
+PROJECT_FIELDS = ['description', 'track', 'difficulty']
+STEP_FIELDS = ['timeframe', 'title', 'description', 'technologies', 'estimated_time', 'learning_outcomes']
+RESOURCE_FIELDS = ['description', 'resource_type', 'file_path', 'order']
+# Filled in from the resource file itself, never from the catalog
+RESOURCE_FILE_FIELDS = ['file_size', 'stats']
+
+
+class CatalogError(ValueError):
+    """The catalog file is malformed"""
+
+
+@dataclass
+class CatalogDiff:
+    """Rows to write to bring the database in line with a catalog file"""
+    create_projects: list = field(default_factory=list)
+    update_projects: list = field(default_factory=list)
+    delete_projects: list = field(default_factory=list)
+    create_steps: list = field(default_factory=list)
+    update_steps: list = field(default_factory=list)
+    delete_steps: list = field(default_factory=list)
+    create_resources: list = field(default_factory=list)
+    update_resources: list = field(default_factory=list)
+    delete_resources: list = field(default_factory=list)
+
+    def summary(self):
+        """{'projects': (created, updated, deleted), 'steps': ..., 'resources': ...}"""
+        return {
+            name: (
+                len(getattr(self, f'create_{name}')),
+                len(getattr(self, f'update_{name}')),
+                len(getattr(self, f'delete_{name}')),
+            )
+            for name in ('projects', 'steps', 'resources')
+        }
+
+    def is_empty(self):
+        return not any(sum(counts) for counts in self.summary().values())
+
+
+def read_catalog(path=DEFAULT_CATALOG_PATH):
+    """
+    Read and validate a catalog file
+
+    Returns:
+        List of project entries keyed by unique title
+    """
+    try:
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        raise CatalogError(f'Cannot read catalog {path}: {e}')
+
+    tracks = dict(Project.TRACK_CHOICES)
+    difficulties = dict(Project.DIFFICULTY_CHOICES)
+    tiers = {code: tier for tier, (code, _) in enumerate(ProjectStep.TIMEFRAME_CHOICES)}
+
+    entries = data.get('projects', [])
+    titles = set()
+    for entry in entries:
+        title = entry.get('title')
+        if not title:
+            raise CatalogError('Every project needs a title')
+        if title in titles:
+            raise CatalogError(f'Duplicate project title: {title}')
+        titles.add(title)
+        if entry.get('track') not in tracks:
+            raise CatalogError(f'{title}: unknown track {entry.get("track")!r}')
+        if entry.get('difficulty') not in difficulties:
+            raise CatalogError(f'{title}: unknown difficulty {entry.get("difficulty")!r}')
+        # Every timeframe's plan must be steps 1..n: numbered from 1 without gaps,
+        # and a step never belongs to a shorter timeframe than the one before it
+        steps = sorted(entry.get('steps', []), key=lambda step: step.get('step_number') or 0)
+        previous_tier = 0
+        for number, step in enumerate(steps, 1):
+            if step.get('step_number') != number:
+                raise CatalogError(f'{title}: steps must be numbered 1..{len(steps)} without gaps or duplicates')
+            if step.get('timeframe') not in tiers:
+                raise CatalogError(f'{title}: step {number} has unknown timeframe {step.get("timeframe")!r}')
+            if tiers[step['timeframe']] < previous_tier:
+                raise CatalogError(f'{title}: step {number} starts in a shorter timeframe than step {number - 1}')
+            previous_tier = tiers[step['timeframe']]
+        names = [resource.get('name') for resource in entry.get('resources', [])]
+        if len(set(names)) != len(names):
+            raise CatalogError(f'{title}: duplicate resource names')
+    return entries
+
+
+def _values(source, fields, defaults=None):
+    defaults = defaults or {}
+    return {name: source.get(name, defaults.get(name, '')) for name in fields}
+
+
+def diff_catalog(entries, prune=False):
+    """
+    Compare catalog entries with the pre-made projects in the database
+
+    Projects are matched by title, steps by (project, step_number) and
+    resources by (project, name). Steps and resources missing from the file
+    are deleted; projects missing from it only with prune=True, since that also
+    deletes their user sessions.
+
+    Returns:
+        CatalogDiff
+    """
+    diff = CatalogDiff()
+    existing = {project.title: project for project in Project.objects.filter(is_generated=False)}
+
+    # Steps are compared as plain value rows; model instances are only built for changes
+    steps_by_project = {}
+    step_rows = ProjectStep.objects.filter(project__is_generated=False).values_list(
+        'pk', 'project_id', 'step_number', *STEP_FIELDS
+    )
+    for pk, project_id, step_number, *values in step_rows:
+        steps_by_project.setdefault(project_id, {})[step_number] = (pk, dict(zip(STEP_FIELDS, values)))
+    resources_by_project = {}
+    for resource in ProjectResource.objects.filter(project__is_generated=False):
+        resources_by_project.setdefault(resource.project_id, {})[resource.name] = resource
+
+    resource_defaults = {'resource_type': 'csv', 'order': 0}
+
+    for entry in entries:
+        project = existing.pop(entry['title'], None)
+        wanted = _values(entry, PROJECT_FIELDS)
+        if project is None:
+            project = Project(title=entry['title'], **wanted)
+            diff.create_projects.append(project)
+        elif any(getattr(project, name) != value for name, value in wanted.items()):
+            for name, value in wanted.items():
+                setattr(project, name, value)
+            diff.update_projects.append(project)
+
+        current_steps = steps_by_project.pop(project.pk, {}) if project.pk else {}
+        for step_data in entry.get('steps', []):
+            wanted = _values(step_data, STEP_FIELDS, {'technologies': [], 'estimated_time': 60})
+            current = current_steps.pop(step_data['step_number'], None)
+            if current is None:
+                diff.create_steps.append(ProjectStep(project=project, step_number=step_data['step_number'], **wanted))
+            elif current[1] != wanted:
+                diff.update_steps.append(ProjectStep(pk=current[0], project_id=project.pk, **wanted))
+        diff.delete_steps.extend(ProjectStep(pk=pk, project_id=project.pk) for pk, _ in current_steps.values())
+
+        current_resources = resources_by_project.pop(project.pk, {}) if project.pk else {}
+        for resource_data in entry.get('resources', []):
+            wanted = _values(resource_data, RESOURCE_FIELDS, resource_defaults)
+            resource = current_resources.pop(resource_data['name'], None)
+            if resource is None:
+                diff.create_resources.append(ProjectResource(project=project, name=resource_data['name'], **wanted))
+            elif any(getattr(resource, name) != value for name, value in wanted.items()):
+                for name, value in wanted.items():
+                    setattr(resource, name, value)
+                diff.update_resources.append(resource)
+            elif resource_is_stale(resource):
+                # Same entry, but the file changed since its stats were computed
+                diff.update_resources.append(resource)
+        diff.delete_resources.extend(current_resources.values())
+
+    if prune:
+        diff.delete_projects.extend(existing.values())
+    return diff
+
+
+def apply_catalog(diff, batch_size=1000):
+    """Write a CatalogDiff in one transaction with bulk statements"""
+    if diff.is_empty():
+        return
+
+    # Bulk writes skip the pre_save signal - read the files before taking the write lock
+    for resource in diff.create_resources + diff.update_resources:
+        describe_resource(resource)
+
+    with transaction.atomic():
+        Project.objects.bulk_create(diff.create_projects, batch_size=batch_size)
+        Project.objects.bulk_update(diff.update_projects, PROJECT_FIELDS, batch_size=batch_size)
+        if diff.delete_projects:
+            Project.objects.filter(pk__in=[project.pk for project in diff.delete_projects]).delete()
+
+        # Re-point children at the freshly inserted projects' primary keys
+        for row in diff.create_steps + diff.create_resources:
+            row.project_id = row.project.pk
+
+        if diff.delete_steps:
+            ProjectStep.objects.filter(pk__in=[step.pk for step in diff.delete_steps]).delete()
+        ProjectStep.objects.bulk_update(diff.update_steps, STEP_FIELDS, batch_size=batch_size)
+        ProjectStep.objects.bulk_create(diff.create_steps, batch_size=batch_size)
+
+        if diff.delete_resources:
+            ProjectResource.objects.filter(pk__in=[resource.pk for resource in diff.delete_resources]).delete()
+        ProjectResource.objects.bulk_update(
+            diff.update_resources, RESOURCE_FIELDS + RESOURCE_FILE_FIELDS, batch_size=batch_size
+        )
+        ProjectResource.objects.bulk_create(diff.create_resources, batch_size=batch_size)
+
+        # Bulk writes skip signals - refresh cached step counts and the catalog ourselves
+        touched = {step.project_id for step in diff.create_steps + diff.update_steps + diff.delete_steps}
+        Project.rebuild_step_stats(touched)
+        changed = touched | {
+            project.pk for project in diff.create_projects + diff.update_projects + diff.delete_projects
+        }
+        # Backends that cannot return bulk-inserted keys leave them unset - readers rebuild then
+        transaction.on_commit(lambda: bump_catalog_version(None if None in changed else changed))
+
+
+def load_catalog(path=DEFAULT_CATALOG_PATH, prune=False, dry_run=False):
+    """
+    Sync the database with a catalog file
+
+    Returns:
+        CatalogDiff that was (or, with dry_run, would be) applied
+    """
+    diff = diff_catalog(read_catalog(path), prune=prune)
+    if not dry_run:
+        apply_catalog(diff)
+    return diff
@@ -0,0 +1,25 @@
+"""
+System checks - deployment settings the projects app depends on
+"""
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.checks import Tags, Warning, register
+
+
+@register(Tags.caches, deploy=True)
+def check_shared_cache(app_configs, **kwargs):
+    """Warn when production runs on a per-process cache, which workers don't share"""
+    if settings.DEBUG or not isinstance(caches['default'], LocMemCache):
+        return []
+    return [
+        Warning(
+            'The default cache is LocMemCache, which each worker process keeps to itself.',
+            hint=(
+                'A catalog change only reaches the worker that made it; the others keep serving the '
+                'old catalog and recommendations until they restart. Set CACHE_BACKEND and '
+                'CACHE_LOCATION to a shared cache such as Redis or Memcached.'
+            ),
+            id='projects.W001',
+        )
+    ]
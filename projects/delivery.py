@@ -0,0 +1,281 @@
+"""
+Resource delivery - serve project resource files without holding a worker on the copy
+
+Files are stat()ed once per request to build validators (ETag, Last-Modified),
+so revalidations end in a 304 without opening anything. The body is handed off
+in one of two ways:
+
+* RESOURCE_SENDFILE_BACKEND = 'x-sendfile' / 'x-accel-redirect': only headers
+  are returned and the front proxy (Apache mod_xsendfile, nginx) sends the file,
+  including Range handling.
+* otherwise a FileResponse over the open file. Servers that provide
+  wsgi.file_wrapper (gunicorn) pass it to os.sendfile, so the kernel copies the
+  file straight to the socket. Range requests seek the file and cap
+  Content-Length, which keeps that path zero-copy too.
+
+Pre-compressed siblings (data.csv.br, data.csv.gz) are served instead of the
+file itself when the client accepts that encoding and the sibling is not older
+than the file.
+"""
+import os
+import re
+import stat
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import content_disposition_header, http_date, parse_http_date_safe
+
+
+CONTENT_TYPES = {
+    'csv': 'text/csv',
+    'json': 'application/json',
+    'txt': 'text/plain',
+    'zip': 'application/zip',
+}
+
+# Content-Encoding -> file suffix, in order of preference
+PRECOMPRESSED = [('br', '.br'), ('gzip', '.gz')]
+
+# Chunk size when the server has no wsgi.file_wrapper and the body goes through Python
+BLOCK_SIZE = 64 * 1024
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+class FileRange:
+    """
+    A window [start, end) of an open file that FileResponse and os.sendfile can use
+
+    Positions stay absolute (so a server calling sendfile on fileno() starts at
+    the window), but reads and SEEK_END stop at the end of the window, which is
+    what FileResponse uses to compute Content-Length.
+    """
+
+    def __init__(self, file, start, end):
+        self.file = file
+        self.name = file.name
+        self.end = end
+        file.seek(start)
+
+    def fileno(self):
+        return self.file.fileno()
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self.file.tell()
+
+    def seek(self, offset, whence=os.SEEK_SET):
+        if whence == os.SEEK_END:
+            return self.file.seek(self.end + offset)
+        return self.file.seek(offset, whence)
+
+    def read(self, size=-1):
+        remaining = max(0, self.end - self.file.tell())
+        if size is None or size < 0 or size > remaining:
+            size = remaining
+        return self.file.read(size) if size else b''
+
+    def close(self):
+        self.file.close()
+
+
+def resource_path(resource):
+    """
+    Absolute path of a resource's file inside RESOURCE_FILES_DIR
+
+    Raises:
+        Http404: if file_path points outside the resource directory
+    """
+    root = os.path.realpath(settings.RESOURCE_FILES_DIR)
+    path = os.path.realpath(os.path.join(root, resource.file_path.lstrip('/')))
+    if os.path.commonpath([root, path]) != root:
+        raise Http404('Invalid resource path')
+    return path
+
+
+def stat_file(path):
+    """os.stat() result for a regular file, or None"""
+    try:
+        result = os.stat(path)
+    except OSError:
+        return None
+    return result if stat.S_ISREG(result.st_mode) else None
+
+
+def accepted_encodings(header):
+    """Content codings an Accept-Encoding header allows (q > 0); '*' allows all"""
+    accepted = set()
+    for part in header.split(','):
+        coding, _, params = part.strip().partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params.split(';'):
+            name, _, value = param.strip().partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if quality > 0:
+            accepted.add(coding)
+    if '*' in accepted:
+        accepted.update(encoding for encoding, _ in PRECOMPRESSED)
+    return accepted
+
+
+def choose_variant(request, path, file_stat):
+    """
+    Pick the representation to send for a file
+
+    Returns:
+        (path, stat result, Content-Encoding or None)
+    """
+    accepted = accepted_encodings(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+    for encoding, suffix in PRECOMPRESSED:
+        if encoding not in accepted:
+            continue
+        variant_stat = stat_file(path + suffix)
+        # A sibling older than the file was left behind by an edit - ignore it
+        if variant_stat and variant_stat.st_mtime >= file_stat.st_mtime:
+            return path + suffix, variant_stat, encoding
+    return path, file_stat, None
+
+
+def make_etag(file_stat, encoding=None):
+    """Strong ETag from size and modification time; each encoding gets its own"""
+    tag = f'{file_stat.st_size:x}-{file_stat.st_mtime_ns:x}'
+    if encoding:
+        tag += f'-{encoding}'
+    return f'"{tag}"'
+
+
+def parse_range(header, size):
+    """
+    Parse a single-range Range header against a file size
+
+    Returns:
+        (start, end) with end exclusive, None to ignore the header (malformed or
+        multiple ranges - the full file is sent instead), or False when the
+        range cannot be satisfied
+    """
+    match = RANGE_RE.match(header.strip())
+    if not match or match.groups() == ('', ''):
+        return None
+    first, last = match.groups()
+    if not first:
+        # Suffix range: the last N bytes
+        length = int(last)
+        if not length:
+            return False
+        return max(0, size - length), size
+    start = int(first)
+    if start >= size:
+        return False
+    end = size if not last else int(last) + 1
+    if end <= start:
+        return None
+    return start, min(end, size)
+
+
+def _range_applies(request, etag, last_modified):
+    """If-Range: only honour Range when the client's copy is still current"""
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if not if_range:
+        return True
+    if if_range.startswith('"'):
+        return if_range == etag
+    return parse_http_date_safe(if_range) == last_modified
+
+
+def serve_file(request, path, content_type, filename, root=None, accel_prefix=None):
+    """
+    Serve a file as a download with validators, Range support and offload
+
+    Args:
+        root, accel_prefix: directory the file is in and the proxy location it
+            is exposed at for X-Accel-Redirect (default: the resource files)
+
+    Raises:
+        Http404: if the file does not exist
+    """
+    file_stat = stat_file(path)
+    if file_stat is None:
+        raise Http404('File not found')
+
+    path, file_stat, encoding = choose_variant(request, path, file_stat)
+    etag = make_etag(file_stat, encoding)
+    last_modified = int(file_stat.st_mtime)
+
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        backend = settings.RESOURCE_SENDFILE_BACKEND
+        if backend:
+            response = _offload_response(
+                backend,
+                path,
+                content_type,
+                root or settings.RESOURCE_FILES_DIR,
+                accel_prefix or settings.RESOURCE_ACCEL_REDIRECT_PREFIX,
+            )
+        else:
+            response = _file_response(request, path, file_stat.st_size, content_type, etag, last_modified)
+            if response.status_code == 416:
+                return response
+
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    # Always revalidate - a changed file must not be served from a heuristic cache
+    response['Cache-Control'] = 'no-cache'
+    patch_vary_headers(response, ['Accept-Encoding'])
+    if response.status_code in (200, 206):
+        response['Content-Type'] = content_type
+        response['Content-Disposition'] = content_disposition_header(True, filename)
+        if encoding:
+            response['Content-Encoding'] = encoding
+    return response
+
+
+def _offload_response(backend, path, content_type, root, accel_prefix):
+    """Empty response telling the front proxy which file to send"""
+    response = HttpResponse(content_type=content_type)
+    if backend == 'x-accel-redirect':
+        relative = os.path.relpath(path, os.path.realpath(root))
+        location = accel_prefix.rstrip('/') + '/' + quote(relative.replace(os.sep, '/'))
+        response['X-Accel-Redirect'] = location
+    elif backend == 'x-sendfile':
+        response['X-Sendfile'] = path
+    else:
+        raise ValueError(f'Unknown RESOURCE_SENDFILE_BACKEND: {backend!r}')
+    return response
+
+
+def _file_response(request, path, size, content_type, etag, last_modified):
+    """FileResponse for the whole file or the requested byte range"""
+    byte_range = None
+    if 'HTTP_RANGE' in request.META and _range_applies(request, etag, last_modified):
+        byte_range = parse_range(request.META['HTTP_RANGE'], size)
+        if byte_range is False:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{size}'
+            return response
+
+    try:
+        file = open(path, 'rb')
+    except OSError:
+        raise Http404('File not found')
+
+    if byte_range:
+        start, end = byte_range
+        response = FileResponse(FileRange(file, start, end), content_type=content_type, status=206)
+        response['Content-Range'] = f'bytes {start}-{end - 1}/{size}'
+    else:
+        response = FileResponse(file, content_type=content_type)
+    response.block_size = BLOCK_SIZE
+    response['Accept-Ranges'] = 'bytes'
+    return response
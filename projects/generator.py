@@ -1,7 +1,15 @@
 """
 Project Generator - Creates custom projects based on user preferences
 """
+import hashlib
+import json
 import random
+import time
+from types import MappingProxyType
+
+from django.db import IntegrityError, transaction
+
+from . import metrics
 from .models import Project, ProjectStep
 
 
@@ -185,15 +193,31 @@ class ProjectGenerator:
             interests: Optional list of interests
             
         Returns:
-            Project instance with generated steps
+            Project instance with generated steps (an existing one if the same
+            inputs were generated before)
         """
+        started = time.perf_counter()
+        
+        # Same inputs always produce the same project: normalise them and seed
+        # the RNG from them so keyword and template choices are reproducible
+        keywords = sorted(set(keywords or []))
+        interests = sorted(set(interests or []))
+        inputs = {
+            'track': track,
+            'difficulty': difficulty,
+            'timeframe': timeframe,
+            'keywords': keywords,
+            'interests': interests,
+        }
+        rng = random.Random(self._hash(inputs))
+        
         # Select keyword
-        if keywords and len(keywords) > 0:
-            keyword = random.choice(keywords)
-        elif interests and len(interests) > 0:
-            keyword = random.choice(interests)
+        if keywords:
+            keyword = rng.choice(keywords)
+        elif interests:
+            keyword = rng.choice(interests)
         else:
-            keyword = random.choice(self.KEYWORDS)
+            keyword = rng.choice(self.KEYWORDS)
         
         # Get template
         templates = self.PROJECT_TEMPLATES.get(track, {}).get(difficulty, [])
@@ -212,190 +236,240 @@ class ProjectGenerator:
                 'technologies': ['General Development'],
             }
         else:
-            template = random.choice(templates)
+            template = rng.choice(templates)
+        
+        # Reuse a project generated from the same inputs and template
+        generation_hash = self._hash({**inputs, 'keyword': keyword, 'template': template})
+        existing = Project.objects.filter(generation_hash=generation_hash).first()
+        if existing is not None:
+            self._record_run('reused', started)
+            return existing
         
         # Generate title and description
         title = template['title_template'].format(keyword=keyword)
         description = template['description_template'].format(keyword=keyword, track=track)
         
-        # Create project
-        project = Project.objects.create(
-            title=title,
-            description=description,
-            difficulty=difficulty,
-            track=track,
-            is_generated=True,
-            user_preferences={
-                'keywords': keywords or [],
-                'interests': interests or [],
-                'timeframe': timeframe,
-            }
-        )
+        # Build step rows before touching the database
+        steps = self._build_steps(track, difficulty, timeframe, template.get('technologies', []))
         
-        # Generate steps based on timeframe
-        self._generate_steps(project, track, difficulty, timeframe, template.get('technologies', []))
+        # Project and steps are written in one transaction: one INSERT for the
+        # project and one bulk INSERT for its steps
+        try:
+            with transaction.atomic():
+                project = Project.objects.create(
+                    title=title,
+                    description=description,
+                    difficulty=difficulty,
+                    track=track,
+                    is_generated=True,
+                    generation_hash=generation_hash,
+                    user_preferences={
+                        'keywords': keywords,
+                        'interests': interests,
+                        'timeframe': timeframe,
+                    },
+                    # bulk_create skips signals, so fill the cached counts here.
+                    # All steps are tagged with the chosen timeframe, the only one offered.
+                    step_stats=Project.build_step_stats({
+                        timeframe: (len(steps), sum(step.estimated_time for step in steps)),
+                    })
+                )
+                for step in steps:
+                    step.project = project
+                ProjectStep.objects.bulk_create(steps)
+        except IntegrityError:
+            # A concurrent request inserted the same project first
+            self._record_run('reused', started)
+            return Project.objects.get(generation_hash=generation_hash)
         
+        self._record_run('created', started)
         return project
     
-    def _generate_steps(self, project, track, difficulty, timeframe, base_technologies):
-        """Generate project steps based on timeframe"""
+    @staticmethod
+    def _record_run(result, started):
+        metrics.inc('projecthack_generator_runs_total', {'result': result})
+        metrics.observe('projecthack_generator_duration_seconds', time.perf_counter() - started)
+    
+    @staticmethod
+    def _hash(data):
+        """Stable SHA-256 of JSON-serialisable data"""
+        canonical = json.dumps(data, sort_keys=True, separators=(',', ':'))
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+    
+    def _build_steps(self, track, difficulty, timeframe, base_technologies):
+        """Build unsaved ProjectStep instances for a timeframe"""
         timeframe_hours = int(timeframe.replace('h', ''))
         
-        # Base steps for all timeframes
-        base_steps = self._get_base_steps(track, difficulty)
-        
-        # Calculate number of steps based on timeframe
-        if timeframe_hours == 6:
-            steps = base_steps[:6]
-        elif timeframe_hours == 12:
-            steps = base_steps[:8]
-        elif timeframe_hours == 24:
-            steps = base_steps[:12]
-        else:  # 48h
-            steps = base_steps[:16]
+        # Base steps for all timeframes, truncated to the timeframe's step budget
+        steps = self._get_base_steps(track, difficulty)[:STEPS_PER_TIMEFRAME.get(timeframe_hours, 16)]
         
         # Create ProjectStep instances
-        for idx, step_data in enumerate(steps, 1):
-            # Merge base technologies with step-specific ones
-            technologies = base_technologies + step_data.get('technologies', [])
-            
-            ProjectStep.objects.create(
-                project=project,
+        return [
+            ProjectStep(
                 step_number=idx,
                 timeframe=timeframe,
                 title=step_data['title'],
                 description=step_data['description'],
-                technologies=list(set(technologies)),  # Remove duplicates
+                # Merge base technologies with step-specific ones, removing duplicates
+                technologies=list(set(base_technologies).union(step_data['technologies'])),
                 estimated_time=step_data.get('estimated_time', timeframe_hours * 60 // len(steps)),
                 learning_outcomes=step_data.get('learning_outcomes', '')
             )
+            for idx, step_data in enumerate(steps, 1)
+        ]
     
     def _get_base_steps(self, track, difficulty):
-        """Get base step templates for a track and difficulty"""
-        # Generic step templates that work for most projects
-        base_steps = [
+        """Get base step templates for a track and difficulty (precompiled at import time)"""
+        plan = BASE_STEP_PLANS.get((track, difficulty))
+        if plan is None:
+            plan = _compile_plan(_build_base_steps(track, difficulty))
+        return plan
+
+
+def _build_base_steps(track, difficulty):
+    """Build base step templates for a track and difficulty"""
+    # Generic step templates that work for most projects
+    base_steps = [
+        {
+            'title': 'Project Setup and Planning',
+            'description': 'Set up your development environment, create project structure, and plan your approach.',
+            'technologies': ['Project Setup'],
+            'estimated_time': 30,
+            'learning_outcomes': 'Project structure and planning',
+        },
+        {
+            'title': 'Core Functionality Implementation',
+            'description': 'Implement the core features and functionality of your project.',
+            'technologies': ['Core Development'],
+            'estimated_time': 120,
+            'learning_outcomes': 'Core feature development',
+        },
+        {
+            'title': 'User Interface Development',
+            'description': 'Design and implement the user interface. Make it intuitive and user-friendly.',
+            'technologies': ['UI/UX'],
+            'estimated_time': 90,
+            'learning_outcomes': 'User interface design',
+        },
+        {
+            'title': 'Data Management',
+            'description': 'Implement data storage, retrieval, and management functionality.',
+            'technologies': ['Data Management'],
+            'estimated_time': 90,
+            'learning_outcomes': 'Data handling',
+        },
+        {
+            'title': 'Testing and Debugging',
+            'description': 'Test your application, fix bugs, and ensure everything works correctly.',
+            'technologies': ['Testing', 'Debugging'],
+            'estimated_time': 60,
+            'learning_outcomes': 'Testing and quality assurance',
+        },
+        {
+            'title': 'Polish and Deployment',
+            'description': 'Add final touches, optimize performance, and deploy your project.',
+            'technologies': ['Deployment', 'Optimization'],
+            'estimated_time': 60,
+            'learning_outcomes': 'Deployment and optimization',
+        },
+    ]
+    
+    # Add track-specific steps
+    if track == 'frontend':
+        base_steps.extend([
             {
-                'title': 'Project Setup and Planning',
-                'description': 'Set up your development environment, create project structure, and plan your approach.',
-                'technologies': ['Project Setup'],
-                'estimated_time': 30,
-                'learning_outcomes': 'Project structure and planning',
+                'title': 'Responsive Design',
+                'description': 'Make your application work perfectly on all device sizes.',
+                'technologies': ['Responsive Design', 'Media Queries'],
+                'estimated_time': 60,
             },
             {
-                'title': 'Core Functionality Implementation',
-                'description': 'Implement the core features and functionality of your project.',
-                'technologies': ['Core Development'],
-                'estimated_time': 120,
-                'learning_outcomes': 'Core feature development',
+                'title': 'JavaScript Interactivity',
+                'description': 'Add interactive features and dynamic behavior.',
+                'technologies': ['JavaScript', 'DOM Manipulation'],
+                'estimated_time': 90,
             },
+        ])
+    elif track == 'backend':
+        base_steps.extend([
             {
-                'title': 'User Interface Development',
-                'description': 'Design and implement the user interface. Make it intuitive and user-friendly.',
-                'technologies': ['UI/UX'],
+                'title': 'API Endpoints',
+                'description': 'Create RESTful API endpoints for your application.',
+                'technologies': ['REST API', 'Endpoints'],
                 'estimated_time': 90,
-                'learning_outcomes': 'User interface design',
             },
             {
-                'title': 'Data Management',
-                'description': 'Implement data storage, retrieval, and management functionality.',
-                'technologies': ['Data Management'],
+                'title': 'Database Integration',
+                'description': 'Set up and integrate a database for data persistence.',
+                'technologies': ['Database', 'ORM'],
                 'estimated_time': 90,
-                'learning_outcomes': 'Data handling',
             },
+        ])
+    elif track == 'react':
+        base_steps.extend([
             {
-                'title': 'Testing and Debugging',
-                'description': 'Test your application, fix bugs, and ensure everything works correctly.',
-                'technologies': ['Testing', 'Debugging'],
-                'estimated_time': 60,
-                'learning_outcomes': 'Testing and quality assurance',
+                'title': 'Component Architecture',
+                'description': 'Design and build reusable React components.',
+                'technologies': ['React', 'Components'],
+                'estimated_time': 90,
             },
             {
-                'title': 'Polish and Deployment',
-                'description': 'Add final touches, optimize performance, and deploy your project.',
-                'technologies': ['Deployment', 'Optimization'],
-                'estimated_time': 60,
-                'learning_outcomes': 'Deployment and optimization',
+                'title': 'State Management',
+                'description': 'Implement state management using hooks or context.',
+                'technologies': ['React Hooks', 'State Management'],
+                'estimated_time': 90,
             },
-        ]
-        
-        # Add track-specific steps
-        if track == 'frontend':
-            base_steps.extend([
-                {
-                    'title': 'Responsive Design',
-                    'description': 'Make your application work perfectly on all device sizes.',
-                    'technologies': ['Responsive Design', 'Media Queries'],
-                    'estimated_time': 60,
-                },
-                {
-                    'title': 'JavaScript Interactivity',
-                    'description': 'Add interactive features and dynamic behavior.',
-                    'technologies': ['JavaScript', 'DOM Manipulation'],
-                    'estimated_time': 90,
-                },
-            ])
-        elif track == 'backend':
-            base_steps.extend([
-                {
-                    'title': 'API Endpoints',
-                    'description': 'Create RESTful API endpoints for your application.',
-                    'technologies': ['REST API', 'Endpoints'],
-                    'estimated_time': 90,
-                },
-                {
-                    'title': 'Database Integration',
-                    'description': 'Set up and integrate a database for data persistence.',
-                    'technologies': ['Database', 'ORM'],
-                    'estimated_time': 90,
-                },
-            ])
-        elif track == 'react':
-            base_steps.extend([
-                {
-                    'title': 'Component Architecture',
-                    'description': 'Design and build reusable React components.',
-                    'technologies': ['React', 'Components'],
-                    'estimated_time': 90,
-                },
-                {
-                    'title': 'State Management',
-                    'description': 'Implement state management using hooks or context.',
-                    'technologies': ['React Hooks', 'State Management'],
-                    'estimated_time': 90,
-                },
-            ])
-        
-        # Add difficulty-specific steps
-        if difficulty == 'intermediate':
-            base_steps.extend([
-                {
-                    'title': 'Advanced Features',
-                    'description': 'Implement advanced features and functionality.',
-                    'technologies': ['Advanced Development'],
-                    'estimated_time': 120,
-                },
-            ])
-        elif difficulty == 'advanced':
-            base_steps.extend([
-                {
-                    'title': 'Advanced Features',
-                    'description': 'Implement advanced features and functionality.',
-                    'technologies': ['Advanced Development'],
-                    'estimated_time': 120,
-                },
-                {
-                    'title': 'Performance Optimization',
-                    'description': 'Optimize your application for performance and scalability.',
-                    'technologies': ['Performance', 'Optimization'],
-                    'estimated_time': 90,
-                },
-                {
-                    'title': 'Security Implementation',
-                    'description': 'Add security measures and best practices.',
-                    'technologies': ['Security', 'Best Practices'],
-                    'estimated_time': 90,
-                },
-            ])
-        
-        return base_steps
+        ])
+    
+    # Add difficulty-specific steps
+    if difficulty == 'intermediate':
+        base_steps.extend([
+            {
+                'title': 'Advanced Features',
+                'description': 'Implement advanced features and functionality.',
+                'technologies': ['Advanced Development'],
+                'estimated_time': 120,
+            },
+        ])
+    elif difficulty == 'advanced':
+        base_steps.extend([
+            {
+                'title': 'Advanced Features',
+                'description': 'Implement advanced features and functionality.',
+                'technologies': ['Advanced Development'],
+                'estimated_time': 120,
+            },
+            {
+                'title': 'Performance Optimization',
+                'description': 'Optimize your application for performance and scalability.',
+                'technologies': ['Performance', 'Optimization'],
+                'estimated_time': 90,
+            },
+            {
+                'title': 'Security Implementation',
+                'description': 'Add security measures and best practices.',
+                'technologies': ['Security', 'Best Practices'],
+                'estimated_time': 90,
+            },
+        ])
+    
+    return base_steps
+
+
+def _compile_plan(steps):
+    """Freeze a list of step dicts into an immutable plan"""
+    return tuple(
+        MappingProxyType({**step, 'technologies': tuple(step.get('technologies', ()))})
+        for step in steps
+    )
+
+
+# Number of base steps used per timeframe (hours)
+STEPS_PER_TIMEFRAME = {6: 6, 12: 8, 24: 12, 48: 16}
 
+# Step plans for every (track, difficulty), built once instead of on every generation
+BASE_STEP_PLANS = {
+    (track, difficulty): _compile_plan(_build_base_steps(track, difficulty))
+    for track, _ in Project.TRACK_CHOICES
+    for difficulty, _ in Project.DIFFICULTY_CHOICES
+}
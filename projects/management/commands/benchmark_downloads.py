@@ -0,0 +1,148 @@
+import statistics
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from django.urls import reverse
+from projects.models import ProjectResource
+
+
+class Command(BaseCommand):
+    help = 'Benchmark resource downloads (downloads/sec per worker) against a running server or in-process'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--resource',
+            type=int,
+            default=None,
+            help='ProjectResource id to download (default: the first one)',
+        )
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=2000,
+            help='Total number of downloads',
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=8,
+            help='Downloads in flight at once',
+        )
+        parser.add_argument(
+            '--base-url',
+            type=str,
+            help='Download from a running server (e.g. http://127.0.0.1:8000) instead of the in-process client',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help='Worker processes of the server under test, to report downloads/sec per worker',
+        )
+        parser.add_argument(
+            '--range',
+            type=str,
+            default='',
+            help='Range header to send (e.g. bytes=0-65535)',
+        )
+        parser.add_argument(
+            '--accept-encoding',
+            type=str,
+            default='',
+            help='Accept-Encoding header to send (e.g. "br, gzip")',
+        )
+        parser.add_argument(
+            '--revalidate',
+            action='store_true',
+            help='Send If-None-Match with the current ETag (measures 304 responses)',
+        )
+
+    def handle(self, *args, **options):
+        resources = ProjectResource.objects.order_by('pk')
+        if options['resource']:
+            resources = resources.filter(pk=options['resource'])
+        resource = resources.first()
+        if resource is None:
+            raise CommandError('No resource to download - run load_sample_projects first.')
+
+        path = reverse('projects:download_resource', args=[resource.pk])
+        base_url = options['base_url']
+        headers = {}
+        if options['range']:
+            headers['Range'] = options['range']
+        if options['accept_encoding']:
+            headers['Accept-Encoding'] = options['accept_encoding']
+        fetch = self._http_fetch if base_url else self._client_fetch
+        if options['revalidate']:
+            status, _, etag = fetch(base_url, path, headers)
+            if status != 200 or not etag:
+                raise CommandError(f'Cannot read the ETag of {path} (status {status})')
+            headers['If-None-Match'] = etag
+
+        total = options['requests']
+        target = base_url or 'in-process client'
+        self.stdout.write(
+            f'Downloading {resource.file_path} {total} times ({options["concurrency"]} concurrent) from {target}...'
+        )
+
+        durations = []
+        statuses = Counter()
+        transferred = [0]
+        lock = threading.Lock()
+
+        def download(_):
+            t0 = time.perf_counter()
+            try:
+                status, size, _ = fetch(base_url, path, headers)
+            except OSError:
+                status, size = None, 0
+            elapsed = time.perf_counter() - t0
+            with lock:
+                durations.append(elapsed)
+                statuses[status] += 1
+                transferred[0] += size
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options['concurrency']) as pool:
+            list(pool.map(download, range(total)))
+        elapsed = time.perf_counter() - started
+
+        durations.sort()
+        rate = total / elapsed
+        p95 = durations[min(len(durations) - 1, int(len(durations) * 0.95))]
+        self.stdout.write(f'Statuses:               {dict(statuses)}')
+        self.stdout.write(f'Downloads/sec:          {rate:,.0f}')
+        self.stdout.write(f'Downloads/sec/worker:   {rate / options["workers"]:,.0f}')
+        self.stdout.write(f'Throughput:             {transferred[0] / elapsed / 2 ** 20:,.1f} MiB/s')
+        self.stdout.write(f'Median latency:         {statistics.median(durations) * 1000:.2f} ms')
+        self.stdout.write(f'p95 latency:            {p95 * 1000:.2f} ms')
+
+    @staticmethod
+    def _http_fetch(base_url, path, headers):
+        """(status, body bytes, ETag) over HTTP"""
+        request = urllib.request.Request(base_url.rstrip('/') + path, headers=headers)
+        try:
+            with urllib.request.urlopen(request, timeout=30) as response:
+                return response.status, len(response.read()), response.headers.get('ETag')
+        except urllib.error.HTTPError as error:
+            return error.code, len(error.read()), error.headers.get('ETag')
+
+    _local = threading.local()
+
+    @classmethod
+    def _client_fetch(cls, base_url, path, headers):
+        """(status, body bytes, ETag) through the WSGI test client, one client per thread"""
+        client = getattr(cls._local, 'client', None)
+        if client is None:
+            client = cls._local.client = Client()
+        extra = {'HTTP_' + name.upper().replace('-', '_'): value for name, value in headers.items()}
+        response = client.get(path, **extra)
+        size = sum(len(chunk) for chunk in response.streaming_content) if response.streaming else len(response.content)
+        response.close()
+        return response.status_code, size, response.get('ETag')
@@ -0,0 +1,82 @@
+import statistics
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from projects.generator import ProjectGenerator
+from projects.models import Project
+
+
+class Command(BaseCommand):
+    help = 'Benchmark ProjectGenerator throughput (generations/sec) against the configured database'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--iterations',
+            type=int,
+            default=200,
+            help='Number of projects to generate',
+        )
+        parser.add_argument(
+            '--timeframe',
+            type=str,
+            default='48h',
+            help='Timeframe to generate (48h creates the most steps)',
+        )
+        parser.add_argument(
+            '--keep',
+            action='store_true',
+            help='Keep the generated projects instead of deleting them afterwards',
+        )
+
+    def handle(self, *args, **options):
+        iterations = options['iterations']
+        timeframe = options['timeframe']
+        generator = ProjectGenerator()
+        combos = [
+            (track, difficulty)
+            for track, _ in Project.TRACK_CHOICES
+            for difficulty, _ in Project.DIFFICULTY_CHOICES
+        ]
+
+        self.stdout.write(f'Benchmarking {iterations} generations ({timeframe}) on {connection.vendor}...')
+
+        # Unique keywords so every generation is new rather than reused
+        run = uuid.uuid4().hex[:8]
+        
+        # Count statements for one generation separately - capturing slows the timed loop
+        with CaptureQueriesContext(connection) as queries:
+            project = generator.generate_project(
+                track='frontend',
+                difficulty='beginner',
+                timeframe=timeframe,
+                keywords=[f'Benchmark {run}'],
+            )
+        project_ids = [project.id]
+
+        durations = []
+        started = time.perf_counter()
+        for i in range(iterations):
+            track, difficulty = combos[i % len(combos)]
+            t0 = time.perf_counter()
+            project = generator.generate_project(
+                track=track,
+                difficulty=difficulty,
+                timeframe=timeframe,
+                keywords=[f'Benchmark {run} {i}'],
+            )
+            durations.append(time.perf_counter() - t0)
+            project_ids.append(project.id)
+        elapsed = time.perf_counter() - started
+
+        if not options['keep']:
+            Project.objects.filter(pk__in=project_ids).delete()
+
+        durations.sort()
+        p95 = durations[min(len(durations) - 1, int(len(durations) * 0.95))]
+        self.stdout.write(f'Queries per generation: {len(queries)}')
+        self.stdout.write(f'Mean latency:           {statistics.mean(durations) * 1000:.2f} ms')
+        self.stdout.write(f'p95 latency:            {p95 * 1000:.2f} ms')
+        self.stdout.write(self.style.SUCCESS(f'Throughput:             {iterations / elapsed:.1f} generations/sec'))
@@ -0,0 +1,193 @@
+import itertools
+import random
+import statistics
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from projects import recommendations
+from projects.catalog import get_catalog_version
+from projects.models import Project
+from projects.recommendations import RecommendationIndex, profile_terms
+
+
+TECHNOLOGIES = [
+    'HTML', 'CSS', 'JavaScript', 'React', 'Vue.js', 'Angular', 'TypeScript', 'Tailwind CSS', 'SASS',
+    'Python', 'Django', 'Flask', 'Node.js', 'Express', 'REST API', 'GraphQL', 'PostgreSQL', 'MongoDB',
+    'Next.js', 'Pandas', 'NumPy', 'Matplotlib', 'FastAPI', 'Redux', 'React Router',
+]
+
+KEYWORDS = [
+    'E-commerce', 'Social Media', 'Blog', 'Dashboard', 'API', 'Mobile App', 'Data Visualization',
+    'Automation', 'Game', 'Portfolio', 'Weather', 'Todo', 'Calculator', 'Chat', 'Music', 'Video',
+    'Education', 'Health', 'Finance', 'Travel', 'Food', 'Sports', 'News', 'Shopping',
+]
+
+
+class Command(BaseCommand):
+    help = 'Benchmark the recommendation index (recommendations/sec) on a synthetic in-memory catalog'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--projects',
+            type=int,
+            default=100000,
+            help='Projects in the synthetic catalog',
+        )
+        parser.add_argument(
+            '--vocabulary',
+            type=int,
+            default=20000,
+            help='Distinct description words',
+        )
+        parser.add_argument(
+            '--queries',
+            type=int,
+            default=5000,
+            help='Recommendations to time, cold and warm',
+        )
+        parser.add_argument(
+            '--profiles',
+            type=int,
+            default=500,
+            help='Distinct profiles the queries cycle through',
+        )
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=6,
+            help='Projects per recommendation',
+        )
+        parser.add_argument(
+            '--changes',
+            type=int,
+            default=100,
+            help='Projects re-indexed to time an incremental update',
+        )
+        parser.add_argument(
+            '--verify',
+            type=int,
+            default=10,
+            help='Profiles to check against a brute-force scan (0 to skip)',
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=0,
+            help='Random seed for the catalog and profiles',
+        )
+
+    def handle(self, *args, **options):
+        if options['projects'] < 1 or options['queries'] < 1 or options['profiles'] < 1:
+            raise CommandError('--projects, --queries and --profiles must be positive.')
+        rng = random.Random(options['seed'])
+        tracks = [code for code, _ in Project.TRACK_CHOICES]
+        difficulties = [code for code, _ in Project.DIFFICULTY_CHOICES]
+        # Zipf-like word frequencies, so a few words are common and most are rare
+        words = [f'word{n}' for n in range(options['vocabulary'])] + [k.lower() for k in KEYWORDS]
+        word_weights = [1 / (rank + 1) for rank in range(len(words))]
+        rng.shuffle(word_weights)
+        cum_weights = list(itertools.accumulate(word_weights))
+
+        def make_project(project_id):
+            text = rng.choices(words, cum_weights=cum_weights, k=24)
+            project = Project(
+                id=project_id,
+                title=' '.join(text[:4]).title(),
+                description=' '.join(text[4:]),
+                track=rng.choice(tracks),
+                difficulty=rng.choice(difficulties),
+            )
+            return project, rng.sample(TECHNOLOGIES, rng.randint(2, 6))
+
+        self.stdout.write(f'Generating {options["projects"]:,} projects...')
+        projects = []
+        technologies = {}
+        for project_id in range(1, options['projects'] + 1):
+            project, names = make_project(project_id)
+            projects.append(project)
+            technologies[project_id] = names
+
+        t0 = time.perf_counter()
+        index = RecommendationIndex.build(projects, technologies)
+        build = time.perf_counter() - t0
+        dense = sum(1 for posting in index.postings.values() if isinstance(posting, int))
+        size = sum(sys.getsizeof(posting) for posting in index.postings.values())
+        self.stdout.write(
+            f'Index build:            {build:.2f} s ({len(index.postings):,} terms, {dense:,} as bitsets, '
+            f'{size / 2 ** 20:,.1f} MiB of postings)'
+        )
+
+        profiles = [
+            profile_terms(
+                rng.sample(tracks, rng.randint(1, 2)),
+                rng.choice(difficulties),
+                rng.sample(TECHNOLOGIES, rng.randint(1, 5)),
+                rng.sample(KEYWORDS, rng.randint(1, 3)),
+            )
+            for _ in range(options['profiles'])
+        ]
+        limit = options['limit']
+
+        checked = profiles[:options['verify']]
+        mismatches = 0
+        for weights in checked:
+            expected = sorted(
+                (-sum(weight for term, weight in weights.items() if term in index.terms[position]), position)
+                for position in range(len(index.projects))
+            )[:limit]
+            got = [(-score, index.positions[project.id]) for project, score in index.top(weights, limit)]
+            mismatches += got != expected
+        if checked:
+            self.stdout.write(
+                f'Verified:               {len(checked) - mismatches} of {len(checked)} profiles match a brute-force scan'
+            )
+
+        # Cold: scored from the index every time
+        durations = []
+        for i in range(options['queries']):
+            weights = profiles[i % len(profiles)]
+            t0 = time.perf_counter()
+            index.top(weights, limit)
+            durations.append(time.perf_counter() - t0)
+        self.report('Cold (index)', durations)
+
+        # Warm: through recommend(), memoised per profile - the index is installed
+        # as current so no database is needed
+        recommendations._local_index = (get_catalog_version(), index)
+        recommendations._memo.clear()
+        samples = [
+            (rng.sample(tracks, 1), rng.choice(difficulties), rng.sample(TECHNOLOGIES, 2), rng.sample(KEYWORDS, 1))
+            for _ in range(options['profiles'])
+        ]
+        for sample in samples:
+            recommendations.recommend(*sample, limit=limit)
+        durations = []
+        for i in range(options['queries']):
+            sample = samples[i % len(samples)]
+            t0 = time.perf_counter()
+            recommendations.recommend(*sample, limit=limit)
+            durations.append(time.perf_counter() - t0)
+        self.report('Warm (memoised)', durations)
+        recommendations._local_index = (None, None)
+        recommendations._memo.clear()
+
+        # Incremental: re-index changed projects in place, as after a catalog edit
+        changed = [make_project(project.id) for project in rng.sample(projects, min(options['changes'], len(projects)))]
+        t0 = time.perf_counter()
+        for project, names in changed:
+            index.add(project, names)
+        elapsed = time.perf_counter() - t0
+        self.stdout.write(
+            f'Incremental update:     {len(changed)} projects in {elapsed * 1000:.1f} ms '
+            f'({elapsed / max(1, len(changed)) * 1e6:.0f} us/project, vs {build:.2f} s to rebuild)'
+        )
+
+    def report(self, label, durations):
+        total = sum(durations)
+        durations.sort()
+        p95 = durations[min(len(durations) - 1, int(len(durations) * 0.95))]
+        self.stdout.write(
+            f'{label + ":":<24}{len(durations) / total:,.0f} recommendations/sec, '
+            f'median {statistics.median(durations) * 1e6:,.0f} us, p95 {p95 * 1e6:,.0f} us'
+        )
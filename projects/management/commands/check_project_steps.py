@@ -1,37 +1,202 @@
-from django.core.management.base import BaseCommand
+import csv
+import io
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count, Max, Min, Sum
 from projects.models import Project, ProjectStep
 
 
+TIMEFRAMES = [code for code, _ in ProjectStep.TIMEFRAME_CHOICES]
+
+# Issue code -> severity. Errors break the step pages; warnings are content problems.
+ISSUES = {
+    'no_steps': 'error',
+    'step_gap': 'error',
+    'missing_timeframe': 'warning',
+    'over_time': 'warning',
+}
+
+
+def project_plans():
+    """
+    Stream every project with its per-timeframe plans and consistency issues
+
+    Runs two queries in total - the projects and one aggregate over all steps,
+    both ordered by project id and merged while streaming.
+
+    Yields:
+        Dicts with the project's 'id', 'title', 'track', 'difficulty',
+        'is_generated', 'plans' ({timeframe: {'steps', 'minutes'}}) and
+        'issues' (list of {'code', 'severity', 'timeframe', 'detail'})
+    """
+    projects = Project.objects.order_by('pk').values('pk', 'title', 'track', 'difficulty', 'is_generated')
+    tiers = ProjectStep.objects.values('project', 'timeframe').annotate(
+        steps=Count('id'),
+        minutes=Sum('estimated_time'),
+        first=Min('step_number'),
+        last=Max('step_number'),
+    ).order_by('project')
+
+    tier_rows = tiers.iterator(chunk_size=2000)
+    pending = next(tier_rows, None)
+    for project in projects.iterator(chunk_size=2000):
+        project_tiers = {}
+        while pending is not None and pending['project'] <= project['pk']:
+            if pending['project'] == project['pk']:
+                project_tiers[pending['timeframe']] = pending
+            pending = next(tier_rows, None)
+
+        plans, issues = _check_plans(project, project_tiers)
+        yield {
+            'id': project['pk'],
+            'title': project['title'],
+            'track': project['track'],
+            'difficulty': project['difficulty'],
+            'is_generated': project['is_generated'],
+            'plans': plans,
+            'issues': issues,
+        }
+
+
+def _check_plans(project, project_tiers):
+    """
+    Build cumulative plans from per-tier aggregates and check them
+
+    Like Project.build_step_stats, a timeframe only has a plan when steps are
+    tagged with it; the plan then includes every shorter tier's steps.
+    """
+    def issue(code, timeframe, detail):
+        return {'code': code, 'severity': ISSUES[code], 'timeframe': timeframe, 'detail': detail}
+
+    if not project_tiers:
+        return {}, [issue('no_steps', None, 'No steps configured')]
+
+    plans = {}
+    issues = []
+    steps = minutes = 0
+    first = last = None
+    for timeframe in TIMEFRAMES:
+        tier = project_tiers.get(timeframe)
+        if not tier:
+            # Generated projects only have the timeframe they were generated for
+            if not project['is_generated']:
+                issues.append(issue('missing_timeframe', timeframe, f'No {timeframe} plan'))
+            continue
+
+        steps += tier['steps']
+        minutes += tier['minutes'] or 0
+        first = tier['first'] if first is None else min(first, tier['first'])
+        last = tier['last'] if last is None else max(last, tier['last'])
+        plans[timeframe] = {'steps': steps, 'minutes': minutes}
+        # A plan must be exactly steps 1..n, otherwise sessions stall on the missing number
+        if first != 1 or last != steps:
+            issues.append(issue('step_gap', timeframe, f'{steps} steps numbered {first}..{last}'))
+        budget = int(timeframe[:-1]) * 60
+        if minutes > budget:
+            issues.append(issue('over_time', timeframe, f'{minutes} min exceeds {budget} min'))
+    return plans, issues
+
+
 class Command(BaseCommand):
-    help = 'Check which projects have steps for which timeframes'
+    help = 'Check which projects have steps for which timeframes, and validate the step plans'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--format',
+            choices=['text', 'json', 'csv'],
+            default='text',
+            help='Output format (json and csv are meant for scripts and CI)',
+        )
+        parser.add_argument(
+            '--strict',
+            action='store_true',
+            help='Also fail on warnings (missing timeframes, plans over their time budget)',
+        )
 
     def handle(self, *args, **options):
+        writer = {
+            'text': self._write_text,
+            'json': self._write_json,
+            'csv': self._write_csv,
+        }[options['format']]
+
+        counts = {'projects': 0, 'error': 0, 'warning': 0}
+
+        def checked():
+            for project in project_plans():
+                counts['projects'] += 1
+                for found in project['issues']:
+                    counts[found['severity']] += 1
+                yield project
+
+        writer(checked(), counts)
+
+        if counts['error'] or (options['strict'] and counts['warning']):
+            raise CommandError(f'Step check failed: {counts["error"]} error(s), {counts["warning"]} warning(s)')
+
+    def _write_text(self, projects, counts):
         self.stdout.write('Checking project steps...\n')
-        
-        projects = Project.objects.all()
-        
-        if not projects.exists():
+        tracks = dict(Project.TRACK_CHOICES)
+        difficulties = dict(Project.DIFFICULTY_CHOICES)
+        total_steps = 0
+        for project in projects:
+            track = tracks.get(project['track'], project['track'])
+            difficulty = difficulties.get(project['difficulty'], project['difficulty'])
+            self.stdout.write(f'\n{project["title"]} (#{project["id"]}, {track}, {difficulty})')
+            plans = project['plans']
+            if plans:
+                self.stdout.write(self.style.SUCCESS(f'  ✅ Available timeframes: {", ".join(plans)}'))
+                for timeframe, plan in plans.items():
+                    self.stdout.write(f'     - {timeframe}: {plan["steps"]} steps, {plan["minutes"]} min')
+                # The longest plan includes every step
+                total_steps += list(plans.values())[-1]['steps']
+            for found in project['issues']:
+                style = self.style.ERROR if found['severity'] == 'error' else self.style.WARNING
+                icon = '❌' if found['severity'] == 'error' else '⚠️ '
+                self.stdout.write(style(f'  {icon} {found["code"]}: {found["detail"]}'))
+
+        if not counts['projects']:
             self.stdout.write(self.style.WARNING('No projects found. Run: python3 manage.py load_sample_projects'))
             return
-        
-        for project in projects:
-            self.stdout.write(f'\n{project.title} ({project.get_track_display()}, {project.get_difficulty_display()})')
-            
-            # Get timeframes with steps
-            timeframes = ProjectStep.objects.filter(project=project).values_list('timeframe', flat=True).distinct()
-            
-            if not timeframes:
-                self.stdout.write(self.style.ERROR('  ❌ No steps configured'))
-            else:
-                self.stdout.write(self.style.SUCCESS(f'  ✅ Available timeframes: {", ".join(sorted(timeframes))}'))
-                
-                # Show step counts per timeframe
-                for tf in sorted(timeframes):
-                    count = ProjectStep.objects.filter(project=project, timeframe=tf).count()
-                    self.stdout.write(f'     - {tf}: {count} steps')
-        
         self.stdout.write('\n' + '='*50)
-        total_projects = projects.count()
-        total_steps = ProjectStep.objects.count()
-        self.stdout.write(f'Total: {total_projects} projects, {total_steps} steps')
+        self.stdout.write(f'Total: {counts["projects"]} projects, {total_steps} steps')
+        self.stdout.write(f'Issues: {counts["error"]} error(s), {counts["warning"]} warning(s)')
 
+    def _write_json(self, projects, counts):
+        # Written incrementally so memory stays flat however many projects there are
+        self.stdout.write('{"projects": [', ending='')
+        for index, project in enumerate(projects):
+            self.stdout.write((',\n' if index else '\n') + json.dumps(project), ending='')
+        self.stdout.write('\n], "summary": ' + json.dumps(counts) + '}')
+
+    def _write_csv(self, projects, counts):
+        # One row per project and timeframe; project-wide issues go on the first row
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator='\n')
+        
+        def flush():
+            self.stdout.write(buffer.getvalue(), ending='')
+            buffer.seek(0)
+            buffer.truncate()
+        
+        writer.writerow(['project_id', 'title', 'is_generated', 'timeframe', 'steps', 'minutes', 'errors', 'warnings'])
+        for project in projects:
+            for index, timeframe in enumerate(TIMEFRAMES):
+                plan = project['plans'].get(timeframe, {'steps': 0, 'minutes': 0})
+                found = [
+                    issue for issue in project['issues']
+                    if issue['timeframe'] == timeframe or (issue['timeframe'] is None and index == 0)
+                ]
+                writer.writerow([
+                    project['id'],
+                    project['title'],
+                    int(project['is_generated']),
+                    timeframe,
+                    plan['steps'],
+                    plan['minutes'],
+                    ';'.join(issue['code'] for issue in found if issue['severity'] == 'error'),
+                    ';'.join(issue['code'] for issue in found if issue['severity'] == 'warning'),
+                ])
+            flush()
+        flush()
@@ -1,38 +1,84 @@
+import time
+
 from django.core.management.base import BaseCommand
-from django.db.models import Count
+from django.db import transaction
+from django.db.models import Exists, Max, Min, OuterRef, Q
 from projects.models import UserSession
 
 
+def superseded_sessions():
+    """
+    Incomplete sessions with a newer incomplete session for the same user, project and timeframe
+
+    The newest one per group (latest start_time, then highest id) is the only one not matched.
+    The correlated subquery is served by usersession_lookup_idx.
+    """
+    newer = UserSession.objects.filter(
+        session_id=OuterRef('session_id'),
+        project=OuterRef('project'),
+        selected_timeframe=OuterRef('selected_timeframe'),
+        completed=False,
+    ).filter(
+        Q(start_time__gt=OuterRef('start_time')) | Q(start_time=OuterRef('start_time'), pk__gt=OuterRef('pk'))
+    )
+    return UserSession.objects.filter(completed=False).filter(Exists(newer))
+
+
 class Command(BaseCommand):
-    help = 'Clean up duplicate user sessions'
+    help = 'Clean up duplicate user sessions (keeps the newest incomplete session per user, project and timeframe)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=10000,
+            help='Session ids scanned per statement (each batch is its own transaction)',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only count the sessions that would be deleted',
+        )
+        parser.add_argument(
+            '--progress-every',
+            type=int,
+            default=100,
+            help='Report progress every N batches (0 = never)',
+        )
 
     def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        dry_run = options['dry_run']
+        verb = 'Would delete' if dry_run else 'Deleted'
         self.stdout.write('Cleaning up duplicate sessions...')
-        
-        # Find duplicate sessions (same session_id, project, timeframe, not completed)
-        duplicates = UserSession.objects.filter(completed=False).values(
-            'session_id', 'project', 'selected_timeframe'
-        ).annotate(
-            count=Count('id')
-        ).filter(count__gt=1)
-        
-        total_deleted = 0
-        for dup in duplicates:
-            sessions = UserSession.objects.filter(
-                session_id=dup['session_id'],
-                project_id=dup['project'],
-                selected_timeframe=dup['selected_timeframe'],
-                completed=False
-            ).order_by('-start_time')
-            
-            # Keep the most recent one, delete others
-            if sessions.count() > 1:
-                to_keep = sessions.first()
-                to_delete = sessions.exclude(id=to_keep.id)
-                count = to_delete.count()
-                to_delete.delete()
-                total_deleted += count
-                self.stdout.write(f'Deleted {count} duplicate session(s) for {to_keep.project.title}')
-        
-        self.stdout.write(self.style.SUCCESS(f'Successfully cleaned up {total_deleted} duplicate sessions!'))
 
+        bounds = UserSession.objects.aggregate(low=Min('pk'), high=Max('pk'))
+        if bounds['low'] is None:
+            self.stdout.write(self.style.SUCCESS('No sessions to check.'))
+            return
+
+        # Walk the table in fixed primary-key windows so every statement does bounded
+        # work, however few duplicates there are
+        started = time.perf_counter()
+        total = 0
+        batches = 0
+        for low in range(bounds['low'], bounds['high'] + 1, batch_size):
+            window = superseded_sessions().filter(pk__gte=low, pk__lt=low + batch_size)
+            if dry_run:
+                total += window.count()
+            else:
+                with transaction.atomic():
+                    total += window.delete()[0]
+
+            batches += 1
+            if options['progress_every'] and batches % options['progress_every'] == 0:
+                scanned = min(low + batch_size, bounds['high'] + 1) - bounds['low']
+                span = bounds['high'] + 1 - bounds['low']
+                elapsed = time.perf_counter() - started
+                self.stdout.write(
+                    f'  {scanned / span:6.1%} of ids scanned, {total} duplicate(s) so far '
+                    f'({scanned / elapsed:,.0f} ids/sec)'
+                )
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f'{verb} {total} duplicate session(s) in {elapsed:.1f}s'))
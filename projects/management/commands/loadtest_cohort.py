@@ -0,0 +1,347 @@
+import http.cookiejar
+import random
+import re
+import secrets
+import statistics
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.test import Client
+
+from projects.models import Project, UserProfile, UserSession
+
+
+SESSION_URL = re.compile(r'/session/(\d+)/')
+PROJECT_URL = re.compile(r'/project/(\d+)/')
+TIMER_TOKEN = re.compile(r"let timerToken = '([^']*)'")
+
+
+class ClientTransport:
+    """Requests through the full middleware stack in this process (WSGI test client)"""
+
+    def __init__(self):
+        self.client = Client()
+
+    def request(self, method, path, data=None):
+        response = getattr(self.client, method)(path, data)
+        body = b'' if response.streaming else response.content
+        response.close()
+        return response.status_code, body, response.get('Location', '')
+
+    def profile_key(self):
+        """The onboarding session id the server stored for this participant"""
+        return self.client.session.get('session_id')
+
+
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+class HttpTransport:
+    """Requests to a running server (e.g. gunicorn) over HTTP, with cookies and CSRF"""
+
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip('/')
+        self.cookies = http.cookiejar.CookieJar()
+        self.opener = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(self.cookies), _NoRedirect()
+        )
+
+    def request(self, method, path, data=None):
+        url = self.base_url + path
+        headers = {}
+        body = None
+        if method == 'post':
+            body = urllib.parse.urlencode(data or {}, doseq=True).encode()
+            headers['Referer'] = self.base_url + '/'
+            csrf = next((cookie.value for cookie in self.cookies if cookie.name == 'csrftoken'), None)
+            if csrf:
+                headers['X-CSRFToken'] = csrf
+        elif data:
+            url += '?' + urllib.parse.urlencode(data)
+        try:
+            with self.opener.open(urllib.request.Request(url, data=body, headers=headers), timeout=30) as response:
+                return response.status, response.read(), response.headers.get('Location', '')
+        except urllib.error.HTTPError as error:
+            return error.code, error.read(), error.headers.get('Location', '')
+
+    def profile_key(self):
+        # Kept in the server's session store, out of reach of the client
+        return None
+
+
+class Command(BaseCommand):
+    help = 'Simulate a hackathon cohort (onboarding, browsing, starting and completing a project) and report latency per route'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--participants',
+            type=int,
+            default=50,
+            help='Number of simulated participants',
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=None,
+            help='Participants active at once (default: all of them)',
+        )
+        parser.add_argument(
+            '--ramp-up',
+            type=float,
+            default=10.0,
+            help='Seconds over which participants arrive',
+        )
+        parser.add_argument(
+            '--think-time',
+            type=float,
+            default=1.0,
+            help='Mean pause between a participant\'s actions in seconds (exponentially distributed, 0 = none)',
+        )
+        parser.add_argument(
+            '--timer-polls',
+            type=int,
+            default=3,
+            help='Timer status polls per step',
+        )
+        parser.add_argument(
+            '--timeframe',
+            choices=['6h', '12h', '24h', '48h'],
+            default='6h',
+            help='Timeframe participants choose',
+        )
+        parser.add_argument(
+            '--generate-share',
+            type=float,
+            default=0.0,
+            help='Fraction of participants who generate a custom project and work through it instead of a pre-made one',
+        )
+        parser.add_argument(
+            '--base-url',
+            type=str,
+            help='Load a running server (e.g. http://127.0.0.1:8000) instead of the in-process client',
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=None,
+            help='Random seed for reproducible runs',
+        )
+        parser.add_argument(
+            '--keep',
+            action='store_true',
+            help='Keep the profiles, sessions and generated projects created by the run. By default the in-process '
+                 'client deletes them afterwards; with --base-url nothing is deleted, so load a throwaway database',
+        )
+
+    def handle(self, *args, **options):
+        if not 0 <= options['generate_share'] <= 1:
+            raise CommandError('--generate-share must be between 0 and 1.')
+        timeframe = options['timeframe']
+        # project id -> number of steps in the chosen timeframe
+        projects = {
+            project_id: step_stats[timeframe]['steps']
+            for project_id, step_stats in Project.objects.filter(is_generated=False).values_list('id', 'step_stats')
+            if step_stats.get(timeframe, {}).get('steps')
+        }
+        if not projects:
+            raise CommandError(f'No pre-made projects have {timeframe} steps - run load_sample_projects first.')
+
+        participants = options['participants']
+        concurrency = options['concurrency'] or participants
+        self.options = options
+        self.projects = projects
+        self.samples = []
+        self.session_ids = []
+        self.profile_keys = []
+        self.project_ids = []  # generated by participants
+        # Unique keyword for generated projects, so they never match (and reuse)
+        # one generated by a real user
+        self.nonce = f'Loadtest {secrets.token_hex(4)}'
+        self.lock = threading.Lock()
+        rng = random.Random(options['seed'])
+        seeds = [rng.random() for _ in range(participants)]
+
+        target = options['base_url'] or f'in-process client on {connection.vendor}'
+        self.stdout.write(f'Simulating {participants} participants ({concurrency} concurrent) against {target}...')
+
+        started = time.perf_counter()
+        if concurrency == 1:
+            for index in range(participants):
+                self._participant(index, seeds[index], started)
+        else:
+            with ThreadPoolExecutor(max_workers=concurrency) as pool:
+                for future in [
+                    pool.submit(self._participant, index, seeds[index], started)
+                    for index in range(participants)
+                ]:
+                    future.result()
+        elapsed = time.perf_counter() - started
+
+        self._report(elapsed)
+
+        if options['keep']:
+            return
+        if options['base_url']:
+            self.stdout.write(self.style.WARNING(
+                'Not cleaning up: the server at --base-url may use another database than this command. '
+                'Run against a throwaway database.'
+            ))
+            return
+        self._cleanup()
+
+    def _cleanup(self):
+        """Delete the profiles, sessions and generated projects the run created"""
+        if self.profile_keys:
+            UserProfile.objects.filter(session_id__in=self.profile_keys).delete()
+        if self.session_ids:
+            UserSession.objects.filter(pk__in=self.session_ids).delete()
+        if self.project_ids:
+            # Deleting a project also deletes its steps and any sessions on it
+            Project.objects.filter(pk__in=self.project_ids, is_generated=True).delete()
+
+    def _participant(self, index, seed, started):
+        """One participant's journey; failures end the journey but are recorded"""
+        options = self.options
+        rng = random.Random(seed)
+        transport = HttpTransport(options['base_url']) if options['base_url'] else ClientTransport()
+        ramp = options['ramp_up'] * index / max(1, options['participants'])
+        time.sleep(max(0, started + ramp - time.perf_counter()))
+
+        def think():
+            if options['think_time'] > 0:
+                time.sleep(min(rng.expovariate(1 / options['think_time']), options['think_time'] * 5))
+
+        def call(route, method, path, data=None, expect=(200, 302)):
+            t0 = time.perf_counter()
+            try:
+                status, body, location = transport.request(method, path, data)
+                ok = status in expect
+            except Exception:
+                status, body, location, ok = None, b'', '', False
+            with self.lock:
+                self.samples.append((route, time.perf_counter() - t0, ok))
+            if not ok:
+                raise _JourneyFailed(route)
+            return body, location
+
+        try:
+            # Onboarding
+            call('onboarding_start', 'get', '/onboarding/')
+            call('onboarding_start', 'post', '/onboarding/', {'experience_level': 'beginner'})
+            profile_key = transport.profile_key()
+            if profile_key:
+                with self.lock:
+                    self.profile_keys.append(profile_key)
+            think()
+            call('onboarding_technologies', 'get', '/onboarding/technologies/')
+            call('onboarding_technologies', 'post', '/onboarding/technologies/', {'technologies': ['Python', 'Django']})
+            think()
+            call('onboarding_tracks', 'get', '/onboarding/tracks/')
+            call('onboarding_tracks', 'post', '/onboarding/tracks/', {
+                'tracks': [rng.choice([code for code, _ in Project.TRACK_CHOICES])],
+                'difficulty': rng.choice([code for code, _ in Project.DIFFICULTY_CHOICES]),
+                'timeframe': options['timeframe'],
+            })
+            think()
+            call('onboarding_interests', 'get', '/onboarding/interests/')
+            call('onboarding_interests', 'post', '/onboarding/interests/', {'interests': 'Games, Weather'})
+            call('onboarding_complete', 'get', '/onboarding/complete/')
+            think()
+
+            # Browse and start a project
+            call('home', 'get', '/')
+            think()
+            if rng.random() < options['generate_share']:
+                call('generate_project', 'get', '/generate/')
+                think()
+                _, location = call('generate_project', 'post', '/generate/', {
+                    'track': rng.choice([code for code, _ in Project.TRACK_CHOICES]),
+                    'difficulty': rng.choice([code for code, _ in Project.DIFFICULTY_CHOICES]),
+                    'timeframe': options['timeframe'],
+                    'keywords': self.nonce,
+                }, expect=(302,))
+                # A failed generation redirects back to the form
+                match = PROJECT_URL.search(location)
+                if not match:
+                    raise _JourneyFailed('generate_project')
+                project_id = int(match.group(1))
+                with self.lock:
+                    if project_id not in self.project_ids:
+                        self.project_ids.append(project_id)
+                step_stats = Project.objects.filter(pk=project_id).values_list('step_stats', flat=True).first() or {}
+                steps = step_stats.get(options['timeframe'], {}).get('steps', 0)
+            else:
+                project_id = rng.choice(list(self.projects))
+                steps = self.projects[project_id]
+            call('project_overview', 'get', f'/project/{project_id}/')
+            think()
+            _, location = call('start_project', 'post', f'/project/{project_id}/start/', {
+                'timeframe': options['timeframe'],
+            }, expect=(302,))
+            match = SESSION_URL.search(location)
+            if not match:
+                raise _JourneyFailed('start_project')
+            session_id = int(match.group(1))
+            with self.lock:
+                self.session_ids.append(session_id)
+
+            # Work through the steps, polling the timer like the step page does
+            for step in range(1, steps + 1):
+                body, _ = call('project_step', 'get', f'/session/{session_id}/', expect=(200,))
+                token = TIMER_TOKEN.search(body.decode('utf-8', 'replace'))
+                for _ in range(options['timer_polls']):
+                    think()
+                    call('timer_status', 'get', f'/session/{session_id}/timer/', {
+                        'token': token.group(1) if token else '',
+                    })
+                call('complete_step', 'post', f'/session/{session_id}/complete-step/', {'step': step}, expect=(200,))
+
+            call('project_summary', 'get', f'/session/{session_id}/summary/')
+        except _JourneyFailed:
+            pass
+        finally:
+            if not options['base_url']:
+                connections.close_all()
+
+    def _report(self, elapsed):
+        routes = {}
+        for route, seconds, ok in self.samples:
+            routes.setdefault(route, []).append((seconds, ok))
+
+        def percentile(values, fraction):
+            return values[min(len(values) - 1, int(len(values) * fraction))] * 1000
+
+        self.stdout.write('')
+        self.stdout.write(f'{"route":<24} {"requests":>8} {"errors":>7} {"p50 ms":>8} {"p95 ms":>8} {"p99 ms":>8} {"mean ms":>8}')
+        total_errors = 0
+        for route, results in sorted(routes.items()):
+            durations = sorted(seconds for seconds, _ in results)
+            errors = sum(1 for _, ok in results if not ok)
+            total_errors += errors
+            self.stdout.write(
+                f'{route:<24} {len(results):>8} {errors:>7} '
+                f'{percentile(durations, 0.50):>8.1f} {percentile(durations, 0.95):>8.1f} '
+                f'{percentile(durations, 0.99):>8.1f} {statistics.mean(durations) * 1000:>8.1f}'
+            )
+
+        total = len(self.samples)
+        self.stdout.write('')
+        self.stdout.write(f'Participants started projects: {len(self.session_ids)}/{self.options["participants"]}')
+        if self.project_ids:
+            self.stdout.write(f'Projects generated:            {len(self.project_ids)}')
+        self.stdout.write(f'Requests:                      {total} in {elapsed:.1f}s ({total / elapsed:.1f} req/s)')
+        error_rate = total_errors / total if total else 0
+        style = self.style.SUCCESS if total_errors == 0 else self.style.WARNING
+        self.stdout.write(style(f'Error rate:                    {error_rate:.2%} ({total_errors} failed requests)'))
+
+
+class _JourneyFailed(Exception):
+    pass
@@ -0,0 +1,73 @@
+import io
+import pstats
+import tracemalloc
+from datetime import datetime
+
+from django.core.management.base import BaseCommand
+from projects.profiling import list_profiles
+
+
+class Command(BaseCommand):
+    help = 'List captured request profiles or print the hottest functions across them'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--list',
+            action='store_true',
+            help='List captures instead of aggregating them',
+        )
+        parser.add_argument(
+            '--view',
+            type=str,
+            help='Only use captures of this view function (e.g. project_step)',
+        )
+        parser.add_argument(
+            '--top',
+            type=int,
+            default=20,
+            help='Number of functions (or allocation sites) to print',
+        )
+        parser.add_argument(
+            '--sort',
+            choices=['cumulative', 'tottime', 'calls'],
+            default='cumulative',
+            help='Sort order for cProfile captures',
+        )
+
+    def handle(self, *args, **options):
+        captures = list_profiles(view=options['view'])
+        if not captures:
+            self.stdout.write(self.style.WARNING('No captured profiles.'))
+            return
+
+        if options['list']:
+            for capture in captures:
+                taken = datetime.fromtimestamp(capture['time']).strftime('%Y-%m-%d %H:%M:%S')
+                self.stdout.write(f'{taken}  {capture["mode"]:<11} {capture["view"]:<24} pid {capture["pid"]:<7} {capture["name"]}')
+            self.stdout.write(f'{len(captures)} capture(s)')
+            return
+
+        cprofile = [capture['path'] for capture in captures if capture['mode'] == 'cprofile']
+        snapshots = [capture['path'] for capture in captures if capture['mode'] == 'tracemalloc']
+
+        if cprofile:
+            self.stdout.write(f'Top {options["top"]} functions by {options["sort"]} across {len(cprofile)} cProfile capture(s):')
+            output = io.StringIO()
+            stats = pstats.Stats(*cprofile, stream=output)
+            stats.strip_dirs().sort_stats(options['sort']).print_stats(options['top'])
+            self.stdout.write(output.getvalue())
+
+        if snapshots:
+            # Sum allocation sizes per line over all snapshots
+            totals = {}
+            for path in snapshots:
+                for stat in tracemalloc.Snapshot.load(path).statistics('lineno'):
+                    frame = stat.traceback[0]
+                    key = f'{frame.filename}:{frame.lineno}'
+                    size, count = totals.get(key, (0, 0))
+                    totals[key] = (size + stat.size, count + stat.count)
+
+            self.stdout.write(f'Top {options["top"]} allocation sites across {len(snapshots)} tracemalloc capture(s):')
+            ranked = sorted(totals.items(), key=lambda item: item[1][0], reverse=True)
+            for key, (size, count) in ranked[:options['top']]:
+                self.stdout.write(f'{size / 1024:10.1f} KiB {count:8d} blocks  {key}')
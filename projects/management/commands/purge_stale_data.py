@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand
+from projects.retention import RETENTION_POLICIES, purge
+
+
+class Command(BaseCommand):
+    help = 'Delete stale generated projects, abandoned sessions and old profiles in batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--only',
+            choices=list(RETENTION_POLICIES),
+            action='append',
+            help='Run only this policy (can be repeated)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Maximum rows deleted per transaction',
+        )
+        parser.add_argument(
+            '--archive-dir',
+            type=str,
+            help='Append deleted rows, cascaded ones included, to gzipped JSONL files in this directory first',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only count the rows that would be deleted',
+        )
+
+    def handle(self, *args, **options):
+        names = options['only'] or list(RETENTION_POLICIES)
+        verb = 'would delete' if options['dry_run'] else 'deleted'
+        
+        for name in names:
+            result = purge(
+                name,
+                batch_size=options['batch_size'],
+                archive_dir=options['archive_dir'],
+                dry_run=options['dry_run'],
+            )
+            rate = result['rows'] / result['seconds'] if result['seconds'] else 0
+            self.stdout.write(f'{name}: {verb} {result["rows"]} row(s) in {result["seconds"]:.2f}s ({rate:.0f} rows/sec)')
+            if result['archive']:
+                self.stdout.write(f'  archived to {result["archive"]}')
+        
+        self.stdout.write(self.style.SUCCESS('Retention purge finished!'))
@@ -0,0 +1,55 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from projects.similarity import METRICS, compute_neighbours, load_technology_sets, store_neighbours
+
+
+class Command(BaseCommand):
+    help = 'Recompute the "projects like this one" neighbours of every pre-made project from shared technologies'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--top-k',
+            type=int,
+            default=settings.SIMILAR_PROJECTS,
+            help='Neighbours kept per project (default: SIMILAR_PROJECTS)',
+        )
+        parser.add_argument(
+            '--metric',
+            choices=METRICS,
+            default=settings.SIMILAR_PROJECTS_METRIC,
+            help='Similarity of two technology sets (default: SIMILAR_PROJECTS_METRIC)',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Compute and time the neighbours without writing them',
+        )
+
+    def handle(self, *args, **options):
+        if options['top_k'] < 1:
+            raise CommandError('--top-k must be at least 1.')
+
+        started = time.perf_counter()
+        technology_sets = load_technology_sets()
+        loaded = time.perf_counter()
+        self.stdout.write(
+            f'Loaded {len(technology_sets):,} projects with technologies '
+            f'({len(set(technology_sets.values())):,} distinct sets) in {loaded - started:.1f}s'
+        )
+
+        neighbours = list(compute_neighbours(technology_sets, options['top_k'], options['metric']))
+        computed = time.perf_counter()
+        self.stdout.write(
+            f'Computed {options["metric"]} top-{options["top_k"]} neighbours of {len(neighbours):,} '
+            f'projects in {computed - loaded:.1f}s'
+        )
+
+        if options['dry_run']:
+            self.stdout.write(self.style.WARNING('Dry run - nothing written'))
+            return
+        written = store_neighbours(neighbours)
+        self.stdout.write(self.style.SUCCESS(
+            f'Stored {written:,} neighbour rows in {time.perf_counter() - computed:.1f}s'
+        ))
@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+from projects.models import Project
+
+
+class Command(BaseCommand):
+    help = 'Rebuild cached per-timeframe step counts (Project.step_stats) from ProjectStep rows'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of projects to rebuild per transaction',
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        self.stdout.write('Rebuilding project step stats...')
+        
+        project_ids = Project.objects.order_by('pk').values_list('pk', flat=True)
+        
+        total = 0
+        batch = []
+        for project_id in project_ids.iterator(chunk_size=batch_size):
+            batch.append(project_id)
+            if len(batch) >= batch_size:
+                Project.rebuild_step_stats(batch)
+                total += len(batch)
+                batch = []
+        if batch:
+            Project.rebuild_step_stats(batch)
+            total += len(batch)
+        
+        self.stdout.write(self.style.SUCCESS(f'Successfully rebuilt step stats for {total} project(s)!'))
@@ -0,0 +1,36 @@
+import time
+
+from django.core.management.base import BaseCommand
+from projects.models import ProjectResource
+from projects.resource_stats import describe_resource
+
+
+class Command(BaseCommand):
+    help = 'Recompute file sizes and CSV column stats of project resources whose files changed'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Recompute every resource, even if its file looks unchanged',
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        checked = refreshed = 0
+        for resource in ProjectResource.objects.order_by('pk').iterator():
+            checked += 1
+            t0 = time.perf_counter()
+            if not describe_resource(resource, force=options['force']):
+                continue
+            # update() rather than save() - the pre_save signal would stat the file again
+            ProjectResource.objects.filter(pk=resource.pk).update(file_size=resource.file_size, stats=resource.stats)
+            refreshed += 1
+            rows = resource.stats.get('rows')
+            detail = f', {rows} rows' if rows is not None else ''
+            self.stdout.write(
+                f'  {resource.file_path}: {resource.file_size or "missing"}{detail} ({time.perf_counter() - t0:.2f}s)'
+            )
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f'Refreshed {refreshed} of {checked} resource(s) in {elapsed:.1f}s'))
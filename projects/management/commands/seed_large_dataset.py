@@ -0,0 +1,257 @@
+import random
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from projects.catalog import bump_catalog_version
+from projects.generator import STEPS_PER_TIMEFRAME, ProjectGenerator
+from projects.models import Project, ProjectStep, UserSession, UserProfile
+
+
+SYNTHETIC_PREFIX = 'synthetic-'
+TIMEFRAMES = [code for code, _ in ProjectStep.TIMEFRAME_CHOICES]
+# Share of sessions per timeframe - short hackathons are the most common
+TIMEFRAME_WEIGHTS = [0.4, 0.3, 0.2, 0.1]
+
+
+class Command(BaseCommand):
+    help = 'Bulk-insert a large deterministic synthetic dataset (projects, steps, sessions, profiles) for scale testing'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--projects',
+            type=int,
+            default=100_000,
+            help='Number of projects',
+        )
+        parser.add_argument(
+            '--sessions',
+            type=int,
+            default=10_000_000,
+            help='Number of user sessions',
+        )
+        parser.add_argument(
+            '--profiles',
+            type=int,
+            default=1_000_000,
+            help='Number of user profiles (sessions are spread over these users)',
+        )
+        parser.add_argument(
+            '--generated-share',
+            type=float,
+            default=0.5,
+            help='Fraction of projects marked as generated (these get one timeframe\'s plan only)',
+        )
+        parser.add_argument(
+            '--completion-rate',
+            type=float,
+            default=0.3,
+            help='Fraction of sessions that finished every step',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=5000,
+            help='Rows per bulk INSERT',
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=42,
+            help='Random seed - the same seed produces the same data',
+        )
+        parser.add_argument(
+            '--clear',
+            action='store_true',
+            help='Delete previously seeded synthetic rows first',
+        )
+
+    def handle(self, *args, **options):
+        self.batch_size = options['batch_size']
+        rng = random.Random(options['seed'])
+
+        if options['clear']:
+            self._clear()
+
+        projects = self._seed_projects(rng, options['projects'], options['generated_share'])
+        self._seed_profiles(options['profiles'])
+        self._seed_sessions(rng, projects, options['sessions'], options['profiles'], options['completion_rate'])
+
+        # bulk_create skips the signals that normally invalidate the catalog
+        bump_catalog_version()
+        self.stdout.write(self.style.SUCCESS('Synthetic dataset seeded!'))
+
+    def _clear(self):
+        started = time.perf_counter()
+        UserSession.objects.filter(session_id__startswith=SYNTHETIC_PREFIX).delete()
+        UserProfile.objects.filter(session_id__startswith=SYNTHETIC_PREFIX).delete()
+        Project.objects.filter(title__startswith='Synthetic ').delete()
+        self.stdout.write(f'Cleared previous synthetic data in {time.perf_counter() - started:.1f}s')
+
+    def _insert(self, label, model, rows):
+        """bulk_create an iterable of unsaved rows in batches and report rows/sec"""
+        started = time.perf_counter()
+        total = 0
+        created = []
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= self.batch_size:
+                total += self._flush(model, batch, created)
+                batch = []
+        if batch:
+            total += self._flush(model, batch, created)
+        elapsed = time.perf_counter() - started
+        rate = total / elapsed if elapsed else 0
+        self.stdout.write(f'{label}: {total} rows in {elapsed:.1f}s ({rate:,.0f} rows/sec)')
+        return created
+
+    def _flush(self, model, batch, created):
+        with transaction.atomic():
+            model.objects.bulk_create(batch)
+        if model is Project:
+            created.extend(batch)
+        return len(batch)
+
+    def _seed_projects(self, rng, count, generated_share):
+        """
+        Create projects and their steps
+
+        Returns:
+            List of (project id, timeframes with steps, steps per timeframe)
+        """
+        generator = ProjectGenerator()
+        tracks = [code for code, _ in Project.TRACK_CHOICES]
+        difficulties = [code for code, _ in Project.DIFFICULTY_CHOICES]
+        
+        # Step rows are the same for every project of a track/difficulty. Pre-made
+        # projects get the full 48h plan with each step tagged with the shortest
+        # timeframe whose budget includes it; generated ones get one timeframe's plan.
+        def tier(step_number):
+            return next(tf for tf in TIMEFRAMES if step_number <= STEPS_PER_TIMEFRAME[int(tf[:-1])])
+        
+        plans = {}
+        for track in tracks:
+            for difficulty in difficulties:
+                full_plan = [
+                    {
+                        'step_number': step.step_number,
+                        'timeframe': tier(step.step_number),
+                        'title': step.title,
+                        'description': step.description,
+                        'technologies': sorted(step.technologies),
+                        'estimated_time': step.estimated_time,
+                        'learning_outcomes': step.learning_outcomes,
+                    }
+                    for step in generator._build_steps(track, difficulty, TIMEFRAMES[-1], [])
+                ]
+                plans[track, difficulty, None] = full_plan
+                for timeframe in TIMEFRAMES:
+                    budget = STEPS_PER_TIMEFRAME[int(timeframe[:-1])]
+                    plans[track, difficulty, timeframe] = [
+                        {**step, 'timeframe': timeframe} for step in full_plan if step['step_number'] <= budget
+                    ]
+        
+        def step_stats(plan):
+            tier_totals = {}
+            for step in plan:
+                steps, minutes = tier_totals.get(step['timeframe'], (0, 0))
+                tier_totals[step['timeframe']] = (steps + 1, minutes + step['estimated_time'])
+            return Project.build_step_stats(tier_totals)
+        
+        plan_keys = []
+        
+        def project_rows():
+            for i in range(count):
+                track = tracks[i % len(tracks)]
+                difficulty = difficulties[(i // len(tracks)) % len(difficulties)]
+                is_generated = rng.random() < generated_share
+                timeframe = rng.choices(TIMEFRAMES, TIMEFRAME_WEIGHTS)[0] if is_generated else None
+                plan_keys.append((track, difficulty, timeframe))
+                yield Project(
+                    title=f'Synthetic {track} {difficulty} {i}',
+                    description=f'Synthetic {difficulty} {track} project number {i} for scale testing.',
+                    track=track,
+                    difficulty=difficulty,
+                    is_generated=is_generated,
+                    step_stats=step_stats(plans[track, difficulty, timeframe]),
+                )
+        
+        projects = self._insert('Projects', Project, project_rows())
+        
+        def step_rows():
+            for i, project in enumerate(projects):
+                for step in plans[plan_keys[i]]:
+                    yield ProjectStep(project_id=project.id, **step)
+        
+        self._insert('Project steps', ProjectStep, step_rows())
+        return [
+            (
+                project.id,
+                # Sessions use the timeframes the project offers - for generated
+                # projects, only the one they were generated for
+                list(project.step_stats),
+                {tf: stats['steps'] for tf, stats in project.step_stats.items()},
+            )
+            for i, project in enumerate(projects)
+        ]
+    
+    def _seed_profiles(self, count):
+        experience = [code for code, _ in UserProfile.EXPERIENCE_LEVELS]
+        tracks = [code for code, _ in Project.TRACK_CHOICES]
+
+        def profile_rows():
+            for i in range(count):
+                yield UserProfile(
+                    session_id=f'{SYNTHETIC_PREFIX}{i}',
+                    experience_level=experience[i % len(experience)],
+                    preferred_tracks=[tracks[i % len(tracks)]],
+                    onboarding_completed=i % 10 != 0,  # Some users never finish onboarding
+                )
+
+        self._insert('User profiles', UserProfile, profile_rows())
+
+    def _seed_sessions(self, rng, projects, count, users, completion_rate):
+        if not projects or not users:
+            return
+        now = timezone.now()
+
+        def session_rows():
+            for i in range(count):
+                # The k-th session of a user gets a different project than their others,
+                # so incomplete sessions never clash on the unique active-session constraint
+                user, k = i % users, i // users
+                project_id, timeframes, steps = projects[(user * 7919 + k) % len(projects)]
+                if len(timeframes) == 1:
+                    timeframe = timeframes[0]
+                else:
+                    weights = [TIMEFRAME_WEIGHTS[TIMEFRAMES.index(tf)] for tf in timeframes]
+                    timeframe = rng.choices(timeframes, weights)[0]
+                total = steps[timeframe]
+                hours = int(timeframe[:-1])
+                start_time = now - timedelta(seconds=rng.randrange(180 * 24 * 3600))
+
+                if rng.random() < completion_rate:
+                    done = total
+                else:
+                    # Drop-off: each further step is reached with 80% probability
+                    done = 0
+                    while done < total - 1 and rng.random() < 0.8:
+                        done += 1
+                completed = done == total
+
+                yield UserSession(
+                    session_id=f'{SYNTHETIC_PREFIX}{user}',
+                    project_id=project_id,
+                    selected_timeframe=timeframe,
+                    start_time=start_time,
+                    current_step=min(done + 1, total),
+                    completed_mask=(1 << min(done, UserSession.MAX_TRACKED_STEPS)) - 1,
+                    completed=completed,
+                    completed_at=start_time + timedelta(minutes=rng.randrange(30, hours * 60)) if completed else None,
+                    github_repo=f'https://github.com/synthetic/project-{i}' if completed and rng.random() < 0.5 else None,
+                )
+
+        self._insert('User sessions', UserSession, session_rows())
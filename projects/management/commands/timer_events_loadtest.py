@@ -0,0 +1,176 @@
+import asyncio
+import resource
+import time
+import tracemalloc
+from urllib.parse import urlencode
+
+from django.core.asgi import get_asgi_application
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from projects.models import Project, UserSession
+from projects.timer import make_timer_token
+
+
+def _rss_kb():
+    """Current resident set size in KB (falls back to peak RSS off Linux)"""
+    try:
+        with open('/proc/self/status') as status:
+            for line in status:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+class Command(BaseCommand):
+    help = 'Hold many timer event streams open in one process and report memory per connection'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--connections',
+            type=int,
+            default=1000,
+            help='Number of concurrent event streams to open',
+        )
+        parser.add_argument(
+            '--hold',
+            type=float,
+            default=5.0,
+            help='Seconds to keep the streams open after they are all connected',
+        )
+        parser.add_argument(
+            '--connect-timeout',
+            type=float,
+            default=120.0,
+            help='Give up waiting for streams to connect after this many seconds',
+        )
+        parser.add_argument(
+            '--trace-heap',
+            action='store_true',
+            help='Also measure Python heap growth with tracemalloc (slows connecting down)',
+        )
+
+    def handle(self, *args, **options):
+        connections = options['connections']
+        with override_settings(TIMER_EVENTS_ENABLED=True):
+            results = asyncio.run(self._run(
+                connections, options['hold'], options['connect_timeout'], options['trace_heap']
+            ))
+
+        connected = max(1, results['connected'])
+        self.stdout.write(f'Connections requested:  {connections}')
+        self.stdout.write(f'Connections open:       {results["connected"]}')
+        self.stdout.write(f'Time to connect all:    {results["connect_seconds"]:.2f}s')
+        self.stdout.write(f'Events received:        {results["events"]}')
+        self.stdout.write(f'RSS growth:             {results["rss_kb"] / 1024:.1f} MB '
+                          f'({results["rss_kb"] * 1024 / connected:.0f} bytes/connection)')
+        if results['heap_bytes'] is not None:
+            self.stdout.write(f'Python heap growth:     {results["heap_bytes"] / 1024 / 1024:.1f} MB '
+                              f'({results["heap_bytes"] / connected:.0f} bytes/connection)')
+
+        if results['connected'] == connections:
+            self.stdout.write(self.style.SUCCESS(f'One worker process held {connections} idle streams.'))
+        else:
+            self.stdout.write(self.style.WARNING('Not every stream connected.'))
+
+    async def _run(self, connections, hold, connect_timeout, trace_heap):
+        application = get_asgi_application()
+
+        # An unsaved session is enough - the stream is authenticated by its token alone
+        project = Project(title='Load Test', step_stats={'6h': {'steps': 6, 'minutes': 360}})
+        user_session = UserSession(id=1, project=project, selected_timeframe='6h', start_time=timezone.now())
+        path = reverse('projects:timer_events', args=[user_session.id])
+        query_string = urlencode({'token': make_timer_token(user_session)}).encode()
+
+        connected = asyncio.Semaphore(0)
+        disconnect = asyncio.Event()
+        counters = {'events': 0}
+
+        def make_send():
+            state = {'started': False}
+
+            async def send(message):
+                if message['type'] == 'http.response.start':
+                    state['started'] = True
+                elif message['type'] == 'http.response.body' and message.get('body'):
+                    counters['events'] += 1
+                    # First body chunk means the stream is open
+                    if state['started']:
+                        state['started'] = False
+                        connected.release()
+            return send
+
+        def make_receive():
+            state = {'sent': False}
+
+            async def receive():
+                # First message carries the (empty) request body; then wait for disconnect
+                if not state['sent']:
+                    state['sent'] = True
+                    return {'type': 'http.request', 'body': b'', 'more_body': False}
+                await disconnect.wait()
+                return {'type': 'http.disconnect'}
+            return receive
+
+        def make_scope():
+            return {
+                'type': 'http',
+                'asgi': {'version': '3.0'},
+                'http_version': '1.1',
+                'method': 'GET',
+                'scheme': 'http',
+                'path': path,
+                'raw_path': path.encode(),
+                'query_string': query_string,
+                'root_path': '',
+                'headers': [(b'host', b'localhost'), (b'accept', b'text/event-stream')],
+                'client': ('127.0.0.1', 0),
+                'server': ('localhost', 80),
+            }
+
+        # Warm up one request so import-time allocations are not counted
+        warmup = asyncio.create_task(application(make_scope(), make_receive(), make_send()))
+        await connected.acquire()
+
+        if trace_heap:
+            tracemalloc.start()
+        rss_before = _rss_kb()
+        started = time.perf_counter()
+
+        tasks = [
+            asyncio.create_task(application(make_scope(), make_receive(), make_send()))
+            for _ in range(connections)
+        ]
+        connected_count = 0
+        deadline = started + connect_timeout
+        while connected_count < connections:
+            try:
+                await asyncio.wait_for(connected.acquire(), timeout=max(0, deadline - time.perf_counter()))
+            except asyncio.TimeoutError:
+                break
+            connected_count += 1
+        connect_seconds = time.perf_counter() - started
+
+        await asyncio.sleep(hold)
+        rss_kb = _rss_kb() - rss_before
+        heap_bytes = None
+        if trace_heap:
+            heap_bytes = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+
+        disconnect.set()
+        for task in tasks + [warmup]:
+            task.cancel()
+        await asyncio.gather(*tasks, warmup, return_exceptions=True)
+
+        return {
+            'connected': connected_count,
+            'connect_seconds': connect_seconds,
+            'events': counters['events'],
+            'rss_kb': rss_kb,
+            'heap_bytes': heap_bytes,
+        }
@@ -0,0 +1,248 @@
+"""
+Metrics - Prometheus-compatible counters, gauges and histograms shared across worker processes
+
+Each process writes its samples to its own memory-mapped file in METRICS_DIR,
+so recording never takes a cross-process lock. The /metrics view merges every
+worker's file at scrape time. Without METRICS_DIR samples stay in process memory.
+"""
+import glob
+import json
+import mmap
+import os
+import struct
+import threading
+from bisect import bisect_left
+
+from django.conf import settings
+
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89)
+
+# name -> (type, help, histogram buckets)
+METRICS = {
+    'projecthack_requests_total': (
+        'counter', 'Requests by URL name, method and status', None),
+    'projecthack_request_duration_seconds': (
+        'histogram', 'Request latency by URL name', LATENCY_BUCKETS),
+    'projecthack_request_db_queries': (
+        'histogram', 'Database queries per request by URL name', QUERY_BUCKETS),
+    'projecthack_requests_in_flight': (
+        'gauge', 'Requests currently being handled', None),
+    'projecthack_cache_requests_total': (
+        'counter', 'Cache lookups by cache and result (hit ratio = hit / total)', None),
+    'projecthack_timer_status_total': (
+        'counter', 'Timer status polls by source (signed token or database)', None),
+    'projecthack_generator_runs_total': (
+        'counter', 'Project generator invocations by result', None),
+    'projecthack_generator_duration_seconds': (
+        'histogram', 'Project generator latency', LATENCY_BUCKETS),
+    'projecthack_resource_downloads_total': (
+        'counter', 'Resource downloads by resource type', None),
+}
+
+_lock = threading.Lock()
+_store = None
+
+
+class MemoryStore:
+    """Samples for a single process"""
+
+    def __init__(self):
+        self.values = {}
+
+    def add(self, key, amount):
+        self.values[key] = self.values.get(key, 0.0) + amount
+
+    def reset_gauges(self):
+        pass
+
+    def read_all(self):
+        return [(os.getpid(), list(self.values.items()))]
+
+
+class MmapStore:
+    """
+    Samples for one process in a memory-mapped file
+
+    Layout: a 4-byte used-bytes header padded to 8, then entries of
+    [4-byte key length][utf-8 key, padded to 8 bytes][8-byte double]. New
+    entries are written before the header is bumped, so readers never see
+    a partial entry.
+    """
+
+    INITIAL_SIZE = 64 * 1024
+
+    def __init__(self, directory):
+        self.path = os.path.join(directory, f'metrics-{os.getpid()}.db')
+        self.positions = {}
+        fresh = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+        self.file = open(self.path, 'a+b')
+        if fresh:
+            self.file.truncate(self.INITIAL_SIZE)
+        self.mmap = mmap.mmap(self.file.fileno(), 0)
+        if fresh:
+            struct.pack_into('i', self.mmap, 0, 8)
+        for key, value, position in _read_entries(self.mmap):
+            self.positions[key] = position
+
+    def _allocate(self, key):
+        encoded = key.encode('utf-8')
+        padded = encoded + b' ' * (8 - (len(encoded) + 4) % 8)
+        entry = struct.pack(f'i{len(padded)}sd', len(encoded), padded, 0.0)
+        used = struct.unpack_from('i', self.mmap, 0)[0]
+        if used + len(entry) > len(self.mmap):
+            self.mmap.close()
+            self.file.truncate(max(len(entry), os.path.getsize(self.path)) * 2)
+            self.mmap = mmap.mmap(self.file.fileno(), 0)
+        self.mmap[used:used + len(entry)] = entry
+        struct.pack_into('i', self.mmap, 0, used + len(entry))
+        self.positions[key] = used + len(entry) - 8
+        return self.positions[key]
+
+    def add(self, key, amount):
+        position = self.positions.get(key)
+        if position is None:
+            position = self._allocate(key)
+        value = struct.unpack_from('d', self.mmap, position)[0]
+        struct.pack_into('d', self.mmap, position, value + amount)
+
+    def reset_gauges(self):
+        """A reused pid's file may hold a dead process's in-flight gauges"""
+        for key, position in self.positions.items():
+            if _kind(json.loads(key)[0]) == 'gauge':
+                struct.pack_into('d', self.mmap, position, 0.0)
+
+    def read_all(self):
+        results = []
+        for path in glob.glob(os.path.join(os.path.dirname(self.path), 'metrics-*.db')):
+            pid = int(os.path.basename(path)[len('metrics-'):-len('.db')])
+            with open(path, 'rb') as f:
+                data = f.read()
+            results.append((pid, [(key, value) for key, value, _ in _read_entries(data)]))
+        return results
+
+
+def _read_entries(data):
+    """Yield (key, value, value offset) from a store file's bytes"""
+    used = struct.unpack_from('i', data, 0)[0]
+    position = 8
+    while position < used:
+        length = struct.unpack_from('i', data, position)[0]
+        key = bytes(data[position + 4:position + 4 + length]).decode('utf-8')
+        position += 4 + length + (8 - (length + 4) % 8)
+        yield key, struct.unpack_from('d', data, position)[0], position
+        position += 8
+
+
+def _get_store():
+    global _store
+    # Re-open after fork so each worker writes its own file
+    if _store is None or _store[0] != os.getpid():
+        directory = getattr(settings, 'METRICS_DIR', '')
+        store = MmapStore(directory) if directory else MemoryStore()
+        store.reset_gauges()
+        _store = (os.getpid(), store)
+    return _store[1]
+
+
+def _kind(name):
+    """Metric type of a stored sample name (histogram sums are stored as <name>_sum)"""
+    if name not in METRICS and name.endswith('_sum'):
+        name = name[:-len('_sum')]
+    return METRICS[name][0]
+
+
+def _key(name, labels):
+    return json.dumps([name, sorted((labels or {}).items())])
+
+
+def inc(name, labels=None, amount=1):
+    """Increment a counter (or move a gauge by `amount`)"""
+    key = _key(name, labels)
+    with _lock:
+        _get_store().add(key, amount)
+
+
+def observe(name, value, labels=None):
+    """Record one histogram observation"""
+    buckets = METRICS[name][2]
+    index = bisect_left(buckets, value)
+    le = str(buckets[index]) if index < len(buckets) else '+Inf'
+    bucket_key = _key(name, {**(labels or {}), 'le': le})
+    sum_key = _key(name + '_sum', labels)
+    with _lock:
+        store = _get_store()
+        store.add(bucket_key, 1)
+        store.add(sum_key, value)
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    escaped = (
+        '{}="{}"'.format(k, str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for k, v in labels
+    )
+    return '{' + ','.join(escaped) + '}'
+
+
+def render():
+    """
+    Merge every worker's samples into the Prometheus text exposition format
+
+    Counters and histograms are summed over all files (including exited
+    workers, so totals never go backwards); gauges only over live workers.
+    """
+    with _lock:
+        sources = _get_store().read_all()
+
+    merged = {}
+    for pid, entries in sources:
+        alive = None
+        for key, value in entries:
+            name, labels = json.loads(key)
+            if _kind(name) == 'gauge':
+                if alive is None:
+                    alive = _pid_alive(pid)
+                if not alive:
+                    continue
+            sample = (name, tuple(tuple(label) for label in labels))
+            merged[sample] = merged.get(sample, 0.0) + value
+
+    lines = []
+    for name, (kind, help_text, buckets) in METRICS.items():
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {kind}')
+        if kind != 'histogram':
+            for (sample_name, labels), value in sorted(merged.items()):
+                if sample_name == name:
+                    lines.append(f'{name}{_format_labels(labels)} {value:.17g}')
+            continue
+
+        # Bucket counts are stored per bucket; exposition wants them cumulative
+        series = {}
+        for (sample_name, labels), value in merged.items():
+            if sample_name == name:
+                le = dict(labels)['le']
+                base_labels = tuple(label for label in labels if label[0] != 'le')
+                series.setdefault(base_labels, {})[le] = value
+        for labels in sorted(series):
+            counts = series[labels]
+            cumulative = 0.0
+            for le in [str(bucket) for bucket in buckets] + ['+Inf']:
+                cumulative += counts.get(le, 0.0)
+                lines.append(f'{name}_bucket{_format_labels(labels + (("le", le),))} {cumulative:.17g}')
+            lines.append(f'{name}_sum{_format_labels(labels)} {merged.get((name + "_sum", labels), 0.0):.17g}')
+            lines.append(f'{name}_count{_format_labels(labels)} {cumulative:.17g}')
+    return '\n'.join(lines) + '\n'
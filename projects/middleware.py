@@ -0,0 +1,216 @@
+"""
+Request instrumentation - metrics for every request, detailed timing and profiles for sampled ones
+"""
+import asyncio
+import contextvars
+import hmac
+import itertools
+import json
+import logging
+import random
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.template.backends.django import Template as BackendTemplate
+
+from . import metrics
+from .profiling import run_profiled, save_profile
+
+
+logger = logging.getLogger('projects.timing')
+
+# Stats dict of the sampled request being handled in this context (None when not sampled)
+_current_stats = contextvars.ContextVar('projects_request_timing', default=None)
+
+_original_template_render = BackendTemplate.render
+
+# Methods logged and labelled as sent; anything else is "other" so clients can't add series
+KNOWN_METHODS = frozenset({'GET', 'HEAD', 'POST', 'PUT', 'PATCH', 'DELETE', 'OPTIONS'})
+
+
+def _method_label(request):
+    return request.method if request.method in KNOWN_METHODS else 'other'
+
+
+def _timed_template_render(self, context=None, request=None):
+    stats = _current_stats.get()
+    if stats is None:
+        return _original_template_render(self, context, request)
+    started = time.perf_counter()
+    try:
+        return _original_template_render(self, context, request)
+    finally:
+        stats['template'] += time.perf_counter() - started
+
+
+def _install_template_timer():
+    """Time top-level template renders (includes are rendered inside them)"""
+    if BackendTemplate.render is not _timed_template_render:
+        BackendTemplate.render = _timed_template_render
+
+
+class _QueryTimer:
+    """Connection execute wrapper adding each query's duration to the request stats"""
+
+    def __init__(self, stats):
+        self.stats = stats
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - started
+            self.stats['queries'] += 1
+            self.stats['db'] += duration
+            # Session store reads/writes are reported on their own
+            if 'django_session' in sql:
+                self.stats['session'] += duration
+
+
+class RequestTimingMiddleware:
+    """
+    Record DB query count, SQL time, session store time, template render time
+    and total time for a sample of requests
+
+    Sampled responses get a Server-Timing header and one JSON line is logged
+    to the 'projects.timing' logger. Unsampled requests only pay for one
+    random() call. Place first in MIDDLEWARE so the total covers the stack.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        _install_template_timer()
+
+    def __call__(self, request):
+        sample_rate = getattr(settings, 'REQUEST_TIMING_SAMPLE_RATE', 0)
+        if sample_rate <= 0 or random.random() >= sample_rate:
+            return self.get_response(request)
+
+        stats = {'queries': 0, 'db': 0.0, 'session': 0.0, 'template': 0.0}
+        token = _current_stats.set(stats)
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                timer = _QueryTimer(stats)
+                for alias in connections:
+                    stack.enter_context(connections[alias].execute_wrapper(timer))
+                response = self.get_response(request)
+        finally:
+            _current_stats.reset(token)
+        total = time.perf_counter() - started
+
+        response['Server-Timing'] = ', '.join([
+            f'db;dur={stats["db"] * 1000:.1f};desc="{stats["queries"]} queries"',
+            f'session;dur={stats["session"] * 1000:.1f}',
+            f'tpl;dur={stats["template"] * 1000:.1f}',
+            f'total;dur={total * 1000:.1f}',
+        ])
+
+        resolver_match = getattr(request, 'resolver_match', None)
+        logger.info(json.dumps({
+            'method': _method_label(request),
+            'path': request.path,
+            'view': resolver_match.view_name if resolver_match else None,
+            'status': response.status_code,
+            'queries': stats['queries'],
+            'db_ms': round(stats['db'] * 1000, 2),
+            'session_ms': round(stats['session'] * 1000, 2),
+            'template_ms': round(stats['template'] * 1000, 2),
+            'total_ms': round(total * 1000, 2),
+        }))
+        return response
+
+
+class _QueryCounter:
+    """Connection execute wrapper counting queries"""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class MetricsMiddleware:
+    """
+    Record request count, latency, query count and in-flight requests per URL name
+
+    Views outside the projects app are grouped under view="other" to keep the
+    number of series bounded. Scraped at /metrics.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        counter = _QueryCounter()
+        metrics.inc('projecthack_requests_in_flight')
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for alias in connections:
+                    stack.enter_context(connections[alias].execute_wrapper(counter))
+                response = self.get_response(request)
+        finally:
+            metrics.inc('projecthack_requests_in_flight', amount=-1)
+        duration = time.perf_counter() - started
+
+        resolver_match = getattr(request, 'resolver_match', None)
+        view = resolver_match.view_name if resolver_match else 'none'
+        if not view.startswith('projects:'):
+            view = 'other'
+        labels = {'view': view}
+        metrics.inc('projecthack_requests_total', {
+            'view': view, 'method': _method_label(request), 'status': str(response.status_code),
+        })
+        metrics.observe('projecthack_request_duration_seconds', duration, labels)
+        metrics.observe('projecthack_request_db_queries', counter.count, labels)
+        return response
+
+
+class ProfilingMiddleware:
+    """
+    Profile single requests to projects.views with cProfile or tracemalloc
+
+    A request is captured when it sends `X-Profile: <PROFILING_SECRET>` or is
+    the Nth request of this process (PROFILING_SAMPLE_EVERY). Captures go to
+    the PROFILING_DIR ring buffer - see `python manage.py profile_report`.
+    When PROFILING_ENABLED is off the middleware removes itself at startup,
+    so it costs nothing. Keep it last in MIDDLEWARE so only the view is profiled.
+    """
+
+    def __init__(self, get_response):
+        if not settings.PROFILING_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.requests = itertools.count(1)
+
+    def __call__(self, request):
+        return self.get_response(request)
+
+    def _triggered(self, request):
+        secret = settings.PROFILING_SECRET
+        # Constant-time, on bytes since compare_digest rejects non-ASCII str
+        supplied = request.headers.get('X-Profile', '').encode()
+        if secret and hmac.compare_digest(supplied, secret.encode()):
+            return True
+        every = settings.PROFILING_SAMPLE_EVERY
+        return every > 0 and next(self.requests) % every == 0
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if view_func.__module__ != 'projects.views' or asyncio.iscoroutinefunction(view_func):
+            return None
+        if not self._triggered(request):
+            return None
+
+        mode = request.headers.get('X-Profile-Mode', settings.PROFILING_MODE)
+        if mode not in ('cprofile', 'tracemalloc'):
+            mode = 'cprofile'
+        response, profile = run_profiled(mode, view_func, request, *view_args, **view_kwargs)
+        response['X-Profile-Id'] = save_profile(profile, mode, view_func.__name__)
+        return response
@@ -0,0 +1,39 @@
+# Generated by Django 4.2.7 on 2026-10-18 09:04
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def backfill_step_stats(apps, schema_editor):
+    """Populate step_stats for existing projects"""
+    Project = apps.get_model('projects', 'Project')
+    ProjectStep = apps.get_model('projects', 'ProjectStep')
+
+    stats = {}
+    rows = ProjectStep.objects.values('project', 'timeframe').annotate(
+        steps=Count('id'),
+        minutes=Sum('estimated_time'),
+    ).order_by()
+    for row in rows:
+        stats.setdefault(row['project'], {})[row['timeframe']] = {
+            'steps': row['steps'],
+            'minutes': row['minutes'] or 0,
+        }
+    for project_id, project_stats in stats.items():
+        Project.objects.filter(pk=project_id).update(step_stats=project_stats)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='step_stats',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text='Per-timeframe step count and total estimated minutes, maintained from ProjectStep'),
+        ),
+        migrations.RunPython(backfill_step_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 4.2.7 on 2026-10-18 09:10
+
+from django.db import migrations, models
+
+BATCH_SIZE = 1000
+MAX_TRACKED_STEPS = 63
+
+
+def steps_to_mask(apps, schema_editor):
+    """Encode completed_steps lists into completed_mask"""
+    UserSession = apps.get_model('projects', 'UserSession')
+
+    batch = []
+    for session in UserSession.objects.only('id', 'completed_steps').iterator(chunk_size=BATCH_SIZE):
+        mask = 0
+        for step_number in session.completed_steps or []:
+            if isinstance(step_number, int) and 1 <= step_number <= MAX_TRACKED_STEPS:
+                mask |= 1 << (step_number - 1)
+        if mask:
+            session.completed_mask = mask
+            batch.append(session)
+        if len(batch) >= BATCH_SIZE:
+            UserSession.objects.bulk_update(batch, ['completed_mask'])
+            batch = []
+    if batch:
+        UserSession.objects.bulk_update(batch, ['completed_mask'])
+
+
+def mask_to_steps(apps, schema_editor):
+    """Decode completed_mask back into completed_steps lists"""
+    UserSession = apps.get_model('projects', 'UserSession')
+
+    batch = []
+    for session in UserSession.objects.exclude(completed_mask=0).only('id', 'completed_mask').iterator(chunk_size=BATCH_SIZE):
+        mask = session.completed_mask
+        session.completed_steps = [bit + 1 for bit in range(mask.bit_length()) if mask >> bit & 1]
+        batch.append(session)
+        if len(batch) >= BATCH_SIZE:
+            UserSession.objects.bulk_update(batch, ['completed_steps'])
+            batch = []
+    if batch:
+        UserSession.objects.bulk_update(batch, ['completed_steps'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0002_project_step_stats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='usersession',
+            name='completed_mask',
+            field=models.BigIntegerField(default=0, help_text='Bitmask of completed steps (bit 0 = step 1)'),
+        ),
+        migrations.RunPython(steps_to_mask, mask_to_steps),
+        migrations.RemoveField(
+            model_name='usersession',
+            name='completed_steps',
+        ),
+    ]
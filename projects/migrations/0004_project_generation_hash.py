@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-18 09:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0003_usersession_completed_mask'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='generation_hash',
+            field=models.CharField(blank=True, editable=False, help_text='Hash of generator inputs and template, used to reuse identical generated projects', max_length=64, null=True, unique=True),
+        ),
+    ]
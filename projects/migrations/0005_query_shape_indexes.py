@@ -0,0 +1,46 @@
+# Generated by Django 4.2.7 on 2026-10-18 09:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0004_project_generation_hash'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='project',
+            options={},
+        ),
+        migrations.AlterModelOptions(
+            name='usersession',
+            options={},
+        ),
+        migrations.AlterUniqueTogether(
+            name='projectstep',
+            unique_together=set(),
+        ),
+        migrations.AlterField(
+            model_name='usersession',
+            name='session_id',
+            field=models.CharField(max_length=100),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(condition=models.Q(('is_generated', False)), fields=['track', 'difficulty', 'title'], name='project_catalog_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='projectresource',
+            index=models.Index(fields=['project', 'order', 'name'], name='projectresource_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='usersession',
+            index=models.Index(fields=['session_id', 'project', 'selected_timeframe', 'completed'], name='usersession_lookup_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='projectstep',
+            constraint=models.UniqueConstraint(fields=('project', 'timeframe', 'step_number'), name='unique_project_step'),
+        ),
+    ]
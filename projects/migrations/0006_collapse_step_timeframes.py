@@ -0,0 +1,112 @@
+# Generated by Django 4.2.7 on 2026-10-18 09:32
+
+from django.db import migrations
+
+BATCH_SIZE = 1000
+TIMEFRAMES = ['6h', '12h', '24h', '48h']
+STEP_FIELDS = ['step_number', 'title', 'description', 'technologies', 'estimated_time', 'learning_outcomes']
+
+
+def _tier(timeframe):
+    return TIMEFRAMES.index(timeframe) if timeframe in TIMEFRAMES else len(TIMEFRAMES)
+
+
+def collapse_steps(apps, schema_editor):
+    """
+    Keep one row per (project, step_number), tagged with the shortest timeframe it appeared in
+
+    Longer timeframes repeated the shorter plans, so the copies are deleted. Where
+    a longer timeframe had different content for the same step number, the
+    shortest timeframe's version wins. step_stats are recomputed as cumulative
+    plans while we are passing over the rows, for the timeframes that have steps.
+    """
+    Project = apps.get_model('projects', 'Project')
+    ProjectStep = apps.get_model('projects', 'ProjectStep')
+
+    to_delete = []
+    to_update = []
+    project_id = None
+    tier_totals = {}
+    kept = None  # (tier, pk, project_id, step_number, estimated_time, timeframe) of the step's best row so far
+
+    def keep(row):
+        _, _, _, step_number, estimated_time, timeframe = row
+        steps, minutes = tier_totals.get(timeframe, (0, 0))
+        tier_totals[timeframe] = (steps + 1, minutes + (estimated_time or 0))
+
+    def flush_project():
+        stats = {}
+        steps = minutes = 0
+        for timeframe in TIMEFRAMES:
+            tier_steps, tier_minutes = tier_totals.get(timeframe, (0, 0))
+            steps += tier_steps
+            minutes += tier_minutes
+            # Only timeframes with steps of their own are offered (as Project.build_step_stats)
+            if tier_steps:
+                stats[timeframe] = {'steps': steps, 'minutes': minutes}
+        to_update.append(Project(pk=project_id, step_stats=stats))
+
+    rows = ProjectStep.objects.order_by('project_id', 'step_number').values_list(
+        'pk', 'project_id', 'step_number', 'estimated_time', 'timeframe'
+    ).iterator(chunk_size=BATCH_SIZE)
+    for pk, row_project_id, step_number, estimated_time, timeframe in rows:
+        row = (_tier(timeframe), pk, row_project_id, step_number, estimated_time, timeframe)
+        if kept is not None and kept[2:4] == (row_project_id, step_number):
+            # Same step in another timeframe - keep whichever belongs to the shorter one
+            if row[0] < kept[0]:
+                to_delete.append(kept[1])
+                kept = row
+            else:
+                to_delete.append(pk)
+            continue
+
+        if kept is not None:
+            keep(kept)
+        if row_project_id != project_id:
+            if project_id is not None:
+                flush_project()
+            project_id = row_project_id
+            tier_totals = {}
+        kept = row
+
+        if len(to_delete) >= BATCH_SIZE:
+            ProjectStep.objects.filter(pk__in=to_delete).delete()
+            to_delete = []
+        if len(to_update) >= BATCH_SIZE:
+            Project.objects.bulk_update(to_update, ['step_stats'])
+            to_update = []
+
+    if kept is not None:
+        keep(kept)
+        flush_project()
+    ProjectStep.objects.filter(pk__in=to_delete).delete()
+    Project.objects.bulk_update(to_update, ['step_stats'])
+
+
+def expand_steps(apps, schema_editor):
+    """Copy every step into each longer timeframe again"""
+    ProjectStep = apps.get_model('projects', 'ProjectStep')
+
+    batch = []
+    for step in ProjectStep.objects.order_by('pk').iterator(chunk_size=BATCH_SIZE):
+        for timeframe in TIMEFRAMES[_tier(step.timeframe) + 1:]:
+            batch.append(ProjectStep(
+                project_id=step.project_id,
+                timeframe=timeframe,
+                **{name: getattr(step, name) for name in STEP_FIELDS}
+            ))
+        if len(batch) >= BATCH_SIZE:
+            ProjectStep.objects.bulk_create(batch)
+            batch = []
+    ProjectStep.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0005_query_shape_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(collapse_steps, expand_steps),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 4.2.7 on 2026-10-18 09:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0006_collapse_step_timeframes'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='projectstep',
+            options={'ordering': ['project', 'step_number']},
+        ),
+        migrations.RemoveConstraint(
+            model_name='projectstep',
+            name='unique_project_step',
+        ),
+        migrations.AlterField(
+            model_name='projectstep',
+            name='timeframe',
+            field=models.CharField(choices=[('6h', '6 Hours'), ('12h', '12 Hours'), ('24h', '24 Hours'), ('48h', '48 Hours')], help_text='Shortest timeframe this step is part of - longer timeframes include it too', max_length=10),
+        ),
+        migrations.AddConstraint(
+            model_name='projectstep',
+            constraint=models.UniqueConstraint(fields=('project', 'step_number'), name='unique_project_step'),
+        ),
+    ]
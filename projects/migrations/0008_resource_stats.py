@@ -0,0 +1,23 @@
+# Generated by Django 4.2.7 on 2026-10-18 10:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0007_inherited_step_timeframes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='projectresource',
+            name='stats',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text='Row count and per-column dtype, nulls and min/max of CSV files, with the file size/mtime they describe'),
+        ),
+        migrations.AlterField(
+            model_name='projectresource',
+            name='file_size',
+            field=models.CharField(blank=True, editable=False, help_text="File size (e.g., '2.5 MB'), filled in from the file", max_length=20),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.7 on 2026-10-18 10:42
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0008_resource_stats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProjectNeighbour',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rank', models.PositiveSmallIntegerField(help_text='1 for the most similar project')),
+                ('score', models.FloatField(help_text="Similarity of the two projects' technology sets (0-1)")),
+                ('neighbour', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='projects.project')),
+                ('project', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='neighbours', to='projects.project')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='projectneighbour',
+            constraint=models.UniqueConstraint(fields=('project', 'rank'), name='unique_project_neighbour_rank'),
+        ),
+    ]
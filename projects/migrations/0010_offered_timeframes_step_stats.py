@@ -0,0 +1,64 @@
+# Generated by Django 4.2.7 on 2026-10-18 12:05
+
+from django.db import migrations
+from django.db.models import Count, Sum
+
+BATCH_SIZE = 1000
+TIMEFRAMES = ['6h', '12h', '24h', '48h']
+
+
+def recompute_step_stats(apps, schema_editor):
+    """
+    Drop timeframes without steps of their own from step_stats
+
+    0006 offered every timeframe from a project's shortest plan up, so a 6h
+    project also listed 12h, 24h and 48h. Recompute with the rule of
+    Project.build_step_stats: counts stay cumulative, but a timeframe is only
+    listed when at least one step is tagged with it.
+    """
+    Project = apps.get_model('projects', 'Project')
+    ProjectStep = apps.get_model('projects', 'ProjectStep')
+
+    to_update = []
+    project_id = None
+    tier_totals = {}
+
+    def flush_project():
+        stats = {}
+        steps = minutes = 0
+        for timeframe in TIMEFRAMES:
+            tier_steps, tier_minutes = tier_totals.get(timeframe, (0, 0))
+            steps += tier_steps
+            minutes += tier_minutes
+            if tier_steps:
+                stats[timeframe] = {'steps': steps, 'minutes': minutes}
+        to_update.append(Project(pk=project_id, step_stats=stats))
+
+    rows = ProjectStep.objects.order_by('project_id').values('project_id', 'timeframe').annotate(
+        steps=Count('id'), minutes=Sum('estimated_time')
+    ).values_list('project_id', 'timeframe', 'steps', 'minutes')
+    for row_project_id, timeframe, steps, minutes in rows.iterator(chunk_size=BATCH_SIZE):
+        if row_project_id != project_id:
+            if project_id is not None:
+                flush_project()
+            project_id = row_project_id
+            tier_totals = {}
+        tier_totals[timeframe] = (steps, minutes or 0)
+        if len(to_update) >= BATCH_SIZE:
+            Project.objects.bulk_update(to_update, ['step_stats'])
+            to_update = []
+
+    if project_id is not None:
+        flush_project()
+    Project.objects.bulk_update(to_update, ['step_stats'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0009_project_neighbours'),
+    ]
+
+    operations = [
+        migrations.RunPython(recompute_step_stats, migrations.RunPython.noop),
+    ]
@@ -1,4 +1,5 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Count, F, Sum
 from django.utils import timezone
 
 
@@ -25,17 +26,129 @@ class Project(models.Model):
     track = models.CharField(max_length=20, choices=TRACK_CHOICES)
     is_generated = models.BooleanField(default=False, help_text="True if this project was generated by a user")
     user_preferences = models.JSONField(default=dict, blank=True, help_text="User preferences used to generate this project (keywords, interests, etc.)")
+    generation_hash = models.CharField(max_length=64, unique=True, null=True, blank=True, editable=False, help_text="Hash of generator inputs and template, used to reuse identical generated projects")
+    step_stats = models.JSONField(default=dict, blank=True, editable=False, help_text="Per-timeframe step count and total estimated minutes, maintained from ProjectStep")
     created_at = models.DateTimeField(auto_now_add=True)
     
     class Meta:
-        ordering = ['difficulty', 'title']
+        # No default ordering - callers order explicitly so queries can follow an index
+        indexes = [
+            # Catalog and recommendations: pre-made projects by track/difficulty, ordered by title.
+            # Partial because SQLite renders is_generated=False as NOT "is_generated", which a
+            # plain index column cannot serve.
+            models.Index(
+                fields=['track', 'difficulty', 'title'],
+                condition=models.Q(is_generated=False),
+                name='project_catalog_idx',
+            ),
+        ]
     
     def __str__(self):
         return f"{self.title} ({self.get_difficulty_display()})"
+    
+    def save(self, *args, **kwargs):
+        """
+        Save the project, leaving step_stats alone on updates
+        
+        step_stats is maintained from the steps by rebuild_step_stats, so an
+        instance loaded before its steps changed must not write its stale copy
+        back. Pass update_fields=['step_stats'] to write it explicitly.
+        """
+        if not self._state.adding and kwargs.get('update_fields') is None and not kwargs.get('force_insert'):
+            kwargs['update_fields'] = [
+                field.attname for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != 'step_stats'
+            ]
+        super().save(*args, **kwargs)
+    
+    def get_step_count(self, timeframe):
+        """Get number of steps for a timeframe (no query)"""
+        return self.step_stats.get(timeframe, {}).get('steps', 0)
+    
+    def get_total_minutes(self, timeframe):
+        """Get total estimated minutes for a timeframe (no query)"""
+        return self.step_stats.get(timeframe, {}).get('minutes', 0)
+    
+    def get_available_timeframes(self):
+        """Timeframe codes this project has steps for, shortest first (no query)"""
+        return [code for code, _ in ProjectStep.TIMEFRAME_CHOICES if self.get_step_count(code)]
+    
+    def get_steps(self, timeframe):
+        """Steps making up the plan for a timeframe, ordered by step number"""
+        return self.steps.for_timeframe(timeframe).order_by('step_number')
+    
+    @staticmethod
+    def build_step_stats(tier_totals):
+        """
+        Build step_stats from per-tier step counts
+        
+        Args:
+            tier_totals: Dict mapping the timeframe steps were introduced in
+                to (steps, minutes)
+            
+        Returns:
+            Dict mapping every timeframe offered to its cumulative
+            {'steps': ..., 'minutes': ...}. A timeframe is only offered when
+            at least one step is tagged with it - a 6h project does not offer
+            48h with its 6h plan.
+        """
+        stats = {}
+        steps = minutes = 0
+        for code, _ in ProjectStep.TIMEFRAME_CHOICES:
+            tier_steps, tier_minutes = tier_totals.get(code, (0, 0))
+            steps += tier_steps
+            minutes += tier_minutes or 0
+            if tier_steps:
+                stats[code] = {'steps': steps, 'minutes': minutes}
+        return stats
+    
+    @classmethod
+    def rebuild_step_stats(cls, project_ids):
+        """
+        Recompute step_stats for the given projects from their steps
+        
+        Args:
+            project_ids: Iterable of project primary keys
+            
+        Returns:
+            Dict mapping project id to its new step_stats
+        """
+        stats = {project_id: {} for project_id in project_ids}
+        if not stats:
+            return stats
+        
+        rows = ProjectStep.objects.filter(project_id__in=stats.keys()).values(
+            'project', 'timeframe'
+        ).annotate(
+            steps=Count('id'),
+            minutes=Sum('estimated_time')
+        ).order_by()
+        
+        # Read and write in one transaction so the counts match the committed steps
+        with transaction.atomic():
+            tier_totals = {project_id: {} for project_id in stats}
+            for row in rows:
+                tier_totals[row['project']][row['timeframe']] = (row['steps'], row['minutes'])
+            for project_id, totals in tier_totals.items():
+                stats[project_id] = cls.build_step_stats(totals)
+                cls.objects.filter(pk=project_id).update(step_stats=stats[project_id])
+        
+        return stats
+
+
+class ProjectStepQuerySet(models.QuerySet):
+    def for_timeframe(self, timeframe):
+        """Steps in a timeframe's plan: those introduced in it or any shorter timeframe"""
+        return self.filter(timeframe__in=ProjectStep.timeframes_up_to(timeframe))
 
 
 class ProjectStep(models.Model):
-    """Individual steps for a project, organized by timeframe"""
+    """
+    Individual steps for a project
+    
+    Timeframes are tiers: a step is stored once, tagged with the shortest
+    timeframe it belongs to, and every longer timeframe's plan includes it.
+    """
     TIMEFRAME_CHOICES = [
         ('6h', '6 Hours'),
         ('12h', '12 Hours'),
@@ -49,15 +162,28 @@ class ProjectStep(models.Model):
     description = models.TextField()
     technologies = models.JSONField(default=list, help_text="List of technologies introduced in this step")
     estimated_time = models.IntegerField(help_text="Estimated time in minutes")
-    timeframe = models.CharField(max_length=10, choices=TIMEFRAME_CHOICES)
+    timeframe = models.CharField(max_length=10, choices=TIMEFRAME_CHOICES, help_text="Shortest timeframe this step is part of - longer timeframes include it too")
     learning_outcomes = models.TextField(blank=True, help_text="What the user learns in this step")
     
+    objects = ProjectStepQuerySet.as_manager()
+    
     class Meta:
-        ordering = ['project', 'timeframe', 'step_number']
-        unique_together = ['project', 'step_number', 'timeframe']
+        ordering = ['project', 'step_number']
+        # Plans are read as (project) ordered by step_number, filtered by timeframe tier
+        constraints = [
+            models.UniqueConstraint(fields=['project', 'step_number'], name='unique_project_step'),
+        ]
     
     def __str__(self):
         return f"{self.project.title} - Step {self.step_number} ({self.timeframe})"
+    
+    @classmethod
+    def timeframes_up_to(cls, timeframe):
+        """Timeframe codes from the shortest up to and including `timeframe`"""
+        codes = [code for code, _ in cls.TIMEFRAME_CHOICES]
+        if timeframe not in codes:
+            return []
+        return codes[:codes.index(timeframe) + 1]
 
 
 class ProjectResource(models.Model):
@@ -75,30 +201,65 @@ class ProjectResource(models.Model):
     description = models.TextField(blank=True, help_text="Brief description of what this resource contains")
     resource_type = models.CharField(max_length=10, choices=RESOURCE_TYPE_CHOICES, default='csv')
     file_path = models.CharField(max_length=500, help_text="Path to the file in static/files/ directory")
-    file_size = models.CharField(max_length=20, blank=True, help_text="File size (e.g., '2.5 MB')")
+    file_size = models.CharField(max_length=20, blank=True, editable=False, help_text="File size (e.g., '2.5 MB'), filled in from the file")
     order = models.IntegerField(default=0, help_text="Display order")
+    stats = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        help_text="Row count and per-column dtype, nulls and min/max of CSV files, with the file size/mtime they describe",
+    )
     
     class Meta:
         ordering = ['project', 'order', 'name']
+        indexes = [
+            models.Index(fields=['project', 'order', 'name'], name='projectresource_order_idx'),
+        ]
     
     def __str__(self):
         return f"{self.project.title} - {self.name}"
 
 
+class ProjectNeighbour(models.Model):
+    """
+    A precomputed similar project: the rank-th closest pre-made project by shared technologies
+    
+    Rows are replaced wholesale by the rebuild_similar_projects command, so
+    project_overview reads a project's neighbours with one indexed query.
+    """
+    # db_index=False: unique_project_neighbour_rank leads with project and serves its lookups
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='neighbours', db_index=False)
+    neighbour = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='+')
+    rank = models.PositiveSmallIntegerField(help_text="1 for the most similar project")
+    score = models.FloatField(help_text="Similarity of the two projects' technology sets (0-1)")
+    
+    class Meta:
+        constraints = [
+            # Also the index the overview page reads a project's neighbours in rank order from
+            models.UniqueConstraint(fields=['project', 'rank'], name='unique_project_neighbour_rank'),
+        ]
+    
+    def __str__(self):
+        return f"{self.project_id} -> {self.neighbour_id} (#{self.rank})"
+
+
 class UserSession(models.Model):
     """Track user's progress through a project (no login required)"""
-    session_id = models.CharField(max_length=100, db_index=True)
+    session_id = models.CharField(max_length=100)
     project = models.ForeignKey(Project, on_delete=models.CASCADE)
     selected_timeframe = models.CharField(max_length=10)
     start_time = models.DateTimeField(default=timezone.now)
     current_step = models.IntegerField(default=1)
-    completed_steps = models.JSONField(default=list, help_text="List of completed step numbers")
+    completed_mask = models.BigIntegerField(default=0, help_text="Bitmask of completed steps (bit 0 = step 1)")
     completed = models.BooleanField(default=False)
     github_repo = models.URLField(blank=True, null=True)
     completed_at = models.DateTimeField(null=True, blank=True)
     
     class Meta:
-        ordering = ['-start_time']
+        indexes = [
+            # Session lookups by owner, project and timeframe (also serves session_id alone)
+            models.Index(fields=['session_id', 'project', 'selected_timeframe', 'completed'], name='usersession_lookup_idx'),
+        ]
         # Prevent duplicate active sessions for same project/timeframe
         constraints = [
             models.UniqueConstraint(
@@ -108,19 +269,80 @@ class UserSession(models.Model):
             )
         ]
     
+    # Highest step number that fits in completed_mask (signed 64-bit)
+    MAX_TRACKED_STEPS = 63
+    
     def __str__(self):
         return f"Session {self.session_id[:8]}... - {self.project.title}"
     
+    @property
+    def completed_steps(self):
+        """List of completed step numbers, decoded from completed_mask"""
+        mask = self.completed_mask
+        return [bit + 1 for bit in range(mask.bit_length()) if mask >> bit & 1]
+    
+    @completed_steps.setter
+    def completed_steps(self, step_numbers):
+        mask = 0
+        for step_number in step_numbers:
+            if 1 <= step_number <= self.MAX_TRACKED_STEPS:
+                mask |= 1 << (step_number - 1)
+        self.completed_mask = mask
+    
+    def get_completed_count(self):
+        """Get number of completed steps (popcount, no decoding)"""
+        return self.completed_mask.bit_count()
+    
+    def complete_current_step(self, step=None):
+        """
+        Atomically mark a step as completed and move to the next one
+        
+        Runs one conditional UPDATE that only applies while the session is still on
+        `step`, so double-clicks and concurrent tabs cannot skip or lose a step.
+        The instance is refreshed with the stored values afterwards.
+        
+        Args:
+            step: Step number the caller is completing (defaults to current_step)
+            
+        Returns:
+            True if this call advanced the session, False if it was already past `step`
+        """
+        if step is None:
+            step = self.current_step
+        
+        updates = {}
+        if 1 <= step <= self.MAX_TRACKED_STEPS:
+            updates['completed_mask'] = F('completed_mask').bitor(1 << (step - 1))
+        if step < self.get_total_steps():
+            updates['current_step'] = step + 1
+        else:
+            # All steps completed
+            updates['completed'] = True
+            updates['completed_at'] = timezone.now()
+        
+        with transaction.atomic():
+            updated = UserSession.objects.filter(
+                pk=self.pk, current_step=step, completed=False
+            ).update(**updates)
+            # Read back inside the same transaction - the row is still locked by our write
+            row = UserSession.objects.filter(pk=self.pk).values(
+                'current_step', 'completed_mask', 'completed', 'completed_at'
+            ).get()
+        
+        for field, value in row.items():
+            setattr(self, field, value)
+        return updated == 1
+    
     def get_total_steps(self):
         """Get total number of steps for selected timeframe"""
-        return self.project.steps.filter(timeframe=self.selected_timeframe).count()
+        return self.project.get_step_count(self.selected_timeframe)
     
     def get_progress_percentage(self):
         """Calculate progress percentage"""
         total = self.get_total_steps()
         if total == 0:
             return 0
-        return int((len(self.completed_steps) / total) * 100)
+        return int((self.get_completed_count() / total) * 100)
     
     def get_remaining_time(self):
         """Calculate remaining time based on timeframe"""
@@ -159,21 +381,23 @@ class UserProfile(models.Model):
     
     def get_recommended_projects(self, limit=6):
         """Get recommended projects based on user preferences"""
-        from .models import Project
-        
-        queryset = Project.objects.filter(is_generated=False)  # Only pre-made projects
-        
-        # Filter by preferred tracks if set
-        if self.preferred_tracks:
-            queryset = queryset.filter(track__in=self.preferred_tracks)
-        
-        # Filter by preferred difficulty if set
-        if self.preferred_difficulty:
-            queryset = queryset.filter(difficulty=self.preferred_difficulty)
-        
-        # If no preferences, return all projects
-        if not queryset.exists():
-            queryset = Project.objects.filter(is_generated=False)
+        return self.recommend_projects(
+            self.preferred_tracks,
+            self.preferred_difficulty,
+            limit,
+            technologies=self.interested_technologies,
+            keywords=self.interests_keywords,
+        )
+    
+    @staticmethod
+    def recommend_projects(tracks, difficulty, limit=6, technologies=(), keywords=()):
+        """
+        Get recommended projects for a profile's preferences (without a profile instance)
         
-        return queryset[:limit]
+        Projects are ranked by a weighted count of the preferred tracks,
+        difficulty, technologies and keywords they match, from the in-process index in
+        projects.recommendations (no query once the index is current).
+        """
+        from .recommendations import recommend  # Imported here - recommendations imports the models
+        return recommend(tracks, difficulty, technologies, keywords, limit=limit)
 
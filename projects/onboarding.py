@@ -0,0 +1,88 @@
+"""
+Onboarding state cached in the user's session
+
+home() only needs to know whether onboarding is finished and the preferences to
+recommend for (tracks, difficulty, technologies and keywords). Those are copied
+from the UserProfile into the session whenever the onboarding views save the
+profile, so returning visitors skip the profile lookup. The copy carries the
+profile's updated_at; it is re-checked against the database after
+ONBOARDING_STATE_MAX_AGE seconds to pick up changes made elsewhere (admin,
+reset_onboarding, retention purge).
+"""
+import time
+
+from django.conf import settings
+
+from .models import UserProfile
+
+
+SESSION_KEY = 'onboarding'
+
+STATE_FIELDS = ['updated_at', 'onboarding_completed', 'experience_level', 'preferred_tracks',
+                'preferred_difficulty', 'interested_technologies', 'interests_keywords']
+
+
+def _state_values(profile):
+    """STATE_FIELDS of a UserProfile instance or of a values() row"""
+    if isinstance(profile, dict):
+        return profile
+    return {name: getattr(profile, name) for name in STATE_FIELDS}
+
+
+def is_onboarded(profile):
+    """True when onboarding is completed and at least one preference is set"""
+    values = _state_values(profile)
+    if values['onboarding_completed'] is not True:
+        return False
+    return bool(
+        values['experience_level'] or
+        values['preferred_tracks'] or
+        values['preferred_difficulty'] or
+        values['interests_keywords']
+    )
+
+
+def remember_profile(request, profile):
+    """Copy a profile's onboarding state into the session (no session write if already current)"""
+    values = _state_values(profile)
+    state = request.session.get(SESSION_KEY)
+    if state and state['version'] == values['updated_at'].isoformat():
+        return
+    request.session[SESSION_KEY] = {
+        'version': values['updated_at'].isoformat(),
+        'checked': time.time(),
+        'completed': is_onboarded(values),
+        'tracks': list(values['preferred_tracks'] or []),
+        'difficulty': values['preferred_difficulty'] or '',
+        'technologies': list(values['interested_technologies'] or []),
+        'keywords': list(values['interests_keywords'] or []),
+    }
+
+
+def forget_profile(request):
+    request.session.pop(SESSION_KEY, None)
+
+
+def get_onboarding_state(request, session_id):
+    """
+    Onboarding state for the current visitor, from the session when fresh enough
+
+    Returns:
+        Dict with 'completed', 'tracks', 'difficulty', 'technologies' and
+        'keywords', or None if the visitor has no profile
+    """
+    state = request.session.get(SESSION_KEY)
+    if state and time.time() - state['checked'] < settings.ONBOARDING_STATE_MAX_AGE:
+        return state
+
+    row = UserProfile.objects.filter(session_id=session_id).values(*STATE_FIELDS).first()
+    if row is None:
+        forget_profile(request)
+        return None
+    if state and state['version'] == row['updated_at'].isoformat():
+        # Unchanged since it was cached - only note that it was checked
+        state['checked'] = time.time()
+        request.session.modified = True
+        return state
+    remember_profile(request, row)
+    return request.session[SESSION_KEY]
@@ -0,0 +1,97 @@
+"""
+Request profiling - cProfile / tracemalloc captures of single views kept in an on-disk ring buffer
+"""
+import cProfile
+import os
+import time
+import tracemalloc
+
+from django.conf import settings
+
+
+PROFILE_EXTENSIONS = {'cprofile': '.prof', 'tracemalloc': '.tracemalloc'}
+
+
+def profile_dir():
+    return settings.PROFILING_DIR
+
+
+def run_profiled(mode, func, *args, **kwargs):
+    """
+    Call func under the given profiler
+
+    Returns:
+        (result, profile) - a cProfile.Profile or tracemalloc.Snapshot
+    """
+    if mode == 'tracemalloc':
+        already_tracing = tracemalloc.is_tracing()
+        if not already_tracing:
+            tracemalloc.start(25)
+        try:
+            result = func(*args, **kwargs)
+            return result, tracemalloc.take_snapshot()
+        finally:
+            if not already_tracing:
+                tracemalloc.stop()
+
+    profiler = cProfile.Profile()
+    result = profiler.runcall(func, *args, **kwargs)
+    return result, profiler
+
+
+def save_profile(profile, mode, view_name):
+    """
+    Write a capture into the ring buffer, dropping the oldest beyond PROFILING_MAX_FILES
+
+    Returns:
+        File name of the capture
+    """
+    directory = profile_dir()
+    os.makedirs(directory, exist_ok=True)
+    # Time first so names sort oldest-first
+    name = f'{time.time_ns()}-{view_name}-{os.getpid()}{PROFILE_EXTENSIONS[mode]}'
+    path = os.path.join(directory, name)
+    if mode == 'tracemalloc':
+        profile.dump(path)
+    else:
+        profile.dump_stats(path)
+
+    captures = list_profiles()
+    for old in captures[:max(0, len(captures) - settings.PROFILING_MAX_FILES)]:
+        try:
+            os.remove(old['path'])
+        except FileNotFoundError:
+            pass  # Another worker pruned it first
+    return name
+
+
+def list_profiles(view=None):
+    """
+    Captures in the ring buffer, oldest first
+
+    Returns:
+        List of dicts with 'name', 'path', 'time', 'view', 'pid' and 'mode'
+    """
+    directory = profile_dir()
+    if not os.path.isdir(directory):
+        return []
+
+    captures = []
+    modes = {extension: mode for mode, extension in PROFILE_EXTENSIONS.items()}
+    for name in sorted(os.listdir(directory)):
+        stem, extension = os.path.splitext(name)
+        if extension not in modes:
+            continue
+        timestamp, _, rest = stem.partition('-')
+        view_name, _, pid = rest.rpartition('-')
+        if view is not None and view_name != view:
+            continue
+        captures.append({
+            'name': name,
+            'path': os.path.join(directory, name),
+            'time': int(timestamp) / 1e9,
+            'view': view_name,
+            'pid': int(pid),
+            'mode': modes[extension],
+        })
+    return captures
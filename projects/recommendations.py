@@ -0,0 +1,316 @@
+"""
+Recommendations - scored top-k projects for an onboarding profile from an in-process index
+
+The index maps terms to the pre-made projects that have them:
+
+* track:<code> and difficulty:<code> from the project itself
+* tech:<name> from its steps' technologies
+* kw:<word> from words in its title and description
+
+Projects sit at dense positions in catalog order, and each term keeps the
+positions holding it - as an integer bitset for common terms, as a short array
+for rare ones. A profile is scored as the weighted overlap of its terms with a
+project's (WEIGHTS per kind of term). Scoring adds the profile's term bitsets
+into bit planes of the per-project score (a bit-sliced adder), and the top k
+are read off those planes from the most significant bit down, so a query costs
+a few dozen big-integer operations regardless of catalog size. Results are also
+memoised per profile until the catalog changes.
+
+The index lives in process memory and follows the catalog version: when
+catalog.bump_catalog_version logged which projects changed, only those are
+re-read; otherwise (or when the index has too many holes) it is rebuilt.
+"""
+import re
+import threading
+from array import array
+from collections import OrderedDict
+
+from . import metrics
+from .bitsets import add_weighted, bitset, lowest_positions
+from .catalog import get_catalog_changes, get_catalog_version
+from .models import Project, ProjectStep
+
+
+# Score of one matching term by kind - a matching track outweighs anything but several technologies
+WEIGHTS = {'track': 4, 'difficulty': 2, 'tech': 3, 'kw': 1}
+
+TOKEN_RE = re.compile(r'[a-z0-9][a-z0-9+#]*')
+STOPWORDS = {
+    'and', 'the', 'for', 'with', 'your', 'you', 'that', 'this', 'from', 'into', 'using', 'use',
+    'build', 'create', 'app', 'application', 'project', 'simple', 'basic',
+}
+
+# Terms on fewer than 1/SPARSE_FRACTION of the positions are kept as position arrays
+SPARSE_FRACTION = 64
+
+# Profiles whose results are remembered until the catalog changes
+MEMO_SIZE = 1024
+
+# Re-read at most this many changed projects before rebuilding from scratch instead
+MAX_INCREMENTAL_PROJECTS = 1000
+
+
+def keyword_terms(text):
+    """kw: terms for the words of a text (lowercased, plurals folded, short and stop words dropped)"""
+    terms = set()
+    for token in TOKEN_RE.findall(text.lower()):
+        if len(token) > 3 and token.endswith('s') and not token.endswith('ss'):
+            token = token[:-1]
+        if len(token) >= 3 and token not in STOPWORDS:
+            terms.add(f'kw:{token}')
+    return terms
+
+
+def technology_terms(technologies):
+    """tech: terms for a list of technology names"""
+    return {
+        f'tech:{name.strip().lower()}'
+        for name in technologies
+        if isinstance(name, str) and name.strip()
+    }
+
+
+def project_terms(project, technologies):
+    """Every term a project is indexed under"""
+    terms = {f'track:{project.track}', f'difficulty:{project.difficulty}'}
+    terms |= technology_terms(technologies)
+    terms |= keyword_terms(f'{project.title} {project.description}')
+    return frozenset(terms)
+
+
+def profile_terms(tracks, difficulty, technologies, keywords):
+    """Term -> weight for an onboarding profile"""
+    terms = {f'track:{track}' for track in tracks or ()}
+    if difficulty:
+        terms.add(f'difficulty:{difficulty}')
+    terms |= technology_terms(technologies or ())
+    for keyword in keywords or ():
+        terms |= keyword_terms(keyword)
+    return {term: WEIGHTS[term.split(':', 1)[0]] for term in terms}
+
+
+class RecommendationIndex:
+    """Inverted index from terms to project positions, with weighted top-k queries"""
+
+    def __init__(self):
+        self.positions = {}  # project id -> position
+        self.projects = []   # position -> Project (None once removed)
+        self.terms = []      # position -> frozenset of terms
+        self.postings = {}   # term -> int bitset, or array of positions for rare terms
+        self.alive = 0
+
+    @classmethod
+    def build(cls, projects, technologies):
+        """
+        Index projects in the given order
+
+        Args:
+            projects: Project instances (title, description, track, difficulty)
+            technologies: Dict mapping project id to its steps' technology names
+        """
+        index = cls()
+        positions_by_term = {}
+        for position, project in enumerate(projects):
+            terms = project_terms(project, technologies.get(project.id, ()))
+            index.positions[project.id] = position
+            index.projects.append(project)
+            index.terms.append(terms)
+            for term in terms:
+                positions_by_term.setdefault(term, []).append(position)
+
+        size = len(index.projects)
+        for term, positions in positions_by_term.items():
+            if len(positions) * SPARSE_FRACTION < size:
+                index.postings[term] = array('I', positions)
+            else:
+                index.postings[term] = bitset(positions, size)
+        index.alive = (1 << size) - 1
+        return index
+
+    def __len__(self):
+        return len(self.positions)
+
+    @property
+    def holes(self):
+        """Positions left empty by removed projects"""
+        return len(self.projects) - len(self.positions)
+
+    def add(self, project, technologies):
+        """Index a new project at the end, or re-index one in place"""
+        position = self.positions.get(project.id)
+        if position is None:
+            position = len(self.projects)
+            self.positions[project.id] = position
+            self.projects.append(None)
+            self.terms.append(frozenset())
+        else:
+            self._clear(position)
+
+        terms = project_terms(project, technologies)
+        bit = 1 << position
+        size = len(self.projects)
+        for term in terms:
+            posting = self.postings.get(term)
+            if posting is None:
+                self.postings[term] = array('I', [position])
+            elif isinstance(posting, int):
+                self.postings[term] = posting | bit
+            elif (len(posting) + 1) * SPARSE_FRACTION < size:
+                posting.append(position)
+            else:
+                self.postings[term] = bitset(posting, size) | bit
+        self.projects[position] = project
+        self.terms[position] = terms
+        self.alive |= bit
+
+    def remove(self, project_id):
+        """Drop a project; its position stays empty until the next rebuild"""
+        position = self.positions.pop(project_id, None)
+        if position is None:
+            return
+        self._clear(position)
+        self.projects[position] = None
+
+    def _clear(self, position):
+        mask = ~(1 << position)
+        for term in self.terms[position]:
+            posting = self.postings[term]
+            if isinstance(posting, int):
+                posting &= mask
+            else:
+                posting.remove(position)
+            if posting:
+                self.postings[term] = posting
+            else:
+                del self.postings[term]
+        self.terms[position] = frozenset()
+        self.alive &= mask
+
+    def _bits(self, term):
+        posting = self.postings.get(term, 0)
+        if isinstance(posting, int):
+            return posting
+        return bitset(posting, len(self.projects))
+
+    def top(self, weights, limit):
+        """
+        The limit highest scoring projects for term weights
+
+        Ties are broken by position, i.e. catalog order (projects added since the
+        last rebuild come after the rest).
+
+        Returns:
+            List of (project, score), best first
+        """
+        planes = []
+        for term, weight in weights.items():
+            bits = self._bits(term)
+            if bits:
+                add_weighted(planes, bits, weight)
+
+        # Walk the planes from the top bit down: greater holds positions certain to
+        # be in the top limit, equal those tied with the score prefix so far
+        greater, equal = 0, self.alive
+        for plane in reversed(planes):
+            candidates = greater | (equal & plane)
+            count = candidates.bit_count()
+            if count > limit:
+                equal &= plane
+            elif count < limit:
+                greater = candidates
+                equal &= ~plane
+            else:
+                greater, equal = candidates, 0
+                break
+
+        positions = lowest_positions(greater, limit)
+        positions += lowest_positions(equal, limit - len(positions))
+        scored = [
+            (sum(weight for term, weight in weights.items() if term in self.terms[position]), position)
+            for position in positions
+        ]
+        scored.sort(key=lambda item: (-item[0], item[1]))
+        return [(self.projects[position], score) for score, position in scored]
+
+
+def _load(project_ids=None):
+    """Pre-made projects in catalog order and their steps' technologies (two queries)"""
+    projects = Project.objects.filter(is_generated=False)
+    steps = ProjectStep.objects.filter(project__is_generated=False)
+    if project_ids is not None:
+        projects = projects.filter(pk__in=project_ids)
+        steps = steps.filter(project_id__in=project_ids)
+
+    technologies = {}
+    for project_id, names in steps.values_list('project_id', 'technologies'):
+        if isinstance(names, list):
+            technologies.setdefault(project_id, []).extend(names)
+    projects = projects.order_by('track', 'difficulty', 'title', 'id').only(
+        'id', 'title', 'description', 'track', 'difficulty'
+    )
+    return list(projects), technologies
+
+
+# (version, index) and per-profile results for that version, kept in process memory
+_local_index = (None, None)
+_memo = OrderedDict()
+_lock = threading.Lock()
+
+
+def _refresh(index, since, version):
+    """Bring an index at version since up to version; returns the same or a new index"""
+    changed = None if index is None else get_catalog_changes(since, version)
+    if changed is not None and len(changed) <= MAX_INCREMENTAL_PROJECTS:
+        projects, technologies = _load(changed)
+        removed = changed - {project.id for project in projects}
+        if index.holes + len(removed) <= len(index):
+            for project_id in removed:
+                index.remove(project_id)
+            for project in projects:
+                index.add(project, technologies.get(project.id, ()))
+            return index
+    return RecommendationIndex.build(*_load())
+
+
+def get_recommendation_index():
+    """The index for the current catalog version, updated or rebuilt if the catalog moved"""
+    global _local_index
+
+    version = get_catalog_version()
+    with _lock:
+        local_version, index = _local_index
+        if local_version != version:
+            index = _refresh(index, local_version, version)
+            _local_index = (version, index)
+            _memo.clear()
+    return index
+
+
+def recommend(tracks, difficulty, technologies=(), keywords=(), limit=6):
+    """
+    Best matching pre-made projects for an onboarding profile
+
+    Projects that match nothing are left out; if none match, the first projects
+    in catalog order are returned instead.
+
+    Returns:
+        List of Project instances (only id, title, description, track and
+        difficulty are loaded)
+    """
+    index = get_recommendation_index()
+    weights = profile_terms(tracks, difficulty, technologies, keywords)
+    key = (tuple(sorted(weights)), limit)
+    with _lock:
+        results = _memo.get(key)
+        if results is None:
+            top = index.top(weights, limit)
+            results = [project for project, score in top if score] or [project for project, _ in top]
+            _memo[key] = results
+            if len(_memo) > MEMO_SIZE:
+                _memo.popitem(last=False)
+            result = 'miss'
+        else:
+            _memo.move_to_end(key)
+            result = 'hit'
+    metrics.inc('projecthack_cache_requests_total', {'cache': 'recommendations', 'result': result})
+    return list(results)
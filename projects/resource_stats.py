@@ -0,0 +1,247 @@
+"""
+Resource stats - file size, CSV column stats and row previews for ProjectResource files
+
+Stats are computed in one streaming pass when a resource is saved or loaded
+from the catalog, and stored on the resource with the size and mtime of the
+file they describe. They are only recomputed when the file changes. Memory
+use does not depend on the file size: each column keeps a few running values,
+and previews read only the rows they show.
+"""
+import csv
+import math
+import re
+from itertools import islice
+
+from django.http import Http404
+
+from .delivery import resource_path, stat_file
+
+
+NULL_TOKENS = {'', 'na', 'n/a', 'nan', 'null', 'none', '-'}
+# Matched without lower()/strip() per cell - the spellings files actually use
+NULL_VALUES = {
+    variant
+    for token in NULL_TOKENS
+    for variant in (token, token.upper(), token.title(), f' {token}', f'{token} ')
+} | {'NaN', ' '}
+BOOLEAN_TOKENS = {'true', 'false', 'yes', 'no'}
+DATE_RE = re.compile(r'^\d{4}-\d{2}-\d{2}([ T]\d{2}:\d{2}(:\d{2}(\.\d+)?)?)?$')
+
+# Rows parsed before their columns are summarised - bounds memory, amortises per-column work
+BATCH_ROWS = 10000
+
+# Characters read at most per line, and per preview - without a bound a file
+# with no newlines would be read into memory whole before the csv module balks
+MAX_LINE_CHARS = 1 << 20
+MAX_PREVIEW_CHARS = 1 << 22
+
+
+def human_size(size):
+    """Bytes as a short display string, e.g. '15 KB' or '2.5 MB'"""
+    for unit in ('bytes', 'KB', 'MB', 'GB'):
+        if size < 1024 or unit == 'GB':
+            break
+        size /= 1024
+    if unit == 'bytes':
+        return f'{size} bytes'
+    return f'{size:.1f} {unit}'.replace('.0 ', ' ')
+
+
+def _open_csv(path):
+    # utf-8-sig drops the byte order mark spreadsheet exports start with
+    return open(path, newline='', encoding='utf-8-sig', errors='replace')
+
+
+def _bounded_lines(f, max_total=None):
+    """Lines of a file, raising csv.Error rather than reading an overlong line or past max_total characters"""
+    total = 0
+    while line := f.readline(MAX_LINE_CHARS + 1):
+        if len(line) > MAX_LINE_CHARS:
+            raise csv.Error(f'line longer than {MAX_LINE_CHARS} characters')
+        total += len(line)
+        if max_total is not None and total > max_total:
+            raise csv.Error(f'preview longer than {max_total} characters')
+        yield line
+
+
+def _numbers(values, cast):
+    """(min, max) if every value parses as a finite number with cast, else None"""
+    try:
+        numbers = list(map(cast, values))
+    except ValueError:
+        return None
+    low, high = min(numbers), max(numbers)
+    if not (math.isfinite(low) and math.isfinite(high)):
+        return None
+    return low, high
+
+
+def _classify(values, current):
+    """
+    dtype of a batch of non-null values, and their numeric (min, max) if numeric
+
+    Types narrower than the column's current dtype are still tried, so a batch
+    of integers in a float column keeps it a float column.
+    """
+    if current in (None, 'integer', 'float'):
+        for dtype, cast in (('integer', int), ('float', float)):
+            bounds = _numbers(values, cast)
+            if bounds is not None:
+                return dtype, bounds
+    if current in (None, 'boolean') and all(value.lower() in BOOLEAN_TOKENS for value in values):
+        return 'boolean', None
+    if current in (None, 'date') and all(DATE_RE.match(value) for value in values):
+        return 'date', None
+    return 'string', None
+
+
+def _widen(current, dtype):
+    """Narrowest dtype covering both - integers widen to floats, any other mix is text"""
+    if current is None or current == dtype:
+        return dtype
+    if {current, dtype} == {'integer', 'float'}:
+        return 'float'
+    return 'string'
+
+
+class _ColumnStats:
+    """Running stats for one column"""
+
+    __slots__ = ('name', 'dtype', 'nulls', 'number_min', 'number_max', 'text_min', 'text_max')
+
+    def __init__(self, name):
+        self.name = name
+        self.dtype = None
+        self.nulls = 0
+        self.number_min = self.number_max = None
+        self.text_min = self.text_max = None
+
+    def add(self, values):
+        """Fold a batch of cells into the running stats"""
+        present = [value for value in values if value not in NULL_VALUES]
+        self.nulls += len(values) - len(present)
+        if not present:
+            return
+        # Once a column is text only the text range matters
+        if self.dtype != 'string':
+            dtype, bounds = _classify(present, self.dtype)
+            self.dtype = _widen(self.dtype, dtype)
+            if bounds:
+                low, high = bounds
+                self.number_min = low if self.number_min is None else min(self.number_min, low)
+                self.number_max = high if self.number_max is None else max(self.number_max, high)
+        low, high = min(present), max(present)
+        self.text_min = low if self.text_min is None else min(self.text_min, low)
+        self.text_max = high if self.text_max is None else max(self.text_max, high)
+
+    def as_dict(self):
+        dtype = self.dtype or 'empty'
+        if dtype in ('integer', 'float'):
+            low, high = self.number_min, self.number_max
+        elif dtype in ('date', 'string'):
+            low, high = self.text_min, self.text_max
+        else:
+            low = high = None
+        return {'name': self.name, 'dtype': dtype, 'nulls': self.nulls, 'min': low, 'max': high}
+
+
+def compute_csv_stats(path):
+    """
+    Row count and per-column dtype, null count and min/max of a CSV file, in one pass
+
+    Rows are summarised column by column in batches of BATCH_ROWS. Rows
+    shorter than the header count their missing cells as nulls; cells beyond
+    the header are ignored.
+    """
+    with _open_csv(path) as f:
+        reader = csv.reader(_bounded_lines(f))
+        header = next(reader, [])
+        columns = [_ColumnStats(name) for name in header]
+        width = len(columns)
+        rows = 0
+        while batch := list(islice(reader, BATCH_ROWS)):
+            batch = [row for row in batch if row]  # Blank lines
+            rows += len(batch)
+            if not batch or not width:
+                continue
+            if any(len(row) != width for row in batch):
+                batch = [(row + [''] * width)[:width] for row in batch]
+            for column, values in zip(columns, zip(*batch)):
+                column.add(values)
+    return {'rows': rows, 'columns': [column.as_dict() for column in columns]}
+
+
+def read_preview(path, rows):
+    """
+    Header and the first rows of a CSV file, reading no further than needed
+
+    At most MAX_PREVIEW_CHARS are read, and no line longer than MAX_LINE_CHARS.
+
+    Returns:
+        Dict with 'header', 'rows' and 'truncated' (more rows follow)
+    """
+    header = []
+    preview = []
+    truncated = False
+    with _open_csv(path) as f:
+        reader = csv.reader(_bounded_lines(f, MAX_PREVIEW_CHARS))
+        try:
+            header = next(reader, [])
+            for row in reader:
+                if len(preview) == rows:
+                    truncated = True
+                    break
+                preview.append(row)
+        except csv.Error:
+            # Malformed or oversized past this point - show what parsed
+            truncated = True
+    return {'header': header, 'rows': preview, 'truncated': truncated}
+
+
+def _source(file_stat):
+    return {'size': file_stat.st_size, 'mtime_ns': file_stat.st_mtime_ns}
+
+
+def _resource_file(resource):
+    """(path, stat result) of a resource's file; stat is None if it is missing or outside RESOURCE_FILES_DIR"""
+    try:
+        path = resource_path(resource)
+    except Http404:
+        return None, None
+    return path, stat_file(path)
+
+
+def resource_is_stale(resource):
+    """True when a resource's file_size/stats do not describe its current file (stat only)"""
+    _, file_stat = _resource_file(resource)
+    if file_stat is None:
+        return bool(resource.stats or resource.file_size)
+    return resource.stats.get('source') != _source(file_stat)
+
+
+def describe_resource(resource, force=False):
+    """
+    Fill in a resource's file_size and stats from its file (not saved)
+
+    Returns:
+        True if anything changed
+    """
+    path, file_stat = _resource_file(resource)
+    if file_stat is None:
+        changed = bool(resource.stats or resource.file_size)
+        resource.file_size = ''
+        resource.stats = {}
+        return changed
+    source = _source(file_stat)
+    if not force and resource.stats.get('source') == source and resource.file_size:
+        return False
+
+    stats = {'source': source}
+    if resource.resource_type == 'csv':
+        try:
+            stats.update(compute_csv_stats(path))
+        except (OSError, csv.Error) as e:
+            stats['error'] = str(e)
+    resource.file_size = human_size(file_stat.st_size)
+    resource.stats = stats
+    return True
@@ -0,0 +1,180 @@
+"""
+Data retention - batched deletion of stale generated projects, sessions and profiles
+"""
+import gzip
+import logging
+import os
+import sys
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core import serializers
+from django.core.cache import cache
+from django.db import connections, transaction
+from django.db.models import Exists, OuterRef
+from django.db.models.deletion import Collector
+from django.utils import timezone
+
+from .models import Project, UserSession, UserProfile
+
+
+logger = logging.getLogger(__name__)
+
+RETENTION_LOCK_KEY = 'projects:retention:lock'
+
+# Programs that serve requests - the only ones that start the background runner
+SERVER_PROGRAMS = {'gunicorn', 'uvicorn', 'daphne', 'hypercorn'}
+
+
+def stale_generated_projects(days):
+    """Generated projects older than `days` that nobody ever started"""
+    return Project.objects.filter(
+        is_generated=True,
+        created_at__lt=timezone.now() - timedelta(days=days),
+    ).exclude(
+        Exists(UserSession.objects.filter(project=OuterRef('pk')))
+    )
+
+
+def abandoned_sessions(days):
+    """Incomplete sessions started more than `days` ago"""
+    return UserSession.objects.filter(
+        completed=False,
+        start_time__lt=timezone.now() - timedelta(days=days),
+    )
+
+
+def stale_profiles(days):
+    """Profiles not updated for `days` - their session cookie has long expired"""
+    return UserProfile.objects.filter(
+        updated_at__lt=timezone.now() - timedelta(days=days),
+    )
+
+
+def _archive_collected(archive, collector):
+    """Append every row a collected delete removes, cascaded ones included, as JSONL"""
+    for model, instances in collector.data.items():
+        # Cascaded instances are loaded with only their keys, so read the full rows
+        rows = model._base_manager.using(collector.using).filter(pk__in=[obj.pk for obj in instances])
+        archive.write(serializers.serialize('jsonl', rows.order_by('pk')))
+    for queryset in collector.fast_deletes:
+        archive.write(serializers.serialize('jsonl', queryset.order_by('pk')))
+
+
+# name -> (queryset factory, settings key for the retention window in days)
+RETENTION_POLICIES = {
+    'generated_projects': (stale_generated_projects, 'RETENTION_GENERATED_PROJECT_DAYS'),
+    'abandoned_sessions': (abandoned_sessions, 'RETENTION_ABANDONED_SESSION_DAYS'),
+    'profiles': (stale_profiles, 'RETENTION_USER_PROFILE_DAYS'),
+}
+
+
+def purge(name, batch_size=1000, archive_dir=None, dry_run=False):
+    """
+    Delete rows matched by a retention policy in primary-key ordered batches
+
+    Each batch is one short transaction over a bounded pk range, and the policy
+    filter is re-applied inside it so rows that became active meanwhile survive.
+
+    Args:
+        name: Key of RETENTION_POLICIES
+        batch_size: Maximum rows per delete
+        archive_dir: If set, rows are appended to a gzipped JSONL file here first,
+            together with the steps, resources and sessions their delete cascades
+            to (Django's jsonl serialization, so `loaddata` restores them)
+        dry_run: Count matching rows without deleting
+
+    Returns:
+        Dict with 'rows', 'seconds' and 'archive' (path or None)
+    """
+    factory, setting = RETENTION_POLICIES[name]
+    queryset = factory(getattr(settings, setting))
+    started = time.perf_counter()
+
+    if dry_run:
+        return {'rows': queryset.count(), 'seconds': time.perf_counter() - started, 'archive': None}
+
+    archive_path = None
+    archive = None
+    if archive_dir:
+        os.makedirs(archive_dir, exist_ok=True)
+        archive_path = os.path.join(archive_dir, f'{name}-{timezone.now():%Y%m%d%H%M%S}.jsonl.gz')
+        archive = gzip.open(archive_path, 'at', encoding='utf-8')
+
+    model = queryset.model
+    total = 0
+    last_pk = None
+    try:
+        while True:
+            page = queryset.order_by('pk')
+            if last_pk is not None:
+                page = page.filter(pk__gt=last_pk)
+            pks = list(page.values_list('pk', flat=True)[:batch_size])
+            if not pks:
+                break
+            last_pk = pks[-1]
+
+            with transaction.atomic():
+                batch = factory(getattr(settings, setting)).filter(pk__gte=pks[0], pk__lte=last_pk)
+                collector = Collector(using=batch.db, origin=batch)
+                collector.collect(batch)
+                if archive is not None:
+                    _archive_collected(archive, collector)
+                _, deleted = collector.delete()
+            total += deleted.get(model._meta.label, 0)
+    finally:
+        if archive is not None:
+            archive.close()
+
+    return {'rows': total, 'seconds': time.perf_counter() - started, 'archive': archive_path}
+
+
+def purge_all(**kwargs):
+    """Run every retention policy; returns {name: result}"""
+    return {name: purge(name, **kwargs) for name in RETENTION_POLICIES}
+
+
+def _run_forever(interval):
+    while True:
+        time.sleep(interval)
+        # Only one worker per interval does the work when the cache is shared
+        if not cache.add(RETENTION_LOCK_KEY, os.getpid(), timeout=interval):
+            continue
+        try:
+            for name, result in purge_all().items():
+                logger.info('Retention purge %s: %d rows in %.2fs', name, result['rows'], result['seconds'])
+        except Exception:
+            logger.exception('Retention purge failed')
+        finally:
+            connections.close_all()
+
+
+def is_server_process(argv=None, environ=None):
+    """
+    Whether this process is a known web server (SERVER_PROGRAMS or runserver)
+
+    Anything else - management commands, pytest, celery, notebooks, scripts -
+    is not. Under runserver only the autoreloader's child serves requests.
+    """
+    argv = sys.argv if argv is None else argv
+    environ = os.environ if environ is None else environ
+    if not argv:
+        return False
+    program = os.path.basename(argv[0])
+    if program == '__main__.py':
+        # python -m <package>
+        program = os.path.basename(os.path.dirname(argv[0]))
+    if program in SERVER_PROGRAMS:
+        return True
+    if program in ('manage.py', 'django-admin', 'django') and argv[1:2] == ['runserver']:
+        return '--noreload' in argv or environ.get('RUN_MAIN') == 'true'
+    return False
+
+
+def start_retention_runner(interval):
+    """Start a daemon thread that runs purge_all every `interval` seconds"""
+    thread = threading.Thread(target=_run_forever, args=(interval,), name='retention-runner', daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,103 @@
+"""
+Signal handlers that keep cached catalog data and derived fields in sync with the database
+"""
+import contextvars
+from contextlib import contextmanager
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, pre_save
+from django.dispatch import receiver
+
+from .catalog import bump_catalog_version
+from .models import Project, ProjectStep, ProjectResource
+from .resource_stats import describe_resource
+
+
+# Project ids whose step_stats rebuild is deferred (None outside deferred_step_stats)
+_deferred_step_stats = contextvars.ContextVar('projects_deferred_step_stats', default=None)
+
+
+@contextmanager
+def deferred_step_stats():
+    """
+    Rebuild step_stats once per project when the block ends, not on every step save
+
+    For code that saves or deletes many steps one by one - admin bulk deletes,
+    inline formsets, scripts. Nested blocks leave the rebuild to the outermost.
+    """
+    if _deferred_step_stats.get() is not None:
+        yield
+        return
+    pending = set()
+    token = _deferred_step_stats.set(pending)
+    try:
+        yield
+    finally:
+        _deferred_step_stats.reset(token)
+    Project.rebuild_step_stats(pending)
+
+
+def _deleting_projects(origin):
+    """True when a delete was started from a Project instance or queryset"""
+    return isinstance(origin, Project) or getattr(origin, 'model', None) is Project
+
+
+@receiver(post_save, sender=Project)
+@receiver(post_delete, sender=Project)
+def project_changed(sender, instance, **kwargs):
+    """Invalidate the catalog snapshot when a pre-made project changes"""
+    # Generated projects never appear in the catalog. Bump once the change is
+    # committed, or other workers could rebuild from the old rows under the new version
+    if not instance.is_generated:
+        transaction.on_commit(partial(bump_catalog_version, [instance.pk]))
+
+
+@receiver(post_save, sender=ProjectStep)
+@receiver(post_delete, sender=ProjectStep)
+def project_step_changed(sender, instance, origin=None, **kwargs):
+    """Invalidate the catalog snapshot when steps change (affects steps-available flags)"""
+    # Cascading from a project delete - the project's own signal handles it
+    if _deleting_projects(origin):
+        return
+    
+    # Only skip when we know the parent is generated - avoid an extra query per step
+    project_field = ProjectStep._meta.get_field('project')
+    if project_field.is_cached(instance) and instance.project.is_generated:
+        return
+    transaction.on_commit(partial(bump_catalog_version, [instance.project_id]))
+
+
+@receiver(post_save, sender=ProjectStep)
+@receiver(post_delete, sender=ProjectStep)
+def update_step_stats(sender, instance, origin=None, **kwargs):
+    """
+    Keep Project.step_stats in sync with the project's steps
+
+    Costs an aggregate and an UPDATE per step saved or deleted; wrap bulk edits
+    in deferred_step_stats() to pay that once per project.
+    """
+    # The whole project is being deleted - nothing left to keep in sync
+    if _deleting_projects(origin):
+        return
+    
+    pending = _deferred_step_stats.get()
+    if pending is not None:
+        pending.add(instance.project_id)
+        return
+    
+    stats = Project.rebuild_step_stats([instance.project_id])
+    
+    # Refresh the in-memory parent too so callers holding it see the new counts
+    project_field = ProjectStep._meta.get_field('project')
+    if project_field.is_cached(instance):
+        instance.project.step_stats = stats[instance.project_id]
+
+
+@receiver(pre_save, sender=ProjectResource)
+def describe_resource_file(sender, instance, raw=False, **kwargs):
+    """Fill in file_size and column stats when a resource is registered or its file changed"""
+    # Fixtures carry their own values
+    if raw:
+        return
+    describe_resource(instance)
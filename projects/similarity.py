@@ -0,0 +1,152 @@
+"""
+Similar projects - the top-k pre-made projects sharing the most technologies with each one
+
+rebuild_similar_projects computes every project's neighbours in one batch and
+stores them in ProjectNeighbour, so project_overview reads them with one
+indexed query instead of comparing against the whole catalog per request.
+
+Each technology keeps a bitset of the projects using it (bit n = n-th project
+in id order). For one project, adding the bitsets of its technologies into bit
+planes gives its overlap with every project in the catalog at once, a few
+whole-catalog integer operations per technology. Jaccard and cosine similarity
+only depend on the overlap and the two set sizes, so neighbours are read off
+in score order by walking the (overlap, size) combinations from best to worst
+and stopping once k are found. Projects with the same technology set share one
+computation.
+"""
+import math
+from fractions import Fraction
+from itertools import islice
+
+from django.conf import settings
+from django.db import transaction
+
+from .bitsets import add_weighted, bitset, equal_to, lowest_positions
+from .models import ProjectNeighbour, ProjectStep
+from .recommendations import technology_terms
+
+
+METRICS = ('jaccard', 'cosine')
+
+
+def similarity(metric, overlap, size, other_size):
+    """Exact similarity of two sets as a Fraction - cosine is squared, which keeps its order"""
+    if metric == 'cosine':
+        return Fraction(overlap * overlap, size * other_size)
+    return Fraction(overlap, size + other_size - overlap)
+
+
+def stored_score(metric, value):
+    """Similarity as stored in ProjectNeighbour.score"""
+    return math.sqrt(value) if metric == 'cosine' else float(value)
+
+
+def load_technology_sets():
+    """
+    Technology set of every pre-made project that has steps with technologies
+
+    Returns:
+        Dict mapping project id to a frozenset of normalised technology names
+    """
+    technologies = {}
+    steps = ProjectStep.objects.filter(project__is_generated=False).values_list('project_id', 'technologies')
+    for project_id, names in steps:
+        if isinstance(names, list):
+            technologies.setdefault(project_id, set()).update(technology_terms(names))
+    return {project_id: frozenset(names) for project_id, names in technologies.items() if names}
+
+
+def compute_neighbours(technology_sets, k=None, metric='jaccard'):
+    """
+    Top-k most similar projects of each project
+
+    Projects only count as similar when they share at least one technology.
+    Equal scores are ordered by project id.
+
+    Args:
+        technology_sets: Dict mapping project id to its set of technologies
+        k: Neighbours per project (default: SIMILAR_PROJECTS)
+
+    Yields:
+        (project id, [(neighbour id, score), ...] best first) for every project
+        with at least one neighbour
+    """
+    if metric not in METRICS:
+        raise ValueError(f'Unknown similarity metric: {metric!r}')
+    if k is None:
+        k = settings.SIMILAR_PROJECTS
+    ids = sorted(technology_sets)
+    size = len(ids)
+
+    positions_by_technology = {}
+    positions_by_set = {}
+    positions_by_size = {}
+    for position, project_id in enumerate(ids):
+        technologies = technology_sets[project_id]
+        for technology in technologies:
+            positions_by_technology.setdefault(technology, []).append(position)
+        positions_by_set.setdefault(technologies, []).append(position)
+        positions_by_size.setdefault(len(technologies), []).append(position)
+    postings = {technology: bitset(positions, size) for technology, positions in positions_by_technology.items()}
+    by_size = {count: bitset(positions, size) for count, positions in positions_by_size.items()}
+    everything = (1 << size) - 1
+
+    # Every (overlap, other set size) combination, grouped by the score it gives, best
+    # first - the same for every set of a given size
+    combinations = {}
+    for count in by_size:
+        scores = {}
+        for overlap in range(1, count + 1):
+            for other_size in by_size:
+                if other_size >= overlap:
+                    value = similarity(metric, overlap, count, other_size)
+                    scores.setdefault(value, []).append((overlap, other_size))
+        combinations[count] = [(stored_score(metric, value), scores[value]) for value in sorted(scores, reverse=True)]
+
+    for technologies, members in positions_by_set.items():
+        planes = []
+        for technology in technologies:
+            add_weighted(planes, postings[technology], 1)
+
+        # One more than k, so each member can drop itself
+        wanted = k + 1
+        found = []
+        overlaps = {}
+        for score, pairs in combinations[len(technologies)]:
+            bits = 0
+            for overlap, other_size in pairs:
+                if overlap not in overlaps:
+                    overlaps[overlap] = equal_to(planes, overlap, everything)
+                bits |= overlaps[overlap] & by_size[other_size]
+            found.extend((position, score) for position in lowest_positions(bits, wanted - len(found)))
+            if len(found) == wanted:
+                break
+
+        for member in members:
+            neighbours = [(ids[position], score) for position, score in found if position != member][:k]
+            if neighbours:
+                yield ids[member], neighbours
+
+
+def store_neighbours(neighbours, batch_size=5000):
+    """
+    Replace every ProjectNeighbour row, in one transaction
+
+    Args:
+        neighbours: Iterable of (project id, [(neighbour id, score), ...])
+
+    Returns:
+        Number of rows written
+    """
+    rows = (
+        ProjectNeighbour(project_id=project_id, neighbour_id=neighbour_id, rank=rank, score=score)
+        for project_id, ranked in neighbours
+        for rank, (neighbour_id, score) in enumerate(ranked, 1)
+    )
+    written = 0
+    with transaction.atomic():
+        ProjectNeighbour.objects.all().delete()
+        while batch := list(islice(rows, batch_size)):
+            ProjectNeighbour.objects.bulk_create(batch)
+            written += len(batch)
+    return written
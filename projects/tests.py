@@ -1,8 +1,38 @@
-from django.test import TestCase, Client
-from django.urls import reverse
+import csv
+import gzip
+import io
+import json
+import math
+import multiprocessing
+import os
+import re
+import shutil
+import tempfile
+import time
+import tracemalloc
+import zipfile
+from unittest import mock
+from django.db import connection, transaction
+from django.core.management import CommandError, call_command
+from django.test import TestCase, Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse, get_resolver
 from django.utils import timezone
 from datetime import timedelta
-from .models import Project, ProjectStep, UserSession
+from django.core.cache import cache
+from .models import Project, ProjectNeighbour, ProjectStep, ProjectResource, UserSession, UserProfile
+from . import metrics
+from .catalog import bump_catalog_version, get_catalog_snapshot, get_catalog_version
+from .catalog_loader import CatalogError, load_catalog
+from .checks import check_shared_cache
+from .generator import ProjectGenerator
+from .profiling import list_profiles
+from .recommendations import get_recommendation_index
+from .resource_stats import read_preview
+from .retention import is_server_process, purge
+from .signals import deferred_step_stats
+from .similarity import compute_neighbours, load_technology_sets, store_neighbours
+from .timer import make_timer_token, publish_timer_token, stream_timer_events, read_timer_token
 
 
 class ProjectModelTest(TestCase):
@@ -104,6 +134,59 @@ class UserSessionModelTest(TestCase):
         total = self.session.get_total_steps()
         self.assertEqual(total, 3)
     
+    def test_get_total_steps_no_query(self):
+        """Test total steps are read from cached step stats"""
+        session = UserSession.objects.select_related('project').get(pk=self.session.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(session.get_total_steps(), 3)
+            session.get_progress_percentage()
+    
+    def test_step_stats_maintained(self):
+        """Test step stats follow step inserts and deletes"""
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.step_stats['6h'], {'steps': 3, 'minutes': 180})
+        self.assertEqual(self.project.get_total_minutes('6h'), 180)
+        
+        ProjectStep.objects.filter(project=self.project, step_number=3).get().delete()
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.get_step_count('6h'), 2)
+        
+        # Longer timeframes inherit the shorter plans and add their own steps
+        ProjectStep.objects.create(
+            project=self.project, step_number=3, title='Step 3', description='Description 3',
+            technologies=['HTML'], estimated_time=30, timeframe='24h'
+        )
+        self.project.refresh_from_db()
+        # Only timeframes with steps of their own are offered
+        self.assertEqual(self.project.step_stats, {
+            '6h': {'steps': 2, 'minutes': 120},
+            '24h': {'steps': 3, 'minutes': 150},
+        })
+        self.assertEqual(self.project.get_available_timeframes(), ['6h', '24h'])
+        self.assertEqual([step.step_number for step in self.project.get_steps('12h')], [1, 2])
+        self.assertEqual([step.step_number for step in self.project.get_steps('48h')], [1, 2, 3])
+    
+    def test_stale_instance_keeps_step_stats(self):
+        """Test saving a project loaded before its steps changed does not write old counts back"""
+        stale = Project.objects.get(pk=self.project.pk)
+        ProjectStep.objects.filter(project=self.project, step_number=3).get().delete()
+        stale.title = 'Renamed'
+        stale.save()
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.title, 'Renamed')
+        self.assertEqual(self.project.get_step_count('6h'), 2)
+    
+    def test_deferred_step_stats(self):
+        """Test step edits inside deferred_step_stats rebuild the project's stats once"""
+        with CaptureQueriesContext(connection) as queries:
+            with deferred_step_stats():
+                for step in ProjectStep.objects.filter(project=self.project, step_number__gte=2):
+                    step.delete()
+        updates = [q for q in queries.captured_queries if q['sql'].startswith('UPDATE "projects_project"')]
+        self.assertEqual(len(updates), 1)
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.step_stats, {'6h': {'steps': 1, 'minutes': 60}})
+    
     def test_get_progress_percentage(self):
         """Test progress percentage calculation"""
         # No steps completed
@@ -119,6 +202,29 @@ class UserSessionModelTest(TestCase):
         self.session.save()
         self.assertEqual(self.session.get_progress_percentage(), 100)
     
+    def test_completed_steps_bitmask(self):
+        """Test completed steps are stored as a bitmask"""
+        self.session.completed_steps = [1, 3]
+        self.assertEqual(self.session.completed_mask, 0b101)
+        self.assertEqual(self.session.completed_steps, [1, 3])
+        self.assertEqual(self.session.get_completed_count(), 2)
+    
+    def test_complete_current_step(self):
+        """Test completing steps updates the row in place"""
+        self.assertTrue(self.session.complete_current_step())
+        self.assertEqual(self.session.current_step, 2)
+        self.assertEqual(self.session.completed_steps, [1])
+        # Completing a step the session has already moved past is a no-op
+        self.assertFalse(self.session.complete_current_step(step=1))
+        self.assertEqual(self.session.current_step, 2)
+        
+        self.session.complete_current_step()
+        self.session.complete_current_step()
+        self.session.refresh_from_db()
+        self.assertTrue(self.session.completed)
+        self.assertIsNotNone(self.session.completed_at)
+        self.assertEqual(self.session.completed_steps, [1, 2, 3])
+    
     def test_get_remaining_time(self):
         """Test remaining time calculation"""
         # Start time is now, so remaining should be close to 6 hours
@@ -137,6 +243,7 @@ class HomeViewTest(TestCase):
     """Test home view"""
     
     def setUp(self):
+        cache.clear()
         self.client = Client()
         self.project = Project.objects.create(
             title='Test Project',
@@ -144,6 +251,15 @@ class HomeViewTest(TestCase):
             difficulty='beginner',
             track='web_dev'
         )
+        # Home redirects to onboarding unless the profile has completed it
+        UserProfile.objects.create(
+            session_id='test-session',
+            experience_level='beginner',
+            onboarding_completed=True
+        )
+        session = self.client.session
+        session['session_id'] = 'test-session'
+        session.save()
     
     def test_home_view(self):
         """Test that home page loads"""
@@ -156,6 +272,223 @@ class HomeViewTest(TestCase):
         Project.objects.all().delete()
         response = self.client.get(reverse('projects:home'))
         self.assertEqual(response.status_code, 200)
+    
+    def profile_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        return response, [q for q in queries.captured_queries if 'projects_userprofile' in q['sql']]
+    
+    def test_returning_visitor_skips_profile_lookup(self):
+        """Test the onboarding state is read from the session after the first visit"""
+        _, lookups = self.profile_queries(reverse('projects:home'))
+        self.assertEqual(len(lookups), 1)
+        response, lookups = self.profile_queries(reverse('projects:home'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(lookups, [])
+    
+    def test_onboarding_keeps_state_in_sync(self):
+        """Test onboarding views update the session copy, and stale copies are re-checked"""
+        self.client.get(reverse('projects:home'))
+        self.client.get(reverse('projects:onboarding_start') + '?reset=true')
+        response, lookups = self.profile_queries(reverse('projects:home'))
+        self.assertRedirects(response, reverse('projects:onboarding_start'), fetch_redirect_response=False)
+        self.assertEqual(lookups, [])
+        
+        self.client.post(reverse('projects:onboarding_tracks'), {'tracks': ['web_dev'], 'difficulty': 'beginner'})
+        self.client.post(reverse('projects:onboarding_interests'), {'interests': 'Games'})
+        response, lookups = self.profile_queries(reverse('projects:home'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(lookups, [])
+        self.assertEqual(list(response.context['recommended_projects']), [self.project])
+        
+        # Changes made outside the onboarding views show up once the copy is re-checked
+        UserProfile.objects.filter(session_id='test-session').delete()
+        self.assertEqual(self.client.get(reverse('projects:home')).status_code, 200)
+        with self.settings(ONBOARDING_STATE_MAX_AGE=0):
+            response = self.client.get(reverse('projects:home'))
+        self.assertRedirects(response, reverse('projects:onboarding_start'), fetch_redirect_response=False)
+    
+    def test_completed_without_preferences(self):
+        """Test a completed profile without preferences is sent to onboarding, without writing it"""
+        UserProfile.objects.filter(session_id='test-session').update(experience_level='')
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('projects:home'))
+        self.assertRedirects(response, reverse('projects:onboarding_start'), fetch_redirect_response=False)
+        self.assertFalse([q for q in queries.captured_queries if q['sql'].startswith('UPDATE "projects_userprofile"')])
+
+
+class CatalogSnapshotTest(TestCase):
+    """Test the cached catalog snapshot used by the home view"""
+    
+    def setUp(self):
+        cache.clear()
+        self.project = Project.objects.create(
+            title='Portfolio',
+            description='Test description',
+            difficulty='beginner',
+            track='frontend'
+        )
+        Project.objects.create(
+            title='Generated',
+            description='Test description',
+            difficulty='beginner',
+            track='frontend',
+            is_generated=True
+        )
+    
+    def test_snapshot_groups_projects(self):
+        """Test snapshot layout matches the home template"""
+        snapshot = get_catalog_snapshot()
+        self.assertEqual(snapshot['total_projects'], 1)
+        self.assertEqual(snapshot['projects_with_steps'], 0)
+        cell = snapshot['projects_by_track']['frontend']['projects']['beginner']
+        self.assertEqual(cell['name'], 'Beginner')
+        self.assertEqual([p['title'] for p in cell['projects']], ['Portfolio'])
+        self.assertEqual(snapshot['projects_by_track']['backend']['projects'], {})
+    
+    def test_snapshot_single_query_then_cached(self):
+        """Test snapshot builds with one query and warm hits run none"""
+        with self.assertNumQueries(1):
+            get_catalog_snapshot()
+        with self.assertNumQueries(0):
+            get_catalog_snapshot()
+    
+    def test_snapshot_invalidated_on_step_change(self):
+        """Test saving a step rebuilds the snapshot"""
+        get_catalog_snapshot()
+        with self.captureOnCommitCallbacks(execute=True):
+            ProjectStep.objects.create(
+                project=self.project,
+                step_number=1,
+                title='Step 1',
+                description='Description',
+                technologies=['HTML'],
+                estimated_time=60,
+                timeframe='6h'
+            )
+        self.assertEqual(get_catalog_snapshot()['projects_with_steps'], 1)
+    
+    def test_snapshot_invalidated_on_project_delete(self):
+        """Test deleting a project rebuilds the snapshot"""
+        get_catalog_snapshot()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.project.delete()
+        self.assertEqual(get_catalog_snapshot()['total_projects'], 0)
+
+    
+    def test_per_process_cache_warning(self):
+        """Test the deploy check warns about LocMemCache unless DEBUG is on or the cache is shared"""
+        with override_settings(DEBUG=False):
+            self.assertEqual([w.id for w in check_shared_cache(None)], ['projects.W001'])
+        with override_settings(DEBUG=True):
+            self.assertEqual(check_shared_cache(None), [])
+        with override_settings(DEBUG=False, CACHES={'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}):
+            self.assertEqual(check_shared_cache(None), [])
+
+class RecommendationTest(TestCase):
+    """Test scored recommendations from the in-process index"""
+    
+    def setUp(self):
+        cache.clear()
+        self.weather = Project.objects.create(
+            title='Weather Dashboard',
+            description='Show forecasts from a public API',
+            difficulty='beginner',
+            track='frontend'
+        )
+        self.games = Project.objects.create(
+            title='Arcade',
+            description='Small browser games',
+            difficulty='advanced',
+            track='python'
+        )
+        self.other = Project.objects.create(
+            title='Blog',
+            description='Posts and comments',
+            difficulty='intermediate',
+            track='backend'
+        )
+        ProjectStep.objects.create(
+            project=self.games,
+            step_number=1,
+            title='Step 1',
+            description='Description',
+            technologies=['Python', 'Pygame'],
+            estimated_time=60,
+            timeframe='6h'
+        )
+    
+    def test_ranked_by_weighted_overlap(self):
+        """Test technologies and keywords count alongside track and difficulty"""
+        recommended = UserProfile.recommend_projects(
+            ['frontend'], 'beginner', technologies=['python', 'Pygame'], keywords=['Games']
+        )
+        self.assertEqual(recommended, [self.games, self.weather])
+        
+        profile = UserProfile.objects.create(
+            session_id='profile', preferred_tracks=['backend'], interests_keywords=['weather']
+        )
+        self.assertEqual(profile.get_recommended_projects(limit=1), [self.other])
+    
+    def test_no_match_falls_back_to_catalog_order(self):
+        """Test a profile matching nothing gets the first projects in catalog order"""
+        self.assertEqual(
+            UserProfile.recommend_projects([], '', keywords=['Nothing'], limit=2),
+            [self.other, self.weather]
+        )
+    
+    def test_warm_recommendations_run_no_queries(self):
+        """Test the index is built with two queries and then served from memory"""
+        with self.assertNumQueries(2):
+            UserProfile.recommend_projects(['frontend'], 'beginner')
+        with self.assertNumQueries(0):
+            UserProfile.recommend_projects(['python'], '', keywords=['Arcade'])
+    
+    def test_catalog_changes_update_index_in_place(self):
+        """Test changed projects are re-read on their own, and unknown changes rebuild"""
+        index = get_recommendation_index()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.other.title = 'Weather Blog'
+            self.other.save()
+            created = Project.objects.create(
+                title='Weather Station', description='Sensors', difficulty='beginner', track='python'
+            )
+            self.games.delete()
+        with self.assertNumQueries(2):
+            self.assertIs(get_recommendation_index(), index)
+        self.assertEqual(
+            UserProfile.recommend_projects([], '', keywords=['weather']),
+            [self.other, self.weather, created]
+        )
+        self.assertEqual(UserProfile.recommend_projects(['python'], '', technologies=['Pygame']), [created])
+        
+        bump_catalog_version()
+        self.assertIsNot(get_recommendation_index(), index)
+    
+    def test_index_follows_changes_once_committed(self):
+        """Test a change only moves the catalog version on commit, so no worker indexes it early"""
+        get_recommendation_index()
+        version = get_catalog_version()
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                self.other.title = 'Weather Blog'
+                self.other.save()
+                # Other workers still see the old rows, and must not see a new version either
+                self.assertEqual(get_catalog_version(), version)
+        self.assertNotEqual(get_catalog_version(), version)
+        self.assertEqual(UserProfile.recommend_projects([], '', keywords=['weather'])[0], self.other)
+    
+    def test_home_uses_onboarding_preferences(self):
+        """Test home recommends from the technologies and keywords chosen in onboarding"""
+        UserProfile.objects.create(session_id='home-session')
+        session = self.client.session
+        session['session_id'] = 'home-session'
+        session.save()
+        self.client.post(reverse('projects:onboarding_technologies'), {'technologies': ['Python', 'Pygame']})
+        self.client.post(reverse('projects:onboarding_tracks'), {'tracks': ['frontend'], 'difficulty': 'beginner'})
+        self.client.post(reverse('projects:onboarding_interests'), {'interests': 'Games'})
+        response = self.client.get(reverse('projects:home'))
+        self.assertEqual(list(response.context['recommended_projects']), [self.games, self.weather])
 
 
 class ProjectOverviewViewTest(TestCase):
@@ -191,6 +524,85 @@ class ProjectOverviewViewTest(TestCase):
         self.assertEqual(response.status_code, 404)
 
 
+class SimilarProjectsTest(TestCase):
+    """Test precomputed "projects like this one" neighbours"""
+    
+    def setUp(self):
+        self.client = Client()
+        technologies = {
+            'Todo': ['HTML', 'CSS', 'JavaScript'],
+            'Notes': ['html', 'CSS', 'JavaScript'],
+            'Landing Page': ['HTML', 'CSS'],
+            'API': ['Python', 'Django'],
+            'Quiz': ['JavaScript', 'React', 'Redux', 'Jest'],
+        }
+        self.projects = {}
+        for title, names in technologies.items():
+            project = Project.objects.create(title=title, description='Test', difficulty='beginner', track='frontend')
+            ProjectStep.objects.create(
+                project=project,
+                step_number=1,
+                title='Step 1',
+                description='Description',
+                technologies=names,
+                estimated_time=60,
+                timeframe='6h'
+            )
+            self.projects[title] = project
+        generated = Project.objects.create(
+            title='Generated', description='Test', difficulty='beginner', track='frontend', is_generated=True
+        )
+        ProjectStep.objects.create(
+            project=generated, step_number=1, title='Step 1', description='Description',
+            technologies=['HTML', 'CSS', 'JavaScript'], estimated_time=60, timeframe='6h'
+        )
+    
+    def neighbours(self, metric='jaccard', k=3):
+        names = {project.id: title for title, project in self.projects.items()}
+        return {
+            names[project_id]: [(names[neighbour_id], round(score, 3)) for neighbour_id, score in ranked]
+            for project_id, ranked in compute_neighbours(load_technology_sets(), k, metric)
+        }
+    
+    def test_jaccard_neighbours(self):
+        """Test neighbours are ranked by Jaccard similarity, ties by id, and need a shared technology"""
+        neighbours = self.neighbours()
+        self.assertEqual(neighbours['Todo'], [('Notes', 1.0), ('Landing Page', 0.667), ('Quiz', 0.167)])
+        self.assertEqual(neighbours['Notes'], [('Todo', 1.0), ('Landing Page', 0.667), ('Quiz', 0.167)])
+        self.assertEqual(neighbours['Landing Page'], [('Todo', 0.667), ('Notes', 0.667)])
+        self.assertNotIn('API', neighbours)
+    
+    def test_cosine_neighbours(self):
+        """Test cosine similarity ranks the same candidates by a different score"""
+        neighbours = self.neighbours('cosine', k=2)
+        self.assertEqual(neighbours['Quiz'], [('Todo', 0.289), ('Notes', 0.289)])
+        self.assertEqual(neighbours['Landing Page'], [('Todo', 0.816), ('Notes', 0.816)])
+    
+    def test_default_neighbour_count_follows_setting(self):
+        """Test compute_neighbours keeps SIMILAR_PROJECTS neighbours unless told otherwise"""
+        with self.settings(SIMILAR_PROJECTS=2):
+            neighbours = dict(compute_neighbours(load_technology_sets()))
+        self.assertEqual(len(neighbours[self.projects['Todo'].id]), 2)
+    
+    def test_overview_reads_stored_neighbours(self):
+        """Test the command stores neighbours and the overview shows them with one extra query"""
+        call_command('rebuild_similar_projects', stdout=io.StringIO())
+        todo = self.projects['Todo']
+        self.assertEqual(ProjectNeighbour.objects.filter(project=todo).count(), 3)
+        with self.settings(SIMILAR_PROJECTS=2), self.assertNumQueries(2):
+            response = self.client.get(reverse('projects:project_overview', args=[todo.id]))
+        self.assertEqual(response.context['similar_projects'], [self.projects['Notes'], self.projects['Landing Page']])
+        self.assertContains(response, 'Projects Like This One')
+        
+        # Rebuilding replaces the rows; deleting a project drops the rows pointing at it
+        call_command('rebuild_similar_projects', '--top-k', '1', stdout=io.StringIO())
+        self.assertEqual(ProjectNeighbour.objects.filter(project=todo).count(), 1)
+        self.projects['Notes'].delete()
+        self.assertFalse(ProjectNeighbour.objects.filter(project=todo).exists())
+        response = self.client.get(reverse('projects:project_overview', args=[todo.id]))
+        self.assertNotContains(response, 'Projects Like This One')
+
+
 class StartProjectViewTest(TestCase):
     """Test start project view"""
     
@@ -332,12 +744,27 @@ class CompleteStepViewTest(TestCase):
         response = self.client.post(reverse('projects:complete_step', args=[self.session.id]))
         self.assertEqual(response.status_code, 200)
         
+        self.assertIn('timer_token', response.json())
+        
         # Check session was updated
         self.session.refresh_from_db()
         self.assertIn(1, self.session.completed_steps)
         self.assertEqual(self.session.current_step, 2)
         self.assertFalse(self.session.completed)
     
+    def test_complete_step_double_click(self):
+        """Test a repeated click for the same step does not skip the next one"""
+        url = reverse('projects:complete_step', args=[self.session.id])
+        self.client.post(url, {'step': 1})
+        response = self.client.post(url, {'step': 1})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['next_step'], 2)
+        
+        self.session.refresh_from_db()
+        self.assertEqual(self.session.current_step, 2)
+        self.assertEqual(self.session.completed_steps, [1])
+        self.assertFalse(self.session.completed)
+    
     def test_complete_final_step(self):
         """Test completing the final step"""
         self.session.current_step = 2
@@ -510,6 +937,41 @@ class TimerStatusViewTest(TestCase):
         self.assertGreater(data['remaining_seconds'], 0)
         self.assertFalse(data['is_expired'])
     
+    def test_timer_status_token(self):
+        """Test a valid timer token is answered without any queries"""
+        token = make_timer_token(self.session)
+        url = reverse('projects:timer_status', args=[self.session.id])
+        with self.assertNumQueries(0):
+            response = self.client.get(url, {'token': token})
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertGreater(data['remaining_seconds'], 0)
+        self.assertEqual(data['total_steps'], 1)
+        self.assertEqual(data['current_step'], 1)
+    
+    def test_timer_status_token_other_session(self):
+        """Test a token issued for another session is not accepted"""
+        token = make_timer_token(self.session)
+        session = self.client.session
+        session['session_id'] = 'wrong-session'
+        session.save()
+        response = self.client.get(
+            reverse('projects:timer_status', args=[self.session.id + 1]),
+            {'token': token}
+        )
+        self.assertEqual(response.status_code, 404)
+    
+    def test_timer_status_tampered_token(self):
+        """Test a tampered token falls back to the session check"""
+        session = self.client.session
+        session['session_id'] = 'wrong-session'
+        session.save()
+        response = self.client.get(
+            reverse('projects:timer_status', args=[self.session.id]),
+            {'token': make_timer_token(self.session) + 'x'}
+        )
+        self.assertEqual(response.status_code, 403)
+    
     def test_timer_status_invalid_session(self):
         """Test timer status with wrong session"""
         session = self.client.session
@@ -518,3 +980,1320 @@ class TimerStatusViewTest(TestCase):
         response = self.client.get(reverse('projects:timer_status', args=[self.session.id]))
         self.assertEqual(response.status_code, 403)
 
+
+class TimerEventsViewTest(TestCase):
+    """Test timer Server-Sent Events stream"""
+    
+    def setUp(self):
+        cache.clear()
+        self.project = Project.objects.create(
+            title='Test Project',
+            description='Test description',
+            difficulty='beginner',
+            track='web_dev'
+        )
+        for i in range(1, 3):
+            ProjectStep.objects.create(
+                project=self.project,
+                step_number=i,
+                title=f'Step {i}',
+                description='Description',
+                technologies=['HTML'],
+                estimated_time=60,
+                timeframe='6h'
+            )
+        self.session = UserSession.objects.create(
+            session_id='test-session',
+            project=self.project,
+            selected_timeframe='6h',
+            start_time=timezone.now(),
+            current_step=1
+        )
+        self.token = make_timer_token(self.session)
+        self.url = reverse('projects:timer_events', args=[self.session.id])
+    
+    def test_timer_events_disabled(self):
+        """Test stream is off unless enabled in settings"""
+        response = self.client.get(self.url, {'token': self.token})
+        self.assertEqual(response.status_code, 404)
+    
+    @override_settings(TIMER_EVENTS_ENABLED=True)
+    def test_timer_events_invalid_token(self):
+        """Test stream refuses a bad token"""
+        response = self.client.get(self.url, {'token': 'bad'})
+        self.assertEqual(response.status_code, 403)
+    
+    @override_settings(TIMER_EVENTS_ENABLED=True)
+    async def test_timer_events_stream(self):
+        """Test stream opens with a retry hint followed by a tick"""
+        response = await self.async_client.get(self.url, {'token': self.token})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        content = response.streaming_content
+        self.assertTrue((await anext(content)).startswith(b'retry:'))
+        self.assertTrue((await anext(content)).startswith(b'event: tick'))
+        await content.aclose()
+    
+    async def test_stream_step_event(self):
+        """Test progress published by complete_step reaches open streams"""
+        payload = read_timer_token(self.token, self.session.id)
+        events = stream_timer_events(self.session.id, payload, poll_seconds=0)
+        await anext(events)  # retry hint
+        self.assertTrue((await anext(events)).startswith('event: tick'))
+        
+        self.session.current_step = 2
+        self.session.completed_steps = [1]
+        publish_timer_token(self.session, make_timer_token(self.session))
+        self.assertTrue((await anext(events)).startswith('event: step'))
+        await events.aclose()
+    
+    async def test_stream_expired_event(self):
+        """Test stream ends with an expired event once time is up"""
+        self.session.start_time = timezone.now() - timedelta(hours=6, minutes=5)
+        payload = read_timer_token(make_timer_token(self.session), self.session.id)
+        events = [event async for event in stream_timer_events(self.session.id, payload)]
+        self.assertTrue(events[-1].startswith('event: expired'))
+
+
+class DownloadResourceViewTest(TestCase):
+    """Test resource downloads: validators, ranges, pre-compressed variants and offload"""
+    
+    def setUp(self):
+        self.files_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.files_dir)
+        self.enterContext(self.settings(RESOURCE_FILES_DIR=self.files_dir, RESOURCE_SENDFILE_BACKEND=''))
+        self.data = b'id,value\n' + b''.join(b'%d,%d\n' % (n, n * n) for n in range(1000))
+        with open(os.path.join(self.files_dir, 'data.csv'), 'wb') as f:
+            f.write(self.data)
+        project = Project.objects.create(title='Test', description='Test', track='python', difficulty='beginner')
+        self.resource = ProjectResource.objects.create(project=project, name='Data', file_path='data.csv')
+        self.url = reverse('projects:download_resource', args=[self.resource.id])
+    
+    def test_full_download(self):
+        """Test a plain download sends the file with validators"""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), self.data)
+        self.assertEqual(response['Content-Length'], str(len(self.data)))
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="data.csv"')
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertTrue(response.has_header('ETag'))
+        self.assertTrue(response.has_header('Last-Modified'))
+        self.assertIn('Accept-Encoding', response['Vary'])
+    
+    def test_not_modified(self):
+        """Test If-None-Match and If-Modified-Since answer 304 without a body"""
+        first = self.client.get(self.url)
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, 304)
+        response = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=first['Last-Modified'])
+        self.assertEqual(response.status_code, 304)
+        
+        # Changing the file changes the ETag
+        with open(os.path.join(self.files_dir, 'data.csv'), 'ab') as f:
+            f.write(b'1000,1000000\n')
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, 200)
+    
+    def test_range_requests(self):
+        """Test byte ranges are answered with 206 and the exact slice"""
+        size = len(self.data)
+        for header, start, end in [('bytes=0-99', 0, 100), ('bytes=100-', 100, size), ('bytes=-50', size - 50, size)]:
+            response = self.client.get(self.url, HTTP_RANGE=header)
+            self.assertEqual(response.status_code, 206)
+            self.assertEqual(b''.join(response.streaming_content), self.data[start:end])
+            self.assertEqual(response['Content-Length'], str(end - start))
+            self.assertEqual(response['Content-Range'], f'bytes {start}-{end - 1}/{size}')
+        
+        response = self.client.get(self.url, HTTP_RANGE=f'bytes={size}-')
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], f'bytes */{size}')
+        
+        # Multiple ranges are not supported - the whole file is sent instead
+        response = self.client.get(self.url, HTTP_RANGE='bytes=0-1,5-6')
+        self.assertEqual(response.status_code, 200)
+        
+        # A stale If-Range also gets the whole file
+        response = self.client.get(self.url, HTTP_RANGE='bytes=0-99', HTTP_IF_RANGE='"stale"')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), self.data)
+    
+    def test_precompressed_variants(self):
+        """Test .br/.gz siblings are negotiated by Accept-Encoding"""
+        with gzip.open(os.path.join(self.files_dir, 'data.csv.gz'), 'wb') as f:
+            f.write(self.data)
+        
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip, deflate')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(b''.join(response.streaming_content)), self.data)
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        gzip_etag = response['ETag']
+        
+        for accept in ('', 'br', 'gzip;q=0'):
+            response = self.client.get(self.url, HTTP_ACCEPT_ENCODING=accept)
+            self.assertFalse(response.has_header('Content-Encoding'))
+            self.assertNotEqual(response['ETag'], gzip_etag)
+            self.assertEqual(b''.join(response.streaming_content), self.data)
+    
+    def test_sendfile_offload(self):
+        """Test a front proxy gets the file location instead of the body"""
+        with self.settings(RESOURCE_SENDFILE_BACKEND='x-accel-redirect', RESOURCE_ACCEL_REDIRECT_PREFIX='/protected/'):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['X-Accel-Redirect'], '/protected/data.csv')
+        self.assertEqual(response.content, b'')
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="data.csv"')
+        
+        with self.settings(RESOURCE_SENDFILE_BACKEND='x-sendfile'):
+            response = self.client.get(self.url)
+        self.assertEqual(response['X-Sendfile'], os.path.join(os.path.realpath(self.files_dir), 'data.csv'))
+    
+    def test_missing_and_escaping_files(self):
+        """Test missing files and paths outside the resource directory are 404s"""
+        self.resource.file_path = 'missing.csv'
+        self.resource.save()
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+        
+        self.resource.file_path = '../' + os.path.basename(self.files_dir) + '/../secret.csv'
+        self.resource.save()
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+
+
+class ResourceBundleViewTest(TestCase):
+    """Test the per-project ZIP of all resources"""
+    
+    def setUp(self):
+        self.files_dir = tempfile.mkdtemp()
+        self.bundle_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.files_dir)
+        self.addCleanup(shutil.rmtree, self.bundle_dir)
+        self.enterContext(self.settings(RESOURCE_FILES_DIR=self.files_dir, RESOURCE_BUNDLE_DIR=self.bundle_dir))
+        self.files = {
+            'sales.csv': b'region,amount\n' + b'north,100\n' * 5000,
+            'archive.gz': gzip.compress(b'x' * 10000),
+        }
+        for name, data in self.files.items():
+            with open(os.path.join(self.files_dir, name), 'wb') as f:
+                f.write(data)
+        self.project = Project.objects.create(
+            title='Sales Dashboard', description='Test', track='python', difficulty='beginner'
+        )
+        for order, name in enumerate(self.files):
+            ProjectResource.objects.create(project=self.project, name=name, file_path=name, order=order)
+        self.url = reverse('projects:download_resource_bundle', args=[self.project.id])
+    
+    def download(self, **headers):
+        response = self.client.get(self.url, **headers)
+        return response, b''.join(response.streaming_content)
+    
+    def test_streams_then_serves_from_disk(self):
+        """Test the first download is streamed and cached, later ones are served as a file"""
+        response, body = self.download()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="sales-dashboard-resources.zip"')
+        self.assertFalse(response.has_header('Content-Length'))
+        
+        with zipfile.ZipFile(io.BytesIO(body)) as archive:
+            self.assertEqual(archive.namelist(), ['sales.csv', 'archive.gz'])
+            for name, data in self.files.items():
+                self.assertEqual(archive.read(name), data)
+            # Already-compressed files are stored, others deflated
+            self.assertEqual(archive.getinfo('archive.gz').compress_type, zipfile.ZIP_STORED)
+            self.assertEqual(archive.getinfo('sales.csv').compress_type, zipfile.ZIP_DEFLATED)
+        self.assertEqual(len(os.listdir(self.bundle_dir)), 1)
+        
+        cached, cached_body = self.download()
+        self.assertEqual(cached_body, body)
+        self.assertEqual(cached['Content-Length'], str(len(body)))
+        self.assertTrue(cached.has_header('ETag'))
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=cached['ETag']).status_code, 304)
+    
+    def test_rebuilt_when_a_file_changes(self):
+        """Test changing a file's content leads to a new bundle"""
+        self.download()
+        with open(os.path.join(self.files_dir, 'sales.csv'), 'ab') as f:
+            f.write(b'south,200\n')
+        _, body = self.download()
+        with zipfile.ZipFile(io.BytesIO(body)) as archive:
+            self.assertTrue(archive.read('sales.csv').endswith(b'south,200\n'))
+        self.assertEqual(len(os.listdir(self.bundle_dir)), 2)
+    
+    def test_aborted_download_leaves_no_bundle(self):
+        """Test a download closed before the end does not cache a truncated archive"""
+        response = self.client.get(self.url)
+        next(iter(response.streaming_content))
+        response.close()
+        self.assertEqual(os.listdir(self.bundle_dir), [])
+    
+    def test_no_resources(self):
+        """Test projects without resources or files are 404s"""
+        other = Project.objects.create(title='Empty', description='Test', track='python', difficulty='beginner')
+        self.assertEqual(self.client.get(reverse('projects:download_resource_bundle', args=[other.id])).status_code, 404)
+        for name in self.files:
+            os.remove(os.path.join(self.files_dir, name))
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+
+
+class ResourceStatsTest(TestCase):
+    """Test file sizes, CSV column stats and the preview endpoint"""
+    
+    CSV = (
+        'id,price,joined,city,active,notes\n'
+        '1,9.5,2024-01-05,Berlin,yes,\n'
+        '2,12,2024-03-01,Austin,no,NA\n'
+        '3,,2023-12-31,Zurich,yes,"quoted, with comma"\n'
+        '4,7.25,N/A,Oslo,no\n'
+    )
+    
+    def setUp(self):
+        self.files_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.files_dir)
+        self.enterContext(self.settings(RESOURCE_FILES_DIR=self.files_dir))
+        self.path = os.path.join(self.files_dir, 'data.csv')
+        with open(self.path, 'w') as f:
+            f.write(self.CSV)
+        self.project = Project.objects.create(title='Test', description='Test', track='python', difficulty='beginner')
+        self.resource = ProjectResource.objects.create(project=self.project, name='Data', file_path='data.csv')
+    
+    def test_stats_computed_on_save(self):
+        """Test registering a resource fills in file_size and per-column stats"""
+        self.resource.refresh_from_db()
+        self.assertEqual(self.resource.file_size, f'{len(self.CSV)} bytes')
+        stats = self.resource.stats
+        self.assertEqual(stats['rows'], 4)
+        columns = {column['name']: column for column in stats['columns']}
+        self.assertEqual(columns['id'], {'name': 'id', 'dtype': 'integer', 'nulls': 0, 'min': 1, 'max': 4})
+        # Integers and floats widen to float; empty cells are nulls
+        self.assertEqual(columns['price'], {'name': 'price', 'dtype': 'float', 'nulls': 1, 'min': 7.25, 'max': 12})
+        self.assertEqual(columns['joined']['dtype'], 'date')
+        self.assertEqual((columns['joined']['min'], columns['joined']['max']), ('2023-12-31', '2024-03-01'))
+        self.assertEqual(columns['joined']['nulls'], 1)
+        self.assertEqual(columns['city']['dtype'], 'string')
+        self.assertEqual(columns['active']['dtype'], 'boolean')
+        # The short last row counts its missing cell as null
+        self.assertEqual(columns['notes']['nulls'], 3)
+    
+    def test_stats_only_recomputed_when_file_changes(self):
+        """Test saving again reuses the stats until the file changes"""
+        # A marker the file scan would overwrite
+        self.resource.stats['rows'] = 99
+        self.resource.save()
+        self.resource.refresh_from_db()
+        self.assertEqual(self.resource.stats['rows'], 99)
+        
+        with open(self.path, 'a') as f:
+            f.write('5,1.5,2024-05-05,Lima,yes,\n')
+        call_command('refresh_resource_stats', stdout=io.StringIO())
+        self.resource.refresh_from_db()
+        self.assertEqual(self.resource.stats['rows'], 5)
+    
+    def test_loader_refreshes_changed_files(self):
+        """Test reloading an unchanged catalog still picks up a changed resource file"""
+        catalog = os.path.join(self.files_dir, 'catalog.json')
+        with open(catalog, 'w') as f:
+            json.dump({'projects': [{
+                'title': 'Catalog', 'description': 'Test', 'track': 'python', 'difficulty': 'beginner',
+                'resources': [{'name': 'Data', 'file_path': 'data.csv'}],
+            }]}, f)
+        load_catalog(catalog)
+        resource = ProjectResource.objects.get(project__title='Catalog')
+        self.assertEqual(resource.stats['rows'], 4)
+        self.assertTrue(load_catalog(catalog).is_empty())
+        
+        with open(self.path, 'a') as f:
+            f.write('5,1.5,2024-05-05,Lima,yes,\n')
+        self.assertEqual(load_catalog(catalog).summary()['resources'], (0, 1, 0))
+        resource.refresh_from_db()
+        self.assertEqual(resource.stats['rows'], 5)
+    
+    def test_preview(self):
+        """Test the preview shows the header, the first rows and the stored stats"""
+        url = reverse('projects:preview_resource', args=[self.resource.id])
+        response = self.client.get(url, {'rows': 2})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['header'], ['id', 'price', 'joined', 'city', 'active', 'notes'])
+        self.assertEqual([row[3] for row in response.context['rows']], ['Berlin', 'Austin'])
+        self.assertTrue(response.context['truncated'])
+        self.assertContains(response, '4 rows')
+        
+        response = self.client.get(url)
+        self.assertEqual(len(response.context['rows']), 4)
+        self.assertFalse(response.context['truncated'])
+        self.assertContains(response, 'quoted, with comma')
+    
+    def test_oversized_line_is_not_read_whole(self):
+        """Test a huge file without newlines is previewed and scanned in bounded memory"""
+        path = os.path.join(self.files_dir, 'huge.csv')
+        with open(path, 'w') as f:
+            f.write('id,notes\n')
+            for _ in range(16):
+                f.write('x' * 2 ** 20)
+        
+        tracemalloc.start()
+        try:
+            preview = read_preview(path, 10)
+            resource = ProjectResource.objects.create(project=self.project, name='Huge', file_path='huge.csv')
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        self.assertEqual(preview, {'header': ['id', 'notes'], 'rows': [], 'truncated': True})
+        self.assertIn('line longer than', resource.stats['error'])
+        self.assertLess(peak, 8 * 2 ** 20)
+    
+    def test_preview_only_for_existing_csv_files(self):
+        """Test non-CSV resources and missing files have no preview"""
+        other = ProjectResource.objects.create(
+            project=self.project, name='Archive', file_path='data.zip', resource_type='zip'
+        )
+        self.assertEqual(other.file_size, '')
+        self.assertEqual(self.client.get(reverse('projects:preview_resource', args=[other.id])).status_code, 404)
+        
+        os.remove(self.path)
+        url = reverse('projects:preview_resource', args=[self.resource.id])
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+
+class ProjectGeneratorTest(TestCase):
+    """Test project generator"""
+    
+    def test_generate_project(self):
+        """Test project and steps are written in a few statements"""
+        with self.assertNumQueries(5):  # lookup, savepoint, project, bulk steps, release
+            project = ProjectGenerator().generate_project(
+                track='frontend',
+                difficulty='advanced',
+                timeframe='48h',
+                keywords=['Weather']
+            )
+        self.assertTrue(project.is_generated)
+        self.assertIn('Weather', project.title)
+        self.assertEqual(project.steps.filter(timeframe='48h').count(), 11)
+        self.assertEqual(project.get_step_count('48h'), 11)
+        
+        project.refresh_from_db()
+        self.assertEqual(project.get_total_minutes('48h'), sum(project.steps.values_list('estimated_time', flat=True)))
+    
+    def test_generated_project_offers_only_its_timeframe(self):
+        """Test a generated 6h project lists only 6h, not longer timeframes with the 6h plan"""
+        project = ProjectGenerator().generate_project(track='python', difficulty='beginner', timeframe='6h')
+        self.assertEqual(list(project.step_stats), ['6h'])
+        project.refresh_from_db()
+        self.assertEqual(project.get_available_timeframes(), ['6h'])
+        response = self.client.get(reverse('projects:project_overview', args=[project.id]))
+        self.assertEqual([code for code, _ in response.context['timeframes']], ['6h'])
+    
+    def test_generate_project_reused(self):
+        """Test identical inputs reuse the same generated project"""
+        generator = ProjectGenerator()
+        project = generator.generate_project(
+            track='python',
+            difficulty='beginner',
+            timeframe='6h',
+            keywords=['Music', 'Sports']
+        )
+        with self.assertNumQueries(1):
+            again = generator.generate_project(
+                track='python',
+                difficulty='beginner',
+                timeframe='6h',
+                keywords=['Sports', 'Music']
+            )
+        self.assertEqual(again.pk, project.pk)
+        self.assertEqual(Project.objects.filter(is_generated=True).count(), 1)
+        
+        other = generator.generate_project(track='python', difficulty='beginner', timeframe='12h')
+        self.assertNotEqual(other.pk, project.pk)
+    
+    def test_step_plans_precompiled(self):
+        """Test base step plans are built once and immutable"""
+        generator = ProjectGenerator()
+        plan = generator._get_base_steps('backend', 'beginner')
+        self.assertIs(plan, generator._get_base_steps('backend', 'beginner'))
+        with self.assertRaises(TypeError):
+            plan[0]['title'] = 'Changed'
+
+
+class RetentionTest(TestCase):
+    """Test retention purge of stale rows"""
+    
+    def setUp(self):
+        old = timezone.now() - timedelta(days=365)
+        self.project = Project.objects.create(
+            title='Test Project',
+            description='Test description',
+            difficulty='beginner',
+            track='python'
+        )
+        # Generated projects: one old and never started, one old but started, one new
+        self.orphan = Project.objects.create(title='Orphan', description='', difficulty='beginner', track='python', is_generated=True)
+        self.started = Project.objects.create(title='Started', description='', difficulty='beginner', track='python', is_generated=True)
+        self.fresh = Project.objects.create(title='Fresh', description='', difficulty='beginner', track='python', is_generated=True)
+        Project.objects.filter(pk__in=[self.orphan.pk, self.started.pk]).update(created_at=old)
+        UserSession.objects.create(session_id='a', project=self.started, selected_timeframe='6h', completed=True)
+        
+        self.abandoned = UserSession.objects.create(session_id='b', project=self.project, selected_timeframe='6h', start_time=old)
+        self.active = UserSession.objects.create(session_id='c', project=self.project, selected_timeframe='6h')
+        
+        UserProfile.objects.create(session_id='old')
+        UserProfile.objects.create(session_id='new')
+        UserProfile.objects.filter(session_id='old').update(updated_at=old)
+    
+    def test_purge_generated_projects(self):
+        """Test only unstarted old generated projects are deleted"""
+        self.assertEqual(purge('generated_projects', dry_run=True)['rows'], 1)
+        self.assertEqual(purge('generated_projects', batch_size=1)['rows'], 1)
+        remaining = set(Project.objects.values_list('title', flat=True))
+        self.assertEqual(remaining, {'Test Project', 'Started', 'Fresh'})
+    
+    def test_purge_sessions_and_profiles(self):
+        """Test abandoned sessions and stale profiles are deleted"""
+        self.assertEqual(purge('abandoned_sessions')['rows'], 1)
+        self.assertFalse(UserSession.objects.filter(pk=self.abandoned.pk).exists())
+        self.assertTrue(UserSession.objects.filter(pk=self.active.pk).exists())
+        
+        self.assertEqual(purge('profiles')['rows'], 1)
+        self.assertEqual(list(UserProfile.objects.values_list('session_id', flat=True)), ['new'])
+    
+    def test_purge_archive(self):
+        """Test deleted rows are archived as gzipped JSONL"""
+        with tempfile.TemporaryDirectory() as archive_dir:
+            result = purge('abandoned_sessions', archive_dir=archive_dir)
+            with gzip.open(result['archive'], 'rt') as archive:
+                rows = [json.loads(line) for line in archive]
+        self.assertEqual([(row['model'], row['pk']) for row in rows], [('projects.usersession', self.abandoned.pk)])
+    
+    def test_runner_only_in_server_processes(self):
+        """Test the background runner is only started by known web servers"""
+        self.assertTrue(is_server_process(['/usr/bin/gunicorn', 'projecthack.wsgi'], {}))
+        self.assertTrue(is_server_process(['/venv/lib/python3.11/site-packages/uvicorn/__main__.py', 'projecthack.asgi:application'], {}))
+        self.assertTrue(is_server_process(['/venv/lib/python3.11/site-packages/django/__main__.py', 'runserver', '--noreload'], {}))
+        self.assertFalse(is_server_process(['/venv/bin/pytest'], {}))
+        self.assertFalse(is_server_process(['/venv/bin/celery', '-A', 'projecthack', 'worker'], {}))
+        self.assertFalse(is_server_process(['/venv/lib/python3.11/site-packages/ipykernel_launcher.py', '-f', 'kernel.json'], {}))
+        self.assertFalse(is_server_process(['script.py'], {}))
+        self.assertFalse(is_server_process([], {}))
+        self.assertFalse(is_server_process(['manage.py', 'migrate'], {}))
+        self.assertFalse(is_server_process(['manage.py', 'test', 'projects'], {}))
+        self.assertFalse(is_server_process(['/venv/bin/django-admin', 'shell'], {}))
+        self.assertFalse(is_server_process(['manage.py', 'runserver'], {}))
+        self.assertTrue(is_server_process(['manage.py', 'runserver'], {'RUN_MAIN': 'true'}))
+        self.assertTrue(is_server_process(['manage.py', 'runserver', '--noreload'], {}))
+    
+    def test_purge_archive_includes_cascade(self):
+        """Test rows deleted by cascade are archived along with the policy's rows"""
+        step = ProjectStep.objects.create(
+            project=self.orphan, step_number=1, title='Step 1', description='Description',
+            technologies=['Python'], estimated_time=60, timeframe='6h'
+        )
+        with tempfile.TemporaryDirectory() as archive_dir:
+            result = purge('generated_projects', archive_dir=archive_dir)
+            with gzip.open(result['archive'], 'rt') as archive:
+                rows = [json.loads(line) for line in archive]
+        archived = {(row['model'], row['pk']) for row in rows}
+        self.assertEqual(archived, {('projects.project', self.orphan.pk), ('projects.projectstep', step.pk)})
+        self.assertEqual(next(row for row in rows if row['model'] == 'projects.projectstep')['fields']['title'], 'Step 1')
+        self.assertFalse(ProjectStep.objects.filter(pk=step.pk).exists())
+
+
+class QueryPlanTest(TestCase):
+    """
+    Test every view's queries are served by an index, without full scans or sorts
+    
+    The seed is small by default; set QUERY_PLAN_PROJECTS / QUERY_PLAN_SESSIONS
+    (e.g. 100000 / 1000000) to check the plans against a production-sized table.
+    """
+    
+    @classmethod
+    def setUpTestData(cls):
+        project_count = int(os.environ.get('QUERY_PLAN_PROJECTS', 2000))
+        session_count = int(os.environ.get('QUERY_PLAN_SESSIONS', 20000))
+        tracks = [code for code, _ in Project.TRACK_CHOICES]
+        difficulties = [code for code, _ in Project.DIFFICULTY_CHOICES]
+        
+        Project.objects.bulk_create([
+            Project(
+                title=f'Project {i}',
+                description='Seeded',
+                track=tracks[i % len(tracks)],
+                difficulty=difficulties[i % len(difficulties)],
+                is_generated=i % 2 == 1,
+                step_stats={'6h': {'steps': 3, 'minutes': 90}},
+            )
+            for i in range(project_count)
+        ], batch_size=5000)
+        project_ids = list(Project.objects.order_by('id').values_list('id', flat=True))
+        ProjectStep.objects.bulk_create([
+            ProjectStep(
+                project_id=project_id,
+                timeframe='6h',
+                step_number=n,
+                title=f'Step {n}',
+                description='Seeded',
+                estimated_time=30,
+                technologies=['Python'],
+            )
+            for project_id in project_ids[:200]
+            for n in range(1, 4)
+        ])
+        UserSession.objects.bulk_create([
+            UserSession(
+                session_id=f'seed-{i % (session_count // 4 or 1)}',
+                project_id=project_ids[i % len(project_ids)],
+                selected_timeframe='6h',
+                completed=True,
+            )
+            for i in range(session_count)
+        ], batch_size=5000)
+        UserProfile.objects.bulk_create([
+            UserProfile(session_id=f'seed-{i}', onboarding_completed=True)
+            for i in range(session_count // 4)
+        ], batch_size=5000)
+        
+        cls.project = Project.objects.get(id=project_ids[0])
+        UserProfile.objects.create(
+            session_id='plan-session',
+            onboarding_completed=True,
+            preferred_tracks=[cls.project.track, tracks[1]],
+            preferred_difficulty=cls.project.difficulty,
+        )
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+    
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        session = self.client.session
+        session['session_id'] = 'plan-session'
+        session.save()
+    
+    def assertIndexedPlans(self, queries):
+        """Fail if any SELECT/UPDATE/DELETE scans a whole table or sorts in a temp B-tree"""
+        for query in queries:
+            sql = query['sql']
+            if not re.match(r'\s*(SELECT|UPDATE|DELETE)\b', sql, re.IGNORECASE):
+                continue
+            with connection.cursor() as cursor:
+                if connection.vendor == 'postgresql':
+                    cursor.execute(f'EXPLAIN {sql}')
+                    plan = '\n'.join(row[0] for row in cursor.fetchall())
+                    bad = re.search(r'Seq Scan|Sort', plan)
+                else:
+                    cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+                    plan = '\n'.join(row[-1] for row in cursor.fetchall())
+                    bad = re.search(r'SCAN (?!.*USING (COVERING )?INDEX)|USE TEMP B-TREE', plan)
+            self.assertIsNone(bad, f'Unindexed plan for:\n{sql}\n{plan}')
+    
+    def run_view(self, method, url, data=None):
+        with CaptureQueriesContext(connection) as queries:
+            response = getattr(self.client, method)(url, data)
+        self.assertLess(response.status_code, 400)
+        self.assertIndexedPlans(queries.captured_queries)
+        return response
+    
+    def test_catalog_plans(self):
+        """Test home, project overview and onboarding recommendations use indexes"""
+        self.run_view('get', reverse('projects:home'))
+        self.run_view('get', reverse('projects:project_overview', args=[self.project.id]))
+        self.run_view('get', reverse('projects:onboarding_complete'))
+    
+    def test_session_plans(self):
+        """Test the start, step, complete, timer and summary flow uses indexes"""
+        self.run_view('post', reverse('projects:start_project', args=[self.project.id]), {'timeframe': '6h'})
+        user_session = UserSession.objects.get(session_id='plan-session')
+        self.run_view('get', reverse('projects:project_step', args=[user_session.id]))
+        self.run_view('post', reverse('projects:complete_step', args=[user_session.id]), {'step': 1})
+        self.run_view('get', reverse('projects:timer_status', args=[user_session.id]))
+        self.run_view('get', reverse('projects:project_summary', args=[user_session.id]))
+
+
+VIEW_BUDGETS_PATH = os.path.join(os.path.dirname(__file__), 'view_budgets.json')
+
+
+class ViewBudgetTest(TestCase):
+    """
+    Test every URL stays within its query count and latency budget
+    
+    Budgets live in view_budgets.json. A view fails when a measurement exceeds
+    its budget by more than the file's margin; VIEW_BUDGET_MARGIN overrides the
+    timing margin (e.g. for slow CI machines). Run with VIEW_BUDGET_RECORD=1 to
+    rewrite the budgets from the current measurements.
+    """
+    
+    RUNS = 3
+    
+    @classmethod
+    def setUpTestData(cls):
+        tracks = [code for code, _ in Project.TRACK_CHOICES]
+        difficulties = [code for code, _ in Project.DIFFICULTY_CHOICES]
+        timeframes = {'6h': 6, '12h': 8, '24h': 12, '48h': 16}
+        
+        def tier(n):
+            return next(timeframe for timeframe, count in timeframes.items() if n <= count)
+        
+        # Four pre-made projects per track/difficulty, each with steps for every timeframe
+        Project.objects.bulk_create([
+            Project(title=f'{track} {difficulty} {i}', description='Seeded', track=track, difficulty=difficulty)
+            for track in tracks
+            for difficulty in difficulties
+            for i in range(4)
+        ])
+        project_ids = list(Project.objects.order_by('id').values_list('id', flat=True))
+        ProjectStep.objects.bulk_create([
+            ProjectStep(
+                project_id=project_id,
+                timeframe=tier(n),
+                step_number=n,
+                title=f'Step {n}',
+                description='Seeded',
+                technologies=['Python', f'Tool {n}'],
+                estimated_time=30,
+            )
+            for project_id in project_ids
+            for n in range(1, timeframes['48h'] + 1)
+        ])
+        Project.rebuild_step_stats(project_ids)
+        store_neighbours(compute_neighbours(load_technology_sets()))
+        ProjectResource.objects.bulk_create([
+            ProjectResource(project_id=project_id, name=f'Data {n}', file_path='sales_data.csv', order=n)
+            for project_id in project_ids
+            for n in range(2)
+        ])
+        
+        # Other users' sessions and profiles
+        UserSession.objects.bulk_create([
+            UserSession(
+                session_id=f'other-{i % 500}',
+                project_id=project_ids[i % len(project_ids)],
+                selected_timeframe='6h',
+                completed=True,
+            )
+            for i in range(2000)
+        ])
+        UserProfile.objects.bulk_create([
+            UserProfile(session_id=f'other-{i}', onboarding_completed=True) for i in range(500)
+        ])
+        
+        cls.project = Project.objects.get(id=project_ids[0])
+        cls.resource = cls.project.resources.first()
+        UserProfile.objects.create(
+            session_id='budget-session',
+            experience_level='beginner',
+            preferred_tracks=[cls.project.track],
+            preferred_difficulty=cls.project.difficulty,
+            onboarding_completed=True,
+        )
+        cls.user_session = UserSession.objects.create(
+            session_id='budget-session',
+            project=cls.project,
+            selected_timeframe='12h',
+            current_step=3,
+            completed_steps=[1, 2],
+        )
+        
+        with open(VIEW_BUDGETS_PATH) as budgets:
+            cls.budgets = json.load(budgets)
+    
+    def setUp(self):
+        bundle_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, bundle_dir)
+        self.enterContext(self.settings(RESOURCE_BUNDLE_DIR=bundle_dir))
+        self.client = Client()
+        session = self.client.session
+        session['session_id'] = 'budget-session'
+        session.save()
+        # Budgets are for a returning visitor whose session already holds the onboarding state
+        self.client.get(reverse('projects:home'))
+    
+    def scenarios(self):
+        """URL name -> (method, url, data) for one representative request"""
+        project_id = self.project.id
+        session_id = self.user_session.id
+        return {
+            'home': ('get', reverse('projects:home'), None),
+            'generate_project': ('post', reverse('projects:generate_project'), {
+                'track': 'python', 'difficulty': 'beginner', 'timeframe': '48h', 'keywords': 'Budget',
+            }),
+            'project_overview': ('get', reverse('projects:project_overview', args=[project_id]), None),
+            'start_project': ('post', reverse('projects:start_project', args=[project_id]), {'timeframe': '6h'}),
+            'project_step': ('get', reverse('projects:project_step', args=[session_id]), None),
+            'complete_step': ('post', reverse('projects:complete_step', args=[session_id]), {'step': 3}),
+            'project_summary': ('get', reverse('projects:project_summary', args=[session_id]), None),
+            'submit_project': ('post', reverse('projects:submit_project', args=[session_id]), {
+                'github_repo': 'https://github.com/example/project',
+            }),
+            'timer_status': ('get', reverse('projects:timer_status', args=[session_id]), None),
+            'timer_events': ('get', reverse('projects:timer_events', args=[session_id]), {
+                'token': make_timer_token(self.user_session),
+            }),
+            'download_resource': ('get', reverse('projects:download_resource', args=[self.resource.id]), None),
+            'preview_resource': ('get', reverse('projects:preview_resource', args=[self.resource.id]), None),
+            'download_resource_bundle': ('get', reverse('projects:download_resource_bundle', args=[project_id]), None),
+            'metrics': ('get', reverse('projects:metrics'), None),
+            'onboarding_start': ('get', reverse('projects:onboarding_start'), None),
+            'onboarding_technologies': ('get', reverse('projects:onboarding_technologies'), None),
+            'onboarding_tracks': ('get', reverse('projects:onboarding_tracks'), None),
+            'onboarding_interests': ('get', reverse('projects:onboarding_interests'), None),
+            'onboarding_complete': ('get', reverse('projects:onboarding_complete'), None),
+        }
+    
+    def measure(self, method, url, data):
+        """Best of RUNS requests; each runs cold (empty cache) and is rolled back"""
+        best = None
+        for _ in range(self.RUNS):
+            cache.clear()
+            with transaction.atomic():
+                with CaptureQueriesContext(connection) as queries:
+                    started = time.perf_counter()
+                    response = getattr(self.client, method)(url, data)
+                    wall = time.perf_counter() - started
+                response.close()
+                transaction.set_rollback(True)
+            self.assertLess(response.status_code, 400, url)
+            result = {
+                'queries': len(queries),
+                'sql_ms': sum(float(query['time']) for query in queries.captured_queries) * 1000,
+                'wall_ms': wall * 1000,
+            }
+            if best is None:
+                best = result
+            else:
+                best = {key: min(best[key], result[key]) for key in best}
+        return best
+    
+    @override_settings(TIMER_EVENTS_ENABLED=True)
+    def test_view_budgets(self):
+        """Test each view's queries, SQL time and wall time against its budget"""
+        scenarios = self.scenarios()
+        url_names = {
+            pattern.name for pattern in get_resolver('projects.urls').url_patterns if pattern.name
+        }
+        self.assertEqual(set(scenarios), url_names, 'Every URL in projects/urls.py needs a budget scenario')
+        
+        measurements = {name: self.measure(*scenario) for name, scenario in scenarios.items()}
+        
+        if os.environ.get('VIEW_BUDGET_RECORD'):
+            # Exact query counts; timings rounded up to the next 5ms so tiny views are not flaky
+            self.budgets['views'] = {
+                name: {
+                    'queries': result['queries'],
+                    'sql_ms': max(5, math.ceil(result['sql_ms'] / 5) * 5),
+                    'wall_ms': max(5, math.ceil(result['wall_ms'] / 5) * 5),
+                }
+                for name, result in measurements.items()
+            }
+            with open(VIEW_BUDGETS_PATH, 'w') as budgets:
+                json.dump(self.budgets, budgets, indent=2)
+                budgets.write('\n')
+            return
+        
+        margins = dict(self.budgets['margin'])
+        if os.environ.get('VIEW_BUDGET_MARGIN'):
+            margins['sql_ms'] = margins['wall_ms'] = float(os.environ['VIEW_BUDGET_MARGIN'])
+        
+        for name, result in measurements.items():
+            budget = self.budgets['views'][name]
+            for key, value in result.items():
+                with self.subTest(view=name, metric=key):
+                    limit = budget[key] * (1 + margins[key])
+                    self.assertLessEqual(
+                        value, limit,
+                        f'{name} {key} = {value:.1f}, budget {budget[key]} (+{margins[key]:.0%})'
+                    )
+
+
+class RequestTimingMiddlewareTest(TestCase):
+    """Test request timing middleware"""
+    
+    def setUp(self):
+        cache.clear()
+        Project.objects.create(title='Test Project', description='Test', difficulty='beginner', track='python')
+        UserProfile.objects.create(session_id='test-session', experience_level='beginner', onboarding_completed=True)
+        session = self.client.session
+        session['session_id'] = 'test-session'
+        session.save()
+    
+    @override_settings(REQUEST_TIMING_SAMPLE_RATE=1.0)
+    def test_sampled_request(self):
+        """Test sampled requests get a Server-Timing header and a JSON log line"""
+        with self.assertLogs('projects.timing', level='INFO') as logs:
+            response = self.client.get(reverse('projects:home'))
+        timing = response['Server-Timing']
+        for metric in ('db;dur=', 'session;dur=', 'tpl;dur=', 'total;dur='):
+            self.assertIn(metric, timing)
+        
+        line = json.loads(logs.records[0].getMessage())
+        self.assertEqual(line['view'], 'projects:home')
+        self.assertEqual(line['status'], 200)
+        self.assertGreater(line['queries'], 0)
+        self.assertGreater(line['template_ms'], 0)
+        self.assertGreaterEqual(line['total_ms'], line['db_ms'])
+    
+    @override_settings(REQUEST_TIMING_SAMPLE_RATE=0)
+    def test_unsampled_request(self):
+        """Test requests outside the sample are left alone"""
+        response = self.client.get(reverse('projects:home'))
+        self.assertFalse(response.has_header('Server-Timing'))
+
+
+def _record_in_child():
+    metrics.inc('projecthack_resource_downloads_total', {'resource_type': 'csv'}, amount=2)
+    metrics.inc('projecthack_requests_in_flight')
+
+
+class MetricsTest(TestCase):
+    """Test metrics collection and the /metrics endpoint"""
+    
+    def setUp(self):
+        cache.clear()
+        metrics._store = None
+        self.addCleanup(setattr, metrics, '_store', None)
+        UserProfile.objects.create(session_id='test-session', experience_level='beginner', onboarding_completed=True)
+        session = self.client.session
+        session['session_id'] = 'test-session'
+        session.save()
+    
+    def test_request_metrics(self):
+        """Test requests are counted per URL name with latency and query histograms"""
+        self.client.get(reverse('projects:home'))
+        self.client.get(reverse('projects:home'))
+        body = self.client.get(reverse('projects:metrics')).content.decode()
+        
+        self.assertIn('projecthack_requests_total{method="GET",status="200",view="projects:home"} 2', body)
+        self.assertIn('projecthack_request_duration_seconds_count{view="projects:home"} 2', body)
+        self.assertIn('projecthack_request_db_queries_bucket{view="projects:home",le="+Inf"} 2', body)
+        self.assertIn('projecthack_cache_requests_total{cache="catalog",result="hit"} 1', body)
+        self.assertIn('projecthack_cache_requests_total{cache="catalog",result="miss"} 1', body)
+        # The scrape itself is in flight while rendering
+        self.assertIn('projecthack_requests_in_flight 1', body)
+    
+    def test_histogram_buckets_are_cumulative(self):
+        """Test bucket counts include every smaller bucket"""
+        for queries in (0, 2, 100):
+            metrics.observe('projecthack_request_db_queries', queries, {'view': 'projects:home'})
+        body = metrics.render()
+        self.assertIn('projecthack_request_db_queries_bucket{view="projects:home",le="0"} 1', body)
+        self.assertIn('projecthack_request_db_queries_bucket{view="projects:home",le="2"} 2', body)
+        self.assertIn('projecthack_request_db_queries_bucket{view="projects:home",le="89"} 2', body)
+        self.assertIn('projecthack_request_db_queries_bucket{view="projects:home",le="+Inf"} 3', body)
+        self.assertIn('projecthack_request_db_queries_sum{view="projects:home"} 102', body)
+    
+    def test_unknown_methods_share_one_label(self):
+        """Test methods outside the standard set are all labelled as other"""
+        self.client.generic('BREW', reverse('projects:home'))
+        body = self.client.get(reverse('projects:metrics')).content.decode()
+        self.assertIn('method="other"', body)
+        self.assertNotIn('BREW', body)
+    
+    def test_large_values_keep_full_precision(self):
+        """Test rendered values are not rounded to 6 significant digits"""
+        metrics.observe('projecthack_request_db_queries', 12345678, {'view': 'projects:home'})
+        metrics.observe('projecthack_request_db_queries', 0.5, {'view': 'projects:home'})
+        body = metrics.render()
+        self.assertIn('projecthack_request_db_queries_sum{view="projects:home"} 12345678.5', body)
+    
+    def test_empty_metrics_file_gets_a_header(self):
+        """Test a worker file left empty (e.g. by a crash) is initialised like a new one"""
+        with tempfile.TemporaryDirectory() as metrics_dir:
+            open(os.path.join(metrics_dir, f'metrics-{os.getpid()}.db'), 'wb').close()
+            store = metrics.MmapStore(metrics_dir)
+            store.add('projecthack_requests_in_flight', 1)
+            self.assertEqual(list(metrics.MmapStore(metrics_dir).positions), ['projecthack_requests_in_flight'])
+    
+    def test_merge_across_processes(self):
+        """Test samples from every worker file are summed; dead workers' gauges are dropped"""
+        with tempfile.TemporaryDirectory() as metrics_dir, self.settings(METRICS_DIR=metrics_dir):
+            metrics.inc('projecthack_resource_downloads_total', {'resource_type': 'csv'})
+            metrics.inc('projecthack_requests_in_flight')
+            child = multiprocessing.get_context('fork').Process(target=_record_in_child)
+            child.start()
+            child.join()
+            body = metrics.render()
+            metrics._store = None
+        
+        self.assertIn('projecthack_resource_downloads_total{resource_type="csv"} 3', body)
+        self.assertIn('projecthack_requests_in_flight 1', body)
+
+
+class ProfilingTest(TestCase):
+    """Test on-demand request profiling"""
+    
+    def setUp(self):
+        cache.clear()
+        self.profile_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.profile_dir)
+        Project.objects.create(title='Test Project', description='Test', difficulty='beginner', track='python')
+        UserProfile.objects.create(session_id='test-session', experience_level='beginner', onboarding_completed=True)
+        session = self.client.session
+        session['session_id'] = 'test-session'
+        session.save()
+    
+    def profiling(self, **kwargs):
+        options = {
+            'PROFILING_ENABLED': True,
+            'PROFILING_SECRET': 'letmein',
+            'PROFILING_SAMPLE_EVERY': 0,
+            'PROFILING_DIR': self.profile_dir,
+        }
+        options.update(kwargs)
+        return self.settings(**options)
+    
+    def test_disabled(self):
+        """Test nothing is captured while profiling is off"""
+        with self.settings(PROFILING_ENABLED=False, PROFILING_DIR=self.profile_dir):
+            response = self.client.get(reverse('projects:home'), HTTP_X_PROFILE='letmein')
+            self.assertEqual(list_profiles(), [])
+        self.assertFalse(response.has_header('X-Profile-Id'))
+    
+    def test_header_trigger(self):
+        """Test only requests with the right header are profiled"""
+        with self.profiling():
+            self.client.get(reverse('projects:home'))
+            self.client.get(reverse('projects:home'), HTTP_X_PROFILE='wrong')
+            self.assertEqual(self.client.get(reverse('projects:home'), HTTP_X_PROFILE='létmein').status_code, 200)
+            response = self.client.get(reverse('projects:home'), HTTP_X_PROFILE='letmein')
+            captures = list_profiles()
+        self.assertEqual([capture['view'] for capture in captures], ['home'])
+        self.assertEqual(response['X-Profile-Id'], captures[0]['name'])
+    
+    def test_sampling_ring_buffer(self):
+        """Test 1-in-N sampling and that the oldest captures are dropped"""
+        with self.profiling(PROFILING_SAMPLE_EVERY=2, PROFILING_MAX_FILES=2):
+            for _ in range(8):
+                self.client.get(reverse('projects:home'))
+            self.assertEqual(len(list_profiles()), 2)
+    
+    def test_report(self):
+        """Test the report command lists and aggregates captures"""
+        with self.profiling():
+            self.client.get(reverse('projects:home'), HTTP_X_PROFILE='letmein')
+            self.client.get(reverse('projects:home'), HTTP_X_PROFILE='letmein', HTTP_X_PROFILE_MODE='tracemalloc')
+            
+            out = io.StringIO()
+            call_command('profile_report', '--list', stdout=out)
+            self.assertIn('2 capture(s)', out.getvalue())
+            
+            out = io.StringIO()
+            call_command('profile_report', '--view', 'home', '--top', '5', stdout=out)
+        report = out.getvalue()
+        self.assertIn('across 1 cProfile capture(s)', report)
+        self.assertIn('views.py', report)
+        self.assertIn('across 1 tracemalloc capture(s)', report)
+
+
+class LoadtestCohortCommandTest(TestCase):
+    """Test the cohort load-test command"""
+    
+    def setUp(self):
+        cache.clear()
+        project = Project.objects.create(title='Test Project', description='Test', difficulty='beginner', track='python')
+        for i in range(1, 3):
+            ProjectStep.objects.create(
+                project=project, step_number=i, title=f'Step {i}', description='Description',
+                technologies=['Python'], estimated_time=60, timeframe='6h'
+            )
+    
+    def test_full_journey(self):
+        """Test participants get through every route without errors and are cleaned up"""
+        out = io.StringIO()
+        call_command(
+            'loadtest_cohort', '--participants', '2', '--concurrency', '1',
+            '--think-time', '0', '--ramp-up', '0', '--timer-polls', '1', stdout=out
+        )
+        report = out.getvalue()
+        self.assertIn('Participants started projects: 2/2', report)
+        self.assertIn('Error rate:                    0.00%', report)
+        for route in ('onboarding_complete', 'home', 'start_project', 'complete_step', 'timer_status', 'project_summary'):
+            self.assertIn(route, report)
+        self.assertFalse(UserSession.objects.exists())
+        self.assertFalse(UserProfile.objects.exists())
+    
+    def test_generated_projects_are_cleaned_up(self):
+        """Test projects generated by participants are deleted afterwards, but not a real user's"""
+        real = ProjectGenerator().generate_project('python', 'beginner', '6h', keywords=['Weather'])
+        out = io.StringIO()
+        call_command(
+            'loadtest_cohort', '--participants', '2', '--concurrency', '1', '--generate-share', '1',
+            '--think-time', '0', '--ramp-up', '0', '--timer-polls', '0', stdout=out
+        )
+        report = out.getvalue()
+        self.assertIn('Projects generated:', report)
+        self.assertIn('Error rate:                    0.00%', report)
+        self.assertEqual(list(Project.objects.filter(is_generated=True)), [real])
+        self.assertEqual(real.steps.count(), real.get_step_count('6h'))
+        self.assertFalse(UserSession.objects.exists())
+        self.assertFalse(UserProfile.objects.exists())
+    
+    def test_failed_journeys_are_cleaned_up(self):
+        """Test profiles of participants who never started a project are deleted too"""
+        with mock.patch.object(ProjectGenerator, 'generate_project', side_effect=RuntimeError):
+            call_command(
+                'loadtest_cohort', '--participants', '2', '--concurrency', '1', '--generate-share', '1',
+                '--think-time', '0', '--ramp-up', '0', '--timer-polls', '0', stdout=io.StringIO()
+            )
+        self.assertFalse(UserSession.objects.exists())
+        self.assertFalse(UserProfile.objects.exists())
+    
+    def test_no_cleanup_against_a_server(self):
+        """Test nothing is deleted locally when loading a server that may use another database"""
+        UserProfile.objects.create(session_id='someone')
+        out = io.StringIO()
+        call_command(
+            'loadtest_cohort', '--participants', '1', '--think-time', '0', '--ramp-up', '0',
+            '--base-url', 'http://127.0.0.1:9', stdout=out
+        )
+        self.assertIn('Not cleaning up', out.getvalue())
+        self.assertTrue(UserProfile.objects.exists())
+
+
+class SeedLargeDatasetCommandTest(TestCase):
+    """Test the synthetic dataset seeder"""
+    
+    def seed(self, *args):
+        call_command(
+            'seed_large_dataset', '--projects', '36', '--sessions', '300', '--profiles', '50',
+            '--batch-size', '40', *args, stdout=io.StringIO()
+        )
+    
+    def test_volumes_and_consistency(self):
+        """Test row counts, cached step counts and session progress are consistent"""
+        self.seed()
+        self.assertEqual(Project.objects.count(), 36)
+        self.assertEqual(UserProfile.objects.count(), 50)
+        self.assertEqual(UserSession.objects.count(), 300)
+        self.assertEqual(set(Project.objects.values_list('track', flat=True)), {code for code, _ in Project.TRACK_CHOICES})
+        
+        for project in Project.objects.filter(is_generated=False)[:3]:
+            self.assertEqual(set(project.step_stats), set(project.steps.values_list('timeframe', flat=True)))
+            for timeframe, stats in project.step_stats.items():
+                self.assertEqual(project.get_steps(timeframe).count(), stats['steps'])
+        
+        for user_session in UserSession.objects.select_related('project')[:50]:
+            total = user_session.get_total_steps()
+            self.assertEqual(user_session.completed, user_session.get_completed_count() == total)
+            self.assertLessEqual(user_session.current_step, total)
+    
+    def test_deterministic(self):
+        """Test the same seed produces the same data, and --clear replaces it"""
+        self.seed()
+        first = list(UserSession.objects.order_by('id').values_list('session_id', 'selected_timeframe', 'completed_mask'))
+        self.seed('--clear')
+        second = list(UserSession.objects.order_by('id').values_list('session_id', 'selected_timeframe', 'completed_mask'))
+        self.assertEqual(first, second)
+        self.assertEqual(UserSession.objects.count(), 300)
+
+
+class CatalogLoaderTest(TestCase):
+    """Test the diff-based catalog loader"""
+    
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir)
+        self.catalog = {'projects': [{
+            'title': 'Catalog Project',
+            'description': 'From the catalog',
+            'track': 'python',
+            'difficulty': 'beginner',
+            'steps': [
+                {'step_number': i, 'timeframe': '6h' if i < 3 else '12h', 'title': f'Step {i}', 'description': 'Do it',
+                 'technologies': ['Python'], 'estimated_time': 30, 'learning_outcomes': 'Learned'}
+                for i in range(1, 4)
+            ],
+            'resources': [{'name': 'data.csv', 'description': 'Data', 'resource_type': 'csv',
+                           'file_path': 'resources/data.csv', 'order': 1}],
+        }]}
+    
+    def load(self, **kwargs):
+        path = os.path.join(self.tmpdir, 'catalog.json')
+        with open(path, 'w') as f:
+            json.dump(self.catalog, f)
+        return load_catalog(path, **kwargs)
+    
+    def test_fresh_load_and_reload(self):
+        """Test a fresh load creates everything and reloading writes nothing"""
+        diff = self.load()
+        self.assertEqual(diff.summary(), {'projects': (1, 0, 0), 'steps': (3, 0, 0), 'resources': (1, 0, 0)})
+        project = Project.objects.get(title='Catalog Project')
+        self.assertEqual(project.get_step_count('6h'), 2)
+        self.assertEqual(project.step_stats['12h'], {'steps': 3, 'minutes': 90})
+        self.assertEqual(project.get_available_timeframes(), ['6h', '12h'])
+        self.assertEqual(project.resources.count(), 1)
+        
+        with CaptureQueriesContext(connection) as queries:
+            diff = self.load()
+        self.assertTrue(diff.is_empty())
+        self.assertFalse([q for q in queries.captured_queries if not q['sql'].startswith('SELECT')])
+    
+    def test_changes_are_applied(self):
+        """Test edited rows are updated and rows removed from the file are deleted"""
+        self.load()
+        entry = self.catalog['projects'][0]
+        entry['description'] = 'Edited'
+        entry['steps'][0]['title'] = 'Renamed'
+        entry['steps'].pop()
+        entry['resources'] = []
+        
+        diff = self.load()
+        self.assertEqual(diff.summary(), {'projects': (0, 1, 0), 'steps': (0, 1, 1), 'resources': (0, 0, 1)})
+        project = Project.objects.get(title='Catalog Project')
+        self.assertEqual(project.description, 'Edited')
+        self.assertEqual(project.steps.get(step_number=1).title, 'Renamed')
+        self.assertEqual(project.get_step_count('6h'), 2)
+        self.assertEqual(project.get_available_timeframes(), ['6h'])
+        self.assertFalse(project.resources.exists())
+    
+    def test_prune_and_dry_run(self):
+        """Test projects missing from the file are kept unless pruned, and dry runs write nothing"""
+        self.load()
+        Project.objects.create(title='Old Project', description='Gone', difficulty='beginner', track='python')
+        generated = Project.objects.create(
+            title='Generated', description='Kept', difficulty='beginner', track='python', is_generated=True
+        )
+        
+        self.assertTrue(self.load().is_empty())
+        diff = self.load(prune=True, dry_run=True)
+        self.assertEqual(diff.summary()['projects'], (0, 0, 1))
+        self.assertTrue(Project.objects.filter(title='Old Project').exists())
+        
+        self.load(prune=True)
+        self.assertFalse(Project.objects.filter(title='Old Project').exists())
+        self.assertTrue(Project.objects.filter(pk=generated.pk).exists())
+    
+    def test_invalid_catalog(self):
+        """Test malformed catalogs are rejected before anything is written"""
+        self.catalog['projects'][0]['track'] = 'cobol'
+        with self.assertRaises(CatalogError):
+            self.load()
+        self.assertFalse(Project.objects.exists())
+        
+        # A step may not belong to a shorter timeframe than the one before it
+        self.catalog['projects'][0]['track'] = 'python'
+        self.catalog['projects'][0]['steps'][2]['timeframe'] = '6h'
+        self.catalog['projects'][0]['steps'][1]['timeframe'] = '24h'
+        with self.assertRaises(CatalogError):
+            self.load()
+    
+    def test_bundled_catalog(self):
+        """Test the bundled catalog loads through the management command"""
+        out = io.StringIO()
+        call_command('load_sample_projects', stdout=out)
+        self.assertGreater(Project.objects.count(), 0)
+        self.assertFalse(Project.objects.filter(step_stats={}).exists())
+        call_command('load_sample_projects', stdout=out)
+        self.assertIn('Catalog already up to date', out.getvalue())
+
+
+class CleanupDuplicateSessionsCommandTest(TestCase):
+    """Test the set-based duplicate session cleanup"""
+    
+    def setUp(self):
+        self.project = Project.objects.create(title='Test Project', description='Test', difficulty='beginner', track='python')
+        # Duplicates can only exist where the partial unique constraint is missing
+        # (e.g. MySQL, or data from before it existed) - drop it for this test
+        with connection.cursor() as cursor:
+            cursor.execute(f'DROP INDEX {connection.ops.quote_name("unique_active_session")}')
+        
+        now = timezone.now()
+        self.sessions = [
+            UserSession.objects.create(session_id='dup', project=self.project, selected_timeframe='6h', start_time=now - timedelta(hours=hours))
+            for hours in (3, 1, 2)
+        ]
+        self.completed = UserSession.objects.create(
+            session_id='dup', project=self.project, selected_timeframe='6h', start_time=now, completed=True
+        )
+        self.other_timeframe = UserSession.objects.create(session_id='dup', project=self.project, selected_timeframe='12h', start_time=now - timedelta(hours=5))
+        self.other_user = UserSession.objects.create(session_id='other', project=self.project, selected_timeframe='6h', start_time=now - timedelta(hours=5))
+    
+    def run_cleanup(self, *args):
+        out = io.StringIO()
+        call_command('cleanup_duplicate_sessions', '--batch-size', '2', '--progress-every', '1', *args, stdout=out)
+        return out.getvalue()
+    
+    def test_dry_run(self):
+        """Test a dry run counts duplicates without deleting"""
+        output = self.run_cleanup('--dry-run')
+        self.assertIn('Would delete 2 duplicate session(s)', output)
+        self.assertIn('ids scanned', output)
+        self.assertEqual(UserSession.objects.count(), 6)
+    
+    def test_keeps_newest(self):
+        """Test only the newest incomplete session of each group survives"""
+        output = self.run_cleanup()
+        self.assertIn('Deleted 2 duplicate session(s)', output)
+        self.assertEqual(
+            set(UserSession.objects.values_list('pk', flat=True)),
+            {self.sessions[1].pk, self.completed.pk, self.other_timeframe.pk, self.other_user.pk},
+        )
+        self.assertIn('Deleted 0 duplicate session(s)', self.run_cleanup())
+
+
+class CheckProjectStepsCommandTest(TestCase):
+    """Test the step plan check"""
+    
+    def setUp(self):
+        self.good = Project.objects.create(title='Good', description='Test', difficulty='beginner', track='python')
+        for n, timeframe in enumerate(['6h', '6h', '12h', '24h', '48h'], 1):
+            ProjectStep.objects.create(
+                project=self.good, step_number=n, title=f'Step {n}', description='Description',
+                technologies=['Python'], estimated_time=60, timeframe=timeframe
+            )
+        self.gap = Project.objects.create(title='Gap', description='Test', difficulty='beginner', track='python')
+        for n, minutes in ((1, 300), (3, 120)):
+            ProjectStep.objects.create(
+                project=self.gap, step_number=n, title=f'Step {n}', description='Description',
+                technologies=['Python'], estimated_time=minutes, timeframe='6h'
+            )
+        self.empty = Project.objects.create(title='Empty', description='Test', difficulty='beginner', track='python')
+    
+    def check(self, *args):
+        out = io.StringIO()
+        try:
+            call_command('check_project_steps', *args, stdout=out)
+        except CommandError as e:
+            return out.getvalue(), str(e)
+        return out.getvalue(), None
+    
+    def test_json_report(self):
+        """Test plans are cumulative and each kind of issue is reported"""
+        with CaptureQueriesContext(connection) as queries:
+            output, error = self.check('--format', 'json')
+        self.assertEqual(len(queries), 2)
+        self.assertIn('2 error(s), 4 warning(s)', error)
+        
+        report = {project['title']: project for project in json.loads(output)['projects']}
+        self.assertEqual(report['Good']['plans']['12h'], {'steps': 3, 'minutes': 180})
+        self.assertEqual(report['Good']['issues'], [])
+        self.assertEqual(
+            {(issue['code'], issue['timeframe']) for issue in report['Gap']['issues']},
+            {('step_gap', '6h'), ('over_time', '6h')} | {('missing_timeframe', tf) for tf in ('12h', '24h', '48h')},
+        )
+        self.assertEqual(list(report['Gap']['plans']), ['6h'])
+        self.assertEqual([issue['code'] for issue in report['Empty']['issues']], ['no_steps'])
+    
+    def test_csv_and_strict(self):
+        """Test CSV rows per timeframe and that warnings only fail with --strict"""
+        self.gap.delete()
+        self.empty.delete()
+        ProjectStep.objects.filter(project=self.good, step_number=1).update(estimated_time=400)
+        
+        output, error = self.check('--format', 'csv')
+        self.assertIsNone(error)
+        rows = list(csv.DictReader(io.StringIO(output)))
+        self.assertEqual([row['timeframe'] for row in rows], ['6h', '12h', '24h', '48h'])
+        self.assertEqual(rows[0]['warnings'], 'over_time')
+        self.assertEqual(rows[3]['steps'], '5')
+        
+        _, error = self.check('--strict')
+        self.assertIn('0 error(s), 1 warning(s)', error)
+    
+    def test_plans_match_available_timeframes(self):
+        """Test a generated project's plans are the timeframes it offers"""
+        project = ProjectGenerator().generate_project('python', 'beginner', '6h')
+        output, _ = self.check('--format', 'json')
+        report = {entry['id']: entry for entry in json.loads(output)['projects']}[project.pk]
+        self.assertEqual(list(report['plans']), project.get_available_timeframes())
+        self.assertEqual(list(report['plans']), ['6h'])
+        self.assertFalse([issue for issue in report['issues'] if issue['code'] in ('missing_timeframe', 'step_gap')])
+        
+        output, _ = self.check()
+        self.assertIn('Available timeframes: 6h\n', output)
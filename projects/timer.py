@@ -0,0 +1,139 @@
+"""
+Timer tokens - signed, expiring snapshots of a session's timer and progress
+"""
+import asyncio
+import json
+import time
+
+from django.core import signing
+from django.core.cache import cache
+
+
+TIMER_TOKEN_SALT = 'projects.timer'
+
+# Keep answering for a while after the timer runs out so the page can show "Time's Up!"
+TIMER_TOKEN_GRACE_SECONDS = 60 * 60
+
+# Latest token per session, published by complete_step for open event streams
+TIMER_TOKEN_CACHE_KEY = 'projects:timer:{session_id}'
+
+# Event stream pacing
+TIMER_EVENT_POLL_SECONDS = 3  # How often to look for progress published by other requests
+TIMER_EVENT_TICK_SECONDS = 15
+TIMER_EVENT_MAX_SECONDS = 5 * 60  # Close periodically; EventSource reconnects by itself
+TIMER_EVENT_RETRY_MS = 3000
+
+
+def make_timer_token(user_session):
+    """
+    Issue a signed token carrying everything the timer endpoint needs
+
+    Args:
+        user_session: UserSession instance (with project loaded)
+
+    Returns:
+        URL-safe signed token string
+    """
+    payload = {
+        'sid': user_session.id,
+        'start': user_session.start_time.timestamp(),
+        'hours': int(user_session.selected_timeframe.replace('h', '')),
+        'step': user_session.current_step,
+        'total': user_session.get_total_steps(),
+        'progress': user_session.get_progress_percentage(),
+        'completed': user_session.completed,
+    }
+    return signing.dumps(payload, salt=TIMER_TOKEN_SALT, compress=True)
+
+
+def read_timer_token(token, session_id):
+    """
+    Verify a timer token for a session
+
+    Returns:
+        Token payload dict, or None if the token is invalid, expired or for another session
+    """
+    try:
+        payload = signing.loads(token, salt=TIMER_TOKEN_SALT)
+    except signing.BadSignature:
+        return None
+
+    if payload.get('sid') != session_id:
+        return None
+
+    # Expire tokens once the timeframe (plus grace) has passed since the session started
+    max_age = payload['hours'] * 3600 + TIMER_TOKEN_GRACE_SECONDS
+    if time.time() - payload['start'] > max_age:
+        return None
+
+    return payload
+
+
+def get_timer_status(payload):
+    """Build the timer_status response body from a verified token payload"""
+    elapsed = time.time() - payload['start']
+    remaining_seconds = max(0, payload['hours'] * 3600 - int(elapsed))
+    return {
+        'remaining_seconds': remaining_seconds,
+        'is_expired': remaining_seconds == 0,
+        'progress': payload['progress'],
+        'current_step': payload['step'],
+        'total_steps': payload['total'],
+        'completed': payload.get('completed', False),
+    }
+
+
+def publish_timer_token(user_session, token):
+    """Make a freshly issued token visible to the session's open event streams"""
+    hours = int(user_session.selected_timeframe.replace('h', ''))
+    cache.set(
+        TIMER_TOKEN_CACHE_KEY.format(session_id=user_session.id),
+        token,
+        timeout=hours * 3600 + TIMER_TOKEN_GRACE_SECONDS
+    )
+
+
+def format_event(event, data):
+    """Encode one Server-Sent Event"""
+    return f'event: {event}\ndata: {json.dumps(data)}\n\n'
+
+
+async def stream_timer_events(session_id, payload, poll_seconds=TIMER_EVENT_POLL_SECONDS,
+                              tick_seconds=TIMER_EVENT_TICK_SECONDS, max_seconds=TIMER_EVENT_MAX_SECONDS):
+    """
+    Async generator of Server-Sent Events for one session
+
+    Emits 'tick' every tick_seconds, 'step' when another request publishes new
+    progress, and 'expired' once the timer runs out. Only the cache is read.
+
+    Args:
+        session_id: UserSession primary key
+        payload: Verified timer token payload to start from
+    """
+    key = TIMER_TOKEN_CACHE_KEY.format(session_id=session_id)
+    started = time.monotonic()
+    next_tick = started
+    yield f'retry: {TIMER_EVENT_RETRY_MS}\n\n'
+    
+    while True:
+        token = await cache.aget(key)
+        if token:
+            latest = read_timer_token(token, session_id)
+            if latest and (latest['step'], latest['progress'], latest.get('completed')) != \
+                    (payload['step'], payload['progress'], payload.get('completed')):
+                payload = latest
+                yield format_event('step', {**get_timer_status(payload), 'timer_token': token})
+        
+        status = get_timer_status(payload)
+        if status['is_expired']:
+            yield format_event('expired', status)
+            return
+        
+        now = time.monotonic()
+        if now >= next_tick:
+            yield format_event('tick', status)
+            next_tick = now + tick_seconds
+        
+        if now - started >= max_seconds:
+            return
+        await asyncio.sleep(min(poll_seconds, status['remaining_seconds']))
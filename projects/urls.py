@@ -8,12 +8,16 @@ urlpatterns = [
     path('generate/', views.generate_project, name='generate_project'),
     path('project/<int:project_id>/', views.project_overview, name='project_overview'),
     path('project/<int:project_id>/start/', views.start_project, name='start_project'),
+    path('project/<int:project_id>/resources.zip', views.download_resource_bundle, name='download_resource_bundle'),
     path('session/<int:session_id>/', views.project_step, name='project_step'),
     path('session/<int:session_id>/complete-step/', views.complete_step, name='complete_step'),
     path('session/<int:session_id>/summary/', views.project_summary, name='project_summary'),
     path('session/<int:session_id>/submit/', views.submit_project, name='submit_project'),
     path('session/<int:session_id>/timer/', views.timer_status, name='timer_status'),
+    path('session/<int:session_id>/timer/events/', views.timer_events, name='timer_events'),
     path('resource/<int:resource_id>/download/', views.download_resource, name='download_resource'),
+    path('resource/<int:resource_id>/preview/', views.preview_resource, name='preview_resource'),
+    path('metrics', views.metrics, name='metrics'),
     # Onboarding flow
     path('onboarding/', views.onboarding_start, name='onboarding_start'),
     path('onboarding/technologies/', views.onboarding_technologies, name='onboarding_technologies'),
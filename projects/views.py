@@ -1,13 +1,21 @@
 from django.shortcuts import render, redirect, get_object_or_404
-from django.http import JsonResponse, FileResponse, Http404
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse, Http404
 from django.views.decorators.http import require_http_methods
 from django.utils import timezone
+from django.utils.text import slugify
 from django.contrib import messages
 from django.conf import settings
 import uuid
 import os
-from .models import Project, ProjectStep, ProjectResource, UserSession, UserProfile
+from . import metrics as app_metrics
+from .models import Project, ProjectNeighbour, ProjectStep, ProjectResource, UserSession, UserProfile
 from .generator import ProjectGenerator
+from .bundles import serve_bundle
+from .catalog import get_catalog_snapshot
+from .delivery import CONTENT_TYPES, resource_path, serve_file
+from .onboarding import get_onboarding_state, remember_profile
+from .resource_stats import read_preview
+from .timer import make_timer_token, read_timer_token, get_timer_status, publish_timer_token, stream_timer_events
 
 
 def home(request):
@@ -18,76 +26,40 @@ def home(request):
         session_id = str(uuid.uuid4())
         request.session['session_id'] = session_id
     
-    # Check if user has completed onboarding
-    # Always check fresh from database - don't rely on cached values
-    onboarding_completed = False
-    recommended_projects = []
-    user_profile = None
-    
-    try:
-        user_profile = UserProfile.objects.get(session_id=session_id)
-        # Explicitly check the onboarding_completed flag - must be True (not just truthy)
-        onboarding_completed = user_profile.onboarding_completed is True
-        # Also verify that they actually have some preferences set
-        if onboarding_completed:
-            # Double-check: if they have no preferences, treat as incomplete
-            has_preferences = (
-                user_profile.experience_level or 
-                user_profile.preferred_tracks or 
-                user_profile.preferred_difficulty or
-                user_profile.interests_keywords
-            )
-            if not has_preferences:
-                # Mark as incomplete if no preferences exist
-                onboarding_completed = False
-                user_profile.onboarding_completed = False
-                user_profile.save()
-            else:
-                recommended_projects = user_profile.get_recommended_projects(limit=6)
-    except UserProfile.DoesNotExist:
-        # No profile exists - definitely not completed
-        onboarding_completed = False
-        recommended_projects = []
-        user_profile = None
+    # Onboarding state and recommendation inputs come from the session copy kept
+    # in sync by the onboarding views - no profile lookup for returning users
+    state = get_onboarding_state(request, session_id)
     
     # If onboarding not completed, redirect to onboarding
-    if not onboarding_completed:
+    if not state or not state['completed']:
         return redirect('projects:onboarding_start')
     
+    # Copies cached before technologies and keywords were kept have neither
+    recommended_projects = UserProfile.recommend_projects(
+        state['tracks'],
+        state['difficulty'],
+        limit=6,
+        technologies=state.get('technologies', []),
+        keywords=state.get('keywords', []),
+    )
+    
     # Get unique tracks and difficulties
     tracks = Project.TRACK_CHOICES
     difficulties = Project.DIFFICULTY_CHOICES
     timeframes = ProjectStep.TIMEFRAME_CHOICES
     
-    # Get projects grouped by track and difficulty (exclude generated projects from main view)
-    projects_by_track = {}
-    total_projects = 0
-    for track_code, track_name in tracks:
-        projects_by_track[track_code] = {
-            'name': track_name,
-            'projects': {}
-        }
-        for diff_code, diff_name in difficulties:
-            projects = Project.objects.filter(track=track_code, difficulty=diff_code, is_generated=False)
-            if projects.exists():
-                projects_by_track[track_code]['projects'][diff_code] = {
-                    'name': diff_name,
-                    'projects': projects
-                }
-                total_projects += projects.count()
-    
-    # Check if any projects have steps
-    projects_with_steps = Project.objects.filter(steps__isnull=False, is_generated=False).distinct().count()
+    # Projects grouped by track and difficulty (generated projects excluded) - served
+    # from the cached catalog snapshot, rebuilt only when projects or steps change
+    catalog = get_catalog_snapshot()
     
     context = {
         'tracks': tracks,
         'difficulties': difficulties,
         'timeframes': timeframes,
-        'projects_by_track': projects_by_track,
-        'total_projects': total_projects,
-        'projects_with_steps': projects_with_steps,
+        'projects_by_track': catalog['projects_by_track'],
+        'total_projects': catalog['total_projects'],
+        'projects_with_steps': catalog['projects_with_steps'],
         'recommended_projects': recommended_projects,
-        'user_profile': user_profile,
     }
     return render(request, 'projects/home.html', context)
 
@@ -151,16 +123,8 @@ def project_overview(request, project_id):
     project = get_object_or_404(Project, id=project_id)
     timeframes = ProjectStep.TIMEFRAME_CHOICES
     
-    # Get available timeframes for this project
-    try:
-        # Get distinct timeframes that have steps - use set to ensure uniqueness
-        available_timeframes_raw = project.steps.values_list('timeframe', flat=True)
-        # Convert to set to remove duplicates, then back to sorted list
-        available_timeframes = sorted(set(available_timeframes_raw)) if available_timeframes_raw else []
-    except Exception as e:
-        # If there's a database error, show helpful message
-        messages.error(request, f'Database error: {str(e)}. Please run migrations: python3 manage.py makemigrations && python3 manage.py migrate')
-        available_timeframes = []
+    # Timeframes with a step plan, from the cached step counts
+    available_timeframes = project.get_available_timeframes()
     
     # If no steps exist, show a message
     if not available_timeframes:
@@ -175,11 +139,19 @@ def project_overview(request, project_id):
     available_set = set(available_timeframes)
     filtered_timeframes = [tf for tf in timeframes if tf[0] in available_set]
     
+    # Precomputed by rebuild_similar_projects - one query on the (project, rank) index
+    neighbours = ProjectNeighbour.objects.filter(
+        project=project, rank__lte=settings.SIMILAR_PROJECTS
+    ).select_related('neighbour').only(
+        'neighbour__title', 'neighbour__description', 'neighbour__difficulty', 'neighbour__track'
+    ).order_by('rank')
+    
     context = {
         'project': project,
         'timeframes': filtered_timeframes,
         'has_steps': bool(available_timeframes),
         'available_timeframes': available_timeframes,  # For debugging
+        'similar_projects': [row.neighbour for row in neighbours],
     }
     return render(request, 'projects/project_overview.html', context)
 
@@ -200,7 +172,7 @@ def start_project(request, project_id):
                 return redirect('projects:project_overview', project_id=project_id)
             
             # Check if project has steps for this timeframe
-            steps_count = project.steps.filter(timeframe=timeframe).count()
+            steps_count = project.get_step_count(timeframe)
             if steps_count == 0:
                 messages.error(request, f'This project does not have steps configured for {timeframe} timeframe.')
                 return redirect('projects:project_overview', project_id=project_id)
@@ -228,7 +200,7 @@ def start_project(request, project_id):
                 selected_timeframe=timeframe,
                 start_time=timezone.now(),
                 current_step=1,
-                completed_steps=[],
+                completed_mask=0,
                 completed=False
             )
             
@@ -243,7 +215,7 @@ def start_project(request, project_id):
 
 def project_step(request, session_id):
     """Show current step of the project"""
-    user_session = get_object_or_404(UserSession, id=session_id)
+    user_session = get_object_or_404(UserSession.objects.select_related('project'), id=session_id)
     
     # Verify session belongs to user
     if request.session.get('session_id') != user_session.session_id:
@@ -251,10 +223,7 @@ def project_step(request, session_id):
         return redirect('projects:home')
     
     # Get current step
-    steps = ProjectStep.objects.filter(
-        project=user_session.project,
-        timeframe=user_session.selected_timeframe
-    ).order_by('step_number')
+    steps = user_session.project.get_steps(user_session.selected_timeframe)
     
     if not steps.exists():
         messages.error(request, 'No steps available for this project.')
@@ -287,6 +256,8 @@ def project_step(request, session_id):
         'total_steps': len(all_steps),
         'progress_percentage': user_session.get_progress_percentage(),
         'remaining_seconds': user_session.get_remaining_time(),
+        'timer_token': make_timer_token(user_session),
+        'timer_events_enabled': settings.TIMER_EVENTS_ENABLED,
         'resources': resources,
     }
     return render(request, 'projects/project_step.html', context)
@@ -295,31 +266,32 @@ def project_step(request, session_id):
 def complete_step(request, session_id):
     """Mark current step as complete and move to next"""
     if request.method == 'POST':
-        user_session = get_object_or_404(UserSession, id=session_id)
+        user_session = get_object_or_404(UserSession.objects.select_related('project'), id=session_id)
         
         # Verify session
         if request.session.get('session_id') != user_session.session_id:
             return JsonResponse({'error': 'Invalid session'}, status=403)
         
-        # Mark current step as completed
-        if user_session.current_step not in user_session.completed_steps:
-            user_session.completed_steps.append(user_session.current_step)
+        # Complete the step the page was showing (a stale second click is a no-op)
+        step = request.POST.get('step', '')
+        advanced = user_session.complete_current_step(int(step) if step.isdigit() else None)
         
-        # Move to next step
-        total_steps = user_session.get_total_steps()
-        if user_session.current_step < total_steps:
-            user_session.current_step += 1
-        else:
-            # All steps completed
-            user_session.completed = True
-            user_session.completed_at = timezone.now()
+        if not advanced:
+            return JsonResponse({
+                'success': True,
+                'completed': user_session.completed,
+                'next_step': user_session.current_step if not user_session.completed else None,
+            })
         
-        user_session.save()
+        # Progress changed - hand out a fresh timer token and tell open event streams
+        timer_token = make_timer_token(user_session)
+        publish_timer_token(user_session, timer_token)
         
         return JsonResponse({
             'success': True,
             'completed': user_session.completed,
-            'next_step': user_session.current_step if not user_session.completed else None
+            'next_step': user_session.current_step if not user_session.completed else None,
+            'timer_token': timer_token,
         })
     
     return JsonResponse({'error': 'Invalid method'}, status=405)
@@ -327,7 +299,7 @@ def complete_step(request, session_id):
 
 def project_summary(request, session_id):
     """Show project summary and skills learned"""
-    user_session = get_object_or_404(UserSession, id=session_id)
+    user_session = get_object_or_404(UserSession.objects.select_related('project'), id=session_id)
     
     # Verify session
     if request.session.get('session_id') != user_session.session_id:
@@ -335,11 +307,9 @@ def project_summary(request, session_id):
         return redirect('projects:home')
     
     # Collect all technologies learned
-    completed_steps = ProjectStep.objects.filter(
-        project=user_session.project,
-        timeframe=user_session.selected_timeframe,
+    completed_steps = user_session.project.get_steps(user_session.selected_timeframe).filter(
         step_number__in=user_session.completed_steps
-    ).order_by('step_number')
+    )
     
     all_technologies = []
     for step in completed_steps:
@@ -363,7 +333,7 @@ def project_summary(request, session_id):
 def submit_project(request, session_id):
     """Submit GitHub repository link"""
     if request.method == 'POST':
-        user_session = get_object_or_404(UserSession, id=session_id)
+        user_session = get_object_or_404(UserSession.objects.select_related('project'), id=session_id)
         
         # Verify session
         if request.session.get('session_id') != user_session.session_id:
@@ -376,7 +346,7 @@ def submit_project(request, session_id):
             # Basic URL validation
             if github_repo.startswith(('http://', 'https://')):
                 user_session.github_repo = github_repo
-                user_session.save()
+                user_session.save(update_fields=['github_repo'])
                 messages.success(request, 'Thank you for sharing your project!')
             else:
                 messages.error(request, 'Please enter a valid URL (starting with http:// or https://)')
@@ -398,7 +368,7 @@ def generate_cv_summary(user_session, technologies, completed_steps):
         'description': f"Built a {project.title.lower()} as part of a {timeframe_hours}-hour solo hackathon project.",
         'technologies': technologies,
         'key_achievements': [
-            f"Completed {len(completed_steps)} structured development steps",
+            f"Completed {user_session.get_completed_count()} structured development steps",
             f"Implemented project from concept to working MVP in {timeframe_hours} hours",
             "Applied version control best practices with Git and GitHub",
             "Followed step-by-step development methodology",
@@ -412,7 +382,7 @@ def generate_cv_summary(user_session, technologies, completed_steps):
         'cv_bullet_points': [
             f"Developed {project.title.lower()} using {', '.join(technologies[:3])} and additional technologies",
             f"Completed project in {timeframe_hours}-hour timeframe, demonstrating time management and project planning skills",
-            "Implemented project following structured development methodology with {0} distinct steps".format(len(completed_steps)),
+            "Implemented project following structured development methodology with {0} distinct steps".format(user_session.get_completed_count()),
             "Utilized Git and GitHub for version control and project documentation",
         ]
     }
@@ -422,7 +392,17 @@ def generate_cv_summary(user_session, technologies, completed_steps):
 
 def timer_status(request, session_id):
     """API endpoint to get timer status"""
-    user_session = get_object_or_404(UserSession, id=session_id)
+    # Fast path: a valid timer token is answered without touching the database
+    # or the session store
+    token = request.GET.get('token')
+    if token:
+        payload = read_timer_token(token, session_id)
+        if payload is not None:
+            app_metrics.inc('projecthack_timer_status_total', {'source': 'token'})
+            return JsonResponse(get_timer_status(payload))
+    
+    app_metrics.inc('projecthack_timer_status_total', {'source': 'database'})
+    user_session = get_object_or_404(UserSession.objects.select_related('project'), id=session_id)
     
     # Verify session
     if request.session.get('session_id') != user_session.session_id:
@@ -440,39 +420,90 @@ def timer_status(request, session_id):
     })
 
 
+async def timer_events(request, session_id):
+    """Server-Sent Events stream of timer ticks, step completions and expiry"""
+    if not settings.TIMER_EVENTS_ENABLED:
+        raise Http404("Timer events are disabled")
+    
+    # Authenticated by the signed timer token only - no database or session store access
+    payload = read_timer_token(request.GET.get('token', ''), session_id)
+    if payload is None:
+        return JsonResponse({'error': 'Invalid token'}, status=403)
+    
+    response = StreamingHttpResponse(
+        stream_timer_events(session_id, payload),
+        content_type='text/event-stream'
+    )
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # Stop nginx from buffering the stream
+    return response
+
+
 def download_resource(request, resource_id):
-    """Download a project resource file"""
+    """Download a project resource file (validators, ranges and sendfile offload in delivery.py)"""
     resource = get_object_or_404(ProjectResource, id=resource_id)
     
-    # Build file path - file_path should be relative to static/files/
-    if resource.file_path.startswith('/'):
-        file_path = os.path.join(settings.BASE_DIR, 'static', 'files', resource.file_path.lstrip('/'))
-    else:
-        file_path = os.path.join(settings.BASE_DIR, 'static', 'files', resource.file_path)
-    
-    if not os.path.exists(file_path):
-        raise Http404(f"File not found: {file_path}")
-    
-    # Determine content type
-    content_types = {
-        'csv': 'text/csv',
-        'json': 'application/json',
-        'txt': 'text/plain',
-        'zip': 'application/zip',
-    }
-    content_type = content_types.get(resource.resource_type, 'application/octet-stream')
+    # file_path is relative to RESOURCE_FILES_DIR (static/files/)
+    response = serve_file(
+        request,
+        resource_path(resource),
+        content_type=CONTENT_TYPES.get(resource.resource_type, 'application/octet-stream'),
+        filename=os.path.basename(resource.file_path),
+    )
+    
+    # Revalidations (304) are not downloads
+    if response.status_code in (200, 206):
+        app_metrics.inc('projecthack_resource_downloads_total', {'resource_type': resource.resource_type})
+    return response
+
+
+def preview_resource(request, resource_id):
+    """Column stats and first rows of a CSV resource (HTML fragment for the step page)"""
+    resource = get_object_or_404(ProjectResource, id=resource_id)
+    if resource.resource_type != 'csv':
+        raise Http404("Only CSV resources can be previewed")
     
-    # Get filename from path
-    filename = os.path.basename(resource.file_path)
+    try:
+        rows = int(request.GET.get('rows', settings.RESOURCE_PREVIEW_ROWS))
+    except ValueError:
+        rows = settings.RESOURCE_PREVIEW_ROWS
+    rows = max(1, min(rows, settings.RESOURCE_PREVIEW_MAX_ROWS))
     
-    # Return file response
+    # Only the first rows are read; stats were computed when the resource was saved
     try:
-        file_handle = open(file_path, 'rb')
-        response = FileResponse(file_handle, content_type=content_type)
-        response['Content-Disposition'] = f'attachment; filename="{filename}"'
-        return response
-    except Exception as e:
-        raise Http404(f"Error opening file: {str(e)}")
+        preview = read_preview(resource_path(resource), rows)
+    except OSError:
+        raise Http404("File not found")
+    
+    context = {
+        'resource': resource,
+        'header': preview['header'],
+        'rows': preview['rows'],
+        'truncated': preview['truncated'],
+        'row_count': resource.stats.get('rows'),
+        'columns': resource.stats.get('columns', []),
+    }
+    return render(request, 'projects/resource_preview.html', context)
+
+
+def download_resource_bundle(request, project_id):
+    """Download every resource of a project as one ZIP"""
+    resources = list(
+        ProjectResource.objects.filter(project_id=project_id).select_related('project').order_by('order', 'name')
+    )
+    if not resources:
+        raise Http404("This project has no resources")
+    
+    response = serve_bundle(request, resources, f'{slugify(resources[0].project.title)}-resources.zip')
+    
+    if response.status_code in (200, 206):
+        app_metrics.inc('projecthack_resource_downloads_total', {'resource_type': 'bundle'})
+    return response
+
+
+def metrics(request):
+    """Prometheus scrape endpoint - merges the samples of every worker process"""
+    return HttpResponse(app_metrics.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
 
 
 # ========== ONBOARDING FLOW ==========
@@ -502,12 +533,14 @@ def onboarding_start(request):
             user_profile.save()
     except UserProfile.DoesNotExist:
         user_profile = UserProfile.objects.create(session_id=session_id)
+    remember_profile(request, user_profile)
     
     if request.method == 'POST':
         experience_level = request.POST.get('experience_level')
         if experience_level:
             user_profile.experience_level = experience_level
             user_profile.save()
+            remember_profile(request, user_profile)
             return redirect('projects:onboarding_technologies')
     
     context = {
@@ -544,6 +577,7 @@ def onboarding_technologies(request):
         if selected_technologies:
             user_profile.interested_technologies = selected_technologies
             user_profile.save()
+            remember_profile(request, user_profile)
             return redirect('projects:onboarding_tracks')
     
     context = {
@@ -577,6 +611,7 @@ def onboarding_tracks(request):
         if preferred_timeframe:
             user_profile.preferred_timeframe = preferred_timeframe
         user_profile.save()
+        remember_profile(request, user_profile)
         return redirect('projects:onboarding_interests')
     
     context = {
@@ -616,6 +651,7 @@ def onboarding_interests(request):
             user_profile.interests_keywords = interest_list
             user_profile.onboarding_completed = True
             user_profile.save()
+            remember_profile(request, user_profile)
             return redirect('projects:onboarding_complete')
     
     context = {
@@ -636,6 +672,7 @@ def onboarding_complete(request):
         user_profile = UserProfile.objects.get(session_id=session_id)
     except UserProfile.DoesNotExist:
         return redirect('projects:onboarding_start')
+    remember_profile(request, user_profile)
     
     # Get recommended projects
     recommended_projects = user_profile.get_recommended_projects(limit=6)
@@ -643,7 +680,7 @@ def onboarding_complete(request):
     # Also get some alternative projects
     all_projects = Project.objects.filter(is_generated=False).exclude(
         id__in=[p.id for p in recommended_projects]
-    )[:6]
+    ).order_by('track', 'difficulty', 'title')[:6]
     
     context = {
         'user_profile': user_profile,